@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Archive old months of Work Memory
+
+Meeting logs (meetings/YYYY-MM/), interaction logs
+(people/*/*/interactions/YYYY-MM.md) and activity logs (logs/YYYY-MM.md)
+for months older than the retention horizon are packed into one indexed
+archive per month under .archive/, so day-to-day commands stop walking them.
+
+The horizon is `retention_days` from the skill config (default 365).
+
+The read subcommands are what the /mem-* commands call to include archived
+data; they only open archives for months inside the requested range.
+
+Usage:
+    python3 archive-memory.py compact [--retention-days N] [--dry-run]
+    python3 archive-memory.py grep <text> [--since YYYY-MM] [--until YYYY-MM]
+    python3 archive-memory.py recent --days N
+    python3 archive-memory.py count [--kind meeting|interaction|log]
+    python3 archive-memory.py cat <relative/path.md>
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(__file__))
+import memory_archive
+from memory_config import get_memory_root, get_retention_days
+
+def cmd_compact(args):
+    retention = args.retention_days if args.retention_days is not None else get_retention_days()
+    months = memory_archive.months_to_compact(args.memory_root, retention)
+
+    if not months:
+        print(f"Nothing to archive (retention: {retention} days)")
+        return
+
+    total = 0
+    for month in months:
+        packed = memory_archive.compact_month(args.memory_root, month, dry_run=args.dry_run)
+        total += len(packed)
+        verb = "Would archive" if args.dry_run else "Archived"
+        print(f"  {verb} {month}: {len(packed)} files")
+
+    print(f"{'Would archive' if args.dry_run else 'Archived'} {total} files from {len(months)} months")
+
+def cmd_grep(args):
+    pattern = args.text if args.regex else re.escape(args.text)
+    for rel_path, line_no, line in memory_archive.grep(
+        args.memory_root, pattern, args.since, args.until, ignore_case=not args.case_sensitive
+    ):
+        # Same shape as `grep -n` so the shell commands can parse it
+        print(f"{os.path.join(args.memory_root, rel_path)}:{line_no}:{line}")
+
+def cmd_recent(args):
+    cutoff = time.time() - args.days * 86400
+    since = memory_archive.month_for_days_ago(args.days)
+    for member in memory_archive.iter_members(args.memory_root, since=since):
+        if member['mtime'] >= cutoff:
+            print(f"{int(member['mtime'])} {os.path.join(args.memory_root, member['path'])}")
+
+def cmd_count(args):
+    print(sum(1 for _ in memory_archive.iter_members(args.memory_root, kind=args.kind)))
+
+def cmd_cat(args):
+    text = memory_archive.read_member(args.memory_root, args.path)
+    if text is None:
+        print(f"ERROR: {args.path} is not archived", file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.write(text)
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive old months of Work Memory')
+    parser.add_argument('--memory-root', default=None, help='Path to WorkMemory (default: from config)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('compact', help='Pack months older than the retention horizon')
+    p.add_argument('--retention-days', type=int, help='Override retention_days from config')
+    p.add_argument('--dry-run', action='store_true', help='Show what would be archived')
+    p.set_defaults(func=cmd_compact)
+
+    p = sub.add_parser('grep', help='Search archived files')
+    p.add_argument('text')
+    p.add_argument('--since', help='First month to search (YYYY-MM)')
+    p.add_argument('--until', help='Last month to search (YYYY-MM)')
+    p.add_argument('--regex', action='store_true', help='Treat text as a regular expression')
+    p.add_argument('--case-sensitive', action='store_true')
+    p.set_defaults(func=cmd_grep)
+
+    p = sub.add_parser('recent', help='Archived files modified in the last N days')
+    p.add_argument('--days', type=int, default=7)
+    p.set_defaults(func=cmd_recent)
+
+    p = sub.add_parser('count', help='Count archived files')
+    p.add_argument('--kind', choices=['meeting', 'interaction', 'log'])
+    p.set_defaults(func=cmd_count)
+
+    p = sub.add_parser('cat', help='Print one archived file')
+    p.add_argument('path', help='Path relative to the memory root')
+    p.set_defaults(func=cmd_cat)
+
+    args = parser.parse_args()
+    args.memory_root = args.memory_root or get_memory_root()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Measure seed-memory.py throughput against a large synthetic Granola cache
+
+Generates a cache-v3.json with --meetings meetings spread over --months
+months, drawn from --contacts people (a third internal), with some meetings
+split into continuation documents, a calendar (state.events) holding every
+scheduled meeting plus next week's, and state.people listing most contacts.
+seed-memory.py then runs against it in a throwaway HOME and memory root,
+twice: the first run seeds the empty tree, the second shows the cost of
+re-seeding a tree that is already complete (it should write nothing).
+
+Reported: cache size, phase timings of each run, meetings and contacts per
+second, and files written.
+
+Usage:
+    python3 bench-seed.py                                  # 5000 meetings, 1500 contacts, 24 months
+    python3 bench-seed.py --meetings 20000 --contacts 4000 --seed 7
+    python3 bench-seed.py --keep                           # Leave the temp dir for inspection
+    python3 bench-seed.py --json
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import argparse
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(__file__))
+from granola_segments import format_epoch
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_SUBPATH = os.path.join('Library', 'Application Support', 'Granola', 'cache-v3.json')
+CONFIG_SUBPATH = os.path.join('.claude', 'skills', 'memory-management', 'memory-management.local.md')
+
+USER_EMAIL = 'tony.kipkemboi@guild.com'
+USER_DOMAIN = 'guild.com'
+COMPANIES = ['acme.io', 'globex.com', 'initech.com', 'umbrella.co', 'hooli.com']
+TITLES = ['Pricing review', 'Hiring sync', 'Roadmap planning', 'Customer onboarding',
+          'Infra weekly', 'Partnership call', '1:1', 'Quarterly business review']
+
+def synthetic_state(meetings, contacts, months, seed, split_rate=0.1):
+    """A Granola state with `meetings` recorded meetings over the last `months` months."""
+    rng = random.Random(seed)
+    people = []
+    for i in range(contacts):
+        name = f"Contact {i:05d}"
+        domain = USER_DOMAIN if i % 3 == 0 else rng.choice(COMPANIES)
+        people.append((name, f"contact{i:05d}@{domain}"))
+
+    now = datetime.now(timezone.utc)
+    horizon = (now - timedelta(days=30 * months)).timestamp()
+    documents, transcripts, events = {}, {}, []
+    for n in range(meetings):
+        start = rng.uniform(horizon, now.timestamp() - 3600)
+        end = start + rng.choice([15, 30, 30, 45, 60]) * 60
+        attendees = [{'email': email, 'displayName': name}
+                     for name, email in rng.sample(people, rng.randint(1, 5))]
+        doc_id = f"bench-{n:06d}"
+        event = {
+            'id': f"event-{n:06d}",
+            'summary': rng.choice(TITLES),
+            'start': {'dateTime': datetime.fromtimestamp(start, timezone.utc).isoformat()},
+            'end': {'dateTime': datetime.fromtimestamp(end, timezone.utc).isoformat()},
+            'attendees': attendees + [{'email': USER_EMAIL, 'self': True}],
+        }
+        events.append(event)
+        documents[doc_id] = {
+            'id': doc_id,
+            'title': f"{event['summary']} {n}",
+            'created_at': format_epoch(start),
+            'updated_at': format_epoch(end),
+            'google_calendar_event': event,
+            'people': {'attendees': [{'email': a['email']} for a in attendees[:1]]},
+            'notes_plain': '',
+            'overview': '',
+        }
+        middle = (start + end) / 2
+        transcripts[doc_id] = [
+            {'document_id': doc_id, 'start_timestamp': format_epoch(start), 'end_timestamp': format_epoch(middle),
+             'source': 'microphone', 'text': 'Thanks for making the time.', 'is_final': True},
+            {'document_id': doc_id, 'start_timestamp': format_epoch(middle), 'end_timestamp': format_epoch(end),
+             'source': 'system', 'text': 'Happy to, let us get started.', 'is_final': True},
+        ]
+        if rng.random() < split_rate:
+            cont_id = f"{doc_id}-cont"
+            documents[cont_id] = {'id': cont_id, 'title': '', 'created_at': format_epoch(end)}
+            transcripts[cont_id] = [
+                {'document_id': cont_id, 'start_timestamp': format_epoch(end + 30),
+                 'end_timestamp': format_epoch(end + 300), 'source': 'system', 'text': 'One more thing.',
+                 'is_final': True},
+            ]
+
+    # Next week's calendar: contacts not met yet
+    for n in range(max(1, meetings // 50)):
+        start = now.timestamp() + rng.uniform(3600, 7 * 86400)
+        name, email = rng.choice(people)
+        events.append({
+            'id': f"upcoming-{n:05d}",
+            'summary': 'Intro call',
+            'start': {'dateTime': datetime.fromtimestamp(start, timezone.utc).isoformat()},
+            'end': {'dateTime': datetime.fromtimestamp(start + 1800, timezone.utc).isoformat()},
+            'attendees': [{'email': email, 'displayName': name}, {'email': USER_EMAIL, 'self': True}],
+        })
+
+    state_people = [
+        {'name': name, 'email': email, 'details': {'person': {'name': {'fullName': name}}}}
+        for name, email in people if rng.random() < 0.8
+    ]
+    return {'documents': documents, 'transcripts': transcripts, 'events': events,
+            'people': state_people, 'meetingsMetadata': {}}
+
+def prepare(workdir, state):
+    home = os.path.join(workdir, 'home')
+    memory_root = os.path.join(workdir, 'WorkMemory')
+    for sub in ('me', 'people', 'projects', 'teams', 'topics', 'logs', 'config', '.archive'):
+        os.makedirs(os.path.join(memory_root, sub), exist_ok=True)
+    cache_path = os.path.join(home, CACHE_SUBPATH)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.join(home, CONFIG_SUBPATH)), exist_ok=True)
+    with open(os.path.join(home, CONFIG_SUBPATH), 'w') as f:
+        f.write(f"---\nmemory_root: {memory_root}\nuser_email: {USER_EMAIL}\n---\n")
+    with open(cache_path, 'w') as f:
+        f.write(json.dumps({'cache': json.dumps({'state': state})}))
+    return home, memory_root, os.path.getsize(cache_path)
+
+def run_seed(home, memory_root):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, os.path.join(SCRIPTS_DIR, 'seed-memory.py'), '--memory-root', memory_root, '--json'],
+        env=dict(os.environ, HOME=home), capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or 'seed-memory.py failed')
+    return dict(json.loads(result.stdout), wall=wall)
+
+def print_run(label, run):
+    stats = run['stats']
+    print(f"{label}: {run['wall']:.2f}s wall, {run['written']} file(s) written")
+    print("  " + ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in run['timings'].items()))
+    print(f"  {run['throughput']['meetings_per_second']} meetings/s, "
+          f"{run['throughput']['contacts_per_second']} contacts/s "
+          f"({stats['profiles_created']} profiles, {stats['interaction_files']} interaction logs, "
+          f"{stats['entries']} entries)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark seed-memory.py on a synthetic Granola cache')
+    parser.add_argument('--meetings', type=int, default=5000, help='Recorded meetings (default: 5000)')
+    parser.add_argument('--contacts', type=int, default=1500, help='Distinct people (default: 1500)')
+    parser.add_argument('--months', type=int, default=24, help='History length (default: 24)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--keep', action='store_true', help="Don't delete the temp directory")
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-seed-')
+    try:
+        t = time.perf_counter()
+        state = synthetic_state(args.meetings, args.contacts, args.months, args.seed)
+        home, memory_root, cache_bytes = prepare(workdir, state)
+        del state
+        generate = time.perf_counter() - t
+
+        first = run_seed(home, memory_root)
+        again = run_seed(home, memory_root)
+    finally:
+        if args.keep:
+            print(f"Kept {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({'cache_mb': round(cache_bytes / 1e6, 1), 'generate': generate,
+                          'seed': first, 'reseed': again}, indent=2))
+        return
+    print(f"Synthetic cache: {args.meetings} meetings, {args.contacts} contacts, {args.months} months, "
+          f"{cache_bytes / 1e6:.1f} MB (generated in {generate:.1f}s)")
+    print_run("Seed", first)
+    print_run("Re-seed", again)
+
+if __name__ == '__main__':
+    main()
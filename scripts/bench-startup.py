@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start time of every script entry point
+
+The daemons spawn log-meeting-to-memory.py for every meeting and the /mem-*
+commands start a fresh interpreter per call, so import-time work is paid
+over and over. For each hyphenated script in this directory this runs its
+module-level code (imports, config lookups) in a fresh interpreter, without
+calling main(), so nothing reads the Granola cache or the memory tree.
+
+Reported per script:
+- median wall time of --runs fresh interpreters (after one warm-up run, so
+  bytecode caches exist), and the same minus a bare interpreter baseline
+- the slowest top-level imports, from `python -X importtime`
+
+Usage:
+    python3 bench-startup.py                       # All entry points
+    python3 bench-startup.py log-meeting-to-memory.py watch-granola.py
+    python3 bench-startup.py --runs 10 --budget-ms 80 --json
+
+Exit status is 1 if any script's median exceeds --budget-ms.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import argparse
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Executes the script's top level but not its `if __name__ == '__main__'` block
+RUNNER = "import runpy, sys; runpy.run_path(sys.argv[1], run_name='__startup_bench__')"
+
+def entry_points():
+    return sorted(
+        name for name in os.listdir(SCRIPTS_DIR)
+        if name.endswith('.py') and '-' in name and name != os.path.basename(__file__)
+    )
+
+def wall_times(script, runs):
+    command = [sys.executable, '-c', RUNNER, script]
+    subprocess.run(command, capture_output=True)    # Warm-up: writes __pycache__
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True)
+        times.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'failed')
+    return times
+
+def import_times(script):
+    """{top-level module: cumulative ms} from -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', RUNNER, script],
+                            capture_output=True, text=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        # Nested imports are indented by two spaces per level
+        if name.startswith(' ') and not name.startswith('  '):
+            modules[name.strip()] = int(cumulative) / 1000
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start time of the script entry points')
+    parser.add_argument('scripts', nargs='*', help='Scripts to measure (default: every entry point)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=100)
+    parser.add_argument('--top', type=int, default=3, help='Slowest imports to show per script')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as empty:
+        baseline_script = empty.name
+    try:
+        baseline = statistics.median(wall_times(baseline_script, args.runs))
+        baseline_imports = import_times(baseline_script)
+    finally:
+        os.unlink(baseline_script)
+
+    results = {}
+    for name in args.scripts or entry_points():
+        script = name if os.path.sep in name else os.path.join(SCRIPTS_DIR, name)
+        try:
+            median = statistics.median(wall_times(script, args.runs))
+        except RuntimeError as e:
+            results[os.path.basename(script)] = {'error': str(e)}
+            continue
+        imports = import_times(script)
+        slowest = sorted(((ms, mod) for mod, ms in imports.items() if mod not in baseline_imports), reverse=True)
+        results[os.path.basename(script)] = {
+            'median_ms': round(median, 1),
+            'over_baseline_ms': round(median - baseline, 1),
+            'slowest_imports': [{'module': mod, 'ms': round(ms, 1)} for ms, mod in slowest[:args.top]],
+        }
+
+    over = [n for n, r in results.items() if 'error' in r or r['median_ms'] > args.budget_ms]
+    if args.json:
+        print(json.dumps({'baseline_ms': round(baseline, 1), 'budget_ms': args.budget_ms, 'scripts': results}, indent=2))
+    else:
+        print(f"Startup time (median of {args.runs}; bare interpreter {baseline:.0f} ms; budget {args.budget_ms:g} ms)")
+        print()
+        width = max(len(n) for n in results)
+        for name, r in results.items():
+            if 'error' in r:
+                print(f"  {name:<{width}}  ERROR: {r['error']}")
+                continue
+            flag = '  ⚠️ over budget' if name in over else ''
+            slowest = ', '.join(f"{i['module']} {i['ms']:.1f}" for i in r['slowest_imports'])
+            print(f"  {name:<{width}}  {r['median_ms']:6.1f} ms  (+{r['over_baseline_ms']:.1f})  {slowest}{flag}")
+    sys.exit(1 if over else 0)
+
+if __name__ == '__main__':
+    main()
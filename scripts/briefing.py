@@ -0,0 +1,299 @@
+"""
+Precomputed morning briefing digest.
+
+The skill's Morning Briefing used to be assembled on request: read the
+calendar, then grep interaction logs and action items across the tree for
+everyone on it. build_briefing() does that work ahead of time for one day
+and keeps the result under MEMORY_ROOT/config/briefing/:
+
+    YYYY-MM-DD.md     the digest /mem-briefing prints as-is
+    YYYY-MM-DD.json   the events and per-person context it was rendered from
+
+Each calendar attendee with a profile gets their last interaction, recent
+meeting topics (from the catalog's topic posting list) and open action
+items (from the catalog's action item index: unchecked boxes assigned to
+them, in their action-items.md or interaction log, or from meetings they
+attended, soonest due first).
+
+Nightly consolidation builds the next day's digest and watch-granola.py
+rebuilds today's on the first cache change of the day, picking up calendar
+changes. In between, refresh_briefing() keeps it current incrementally:
+log-meeting-to-memory.py passes the files it wrote, and only the people
+those files belong to (or who attended a meeting among them) are looked up
+again before the digest is re-rendered.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from memory_catalog import open_catalog
+from memory_config import GRANOLA_CACHE
+from memory_tree import entity_of, FRONTMATTER_RE
+
+BRIEFING_DIR = os.path.join('config', 'briefing')
+PRIORITIES_FILE = 'me/current-priorities.md'
+
+MAX_OPEN_ITEMS = 5
+MAX_TOPICS = 5
+KEEP_DAYS = 7            # Older digests are removed when a new one is saved
+
+def briefing_paths(memory_root, day):
+    """(digest, state) file paths for one day."""
+    base = os.path.join(memory_root, BRIEFING_DIR, day)
+    return base + '.md', base + '.json'
+
+def resolve_day(value):
+    """'today', 'tomorrow' or an ISO date -> ISO date."""
+    today = datetime.now().date()
+    if value in (None, '', 'today'):
+        return today.isoformat()
+    if value == 'tomorrow':
+        return (today + timedelta(days=1)).isoformat()
+    return datetime.strptime(value, '%Y-%m-%d').date().isoformat()
+
+# -- calendar ---------------------------------------------------------------
+
+def _local_time(value):
+    """(local ISO date, 'HH:MM') of a calendar dateTime, or (date, '') for all-day events."""
+    if not value:
+        return '', ''
+    if 'T' not in value:
+        return value[:10], ''
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return value[:10], ''
+    if moment.tzinfo:
+        moment = moment.astimezone()
+    return moment.date().isoformat(), moment.strftime('%H:%M')
+
+def load_calendar(day):
+    """Calendar events on day from the Granola cache, in start order (self excluded from attendees)."""
+    try:
+        with open(GRANOLA_CACHE, 'r') as f:
+            data = json.load(f)
+        state = json.loads(data.get('cache', '')).get('state', {})
+    except (OSError, ValueError, AttributeError):
+        return []
+
+    events = []
+    for event in state.get('events', []):
+        if not isinstance(event, dict):
+            continue
+        start = event.get('start') or {}
+        end = event.get('end') or {}
+        start_day, start_time = _local_time(start.get('dateTime') or start.get('date', ''))
+        if start_day != day:
+            continue
+        attendees = []
+        for att in event.get('attendees') or []:
+            if not isinstance(att, dict) or att.get('self') or '@' not in att.get('email', ''):
+                continue
+            attendees.append({'email': att['email'].lower(), 'name': att.get('displayName', ''), 'dir': None})
+        events.append({
+            'id': event.get('id', ''),
+            'title': event.get('summary', 'Untitled'),
+            'start': start_time,
+            'end': _local_time(end.get('dateTime') or end.get('date', ''))[1],
+            'attendees': attendees,
+        })
+    return sorted(events, key=lambda e: (e['start'], e['title']))
+
+# -- per-person context -----------------------------------------------------
+
+def open_items(catalog, person_dir):
+    """Open action items involving a person, from the catalog's index."""
+    items, seen = [], set()
+    # Read past duplicates (the same item copied into a profile and a meeting)
+    _, rows = catalog.action_items(person_dir=person_dir, limit=MAX_OPEN_ITEMS * 4)
+    for row in rows:
+        if row['text'] in seen:
+            continue
+        seen.add(row['text'])
+        items.append({'text': row['text'], 'source': row['path']})
+        if len(items) == MAX_OPEN_ITEMS:
+            break
+    return items
+
+def person_context(catalog, entity):
+    """Everything the briefing shows about one person."""
+    person_dir = entity['dir']
+    return {
+        'dir': person_dir,
+        'name': entity.get('name') or person_dir.rsplit('/', 1)[-1],
+        'company': entity.get('company', ''),
+        'role': entity.get('role', ''),
+        'last_interaction': catalog.last_interaction(person_dir),
+        'topics': [row['topic'] for row in catalog.recent_topics(person_dir, MAX_TOPICS)],
+        'open_items': open_items(catalog, person_dir),
+    }
+
+def load_priorities(memory_root):
+    """Body of me/current-priorities.md (without frontmatter), or ''."""
+    try:
+        with open(os.path.join(memory_root, PRIORITIES_FILE), 'r') as f:
+            text = f.read()
+    except OSError:
+        return ''
+    match = FRONTMATTER_RE.match(text)
+    return (text[match.end():] if match else text).strip()
+
+def _resolve_attendees(catalog, state):
+    """Link attendees to profiles; returns the folders newly linked."""
+    linked = set()
+    for event in state['events']:
+        for att in event['attendees']:
+            if att['dir']:
+                continue
+            entity = catalog.person_by_email(att['email'])
+            if entity:
+                att['dir'] = entity['dir']
+                linked.add(entity['dir'])
+    return linked
+
+# -- rendering --------------------------------------------------------------
+
+def render(state):
+    """The digest markdown for a briefing state."""
+    day = datetime.strptime(state['day'], '%Y-%m-%d')
+    lines = [
+        f"# 🌅 Morning Briefing - {day.strftime('%A, %B %d, %Y')}",
+        '',
+        f"*Precomputed {state['built_at']}, last updated {state['updated_at']}*",
+        '',
+        '## 📋 Your Current Priorities',
+        '',
+        state['priorities'] or f"*[No priorities yet: add them to {PRIORITIES_FILE}]*",
+        '',
+        f"## 📅 Today's Meetings ({len(state['events'])})",
+        '',
+    ]
+    if not state['events']:
+        lines += ['*No meetings on the calendar.*', '']
+
+    following_up = []
+    for event in state['events']:
+        when = f"{event['start']}-{event['end']}" if event['start'] else 'All day'
+        lines += [f"### {when} {event['title']}", '']
+        if not event['attendees']:
+            lines += ['*No other attendees.*', '']
+        for att in event['attendees']:
+            person = state['people'].get(att['dir']) if att['dir'] else None
+            if person is None:
+                lines.append(f"- **{att['name'] or att['email']}** ({att['email']}) - no profile yet")
+                continue
+            about = ', '.join(part for part in (person['role'], person['company']) if part)
+            lines.append(f"- **{person['name']}**{f' ({about})' if about else ''} - `{person['dir']}/`")
+            last = person['last_interaction']
+            lines.append(f"  - Last interaction: {f'{last[0]} - {last[1]}' if last else 'none logged'}")
+            if person['topics']:
+                lines.append(f"  - Recent topics: {', '.join(person['topics'])}")
+            for item in person['open_items']:
+                lines.append(f"  - [ ] {item['text']} *({item['source']})*")
+            if person['open_items'] and person['dir'] not in following_up:
+                following_up.append(person['dir'])
+        lines.append('')
+
+    lines += ['## 👥 Follow Up Before Meetings', '']
+    if following_up:
+        for person_dir in following_up:
+            person = state['people'][person_dir]
+            lines.append(f"- {person['name']}: {len(person['open_items'])} open item(s)")
+    else:
+        lines.append('*No open action items with today\'s attendees.*')
+    lines.append('')
+    return '\n'.join(lines)
+
+# -- state ------------------------------------------------------------------
+
+def load_state(memory_root, day):
+    """A day's briefing state, or None if it hasn't been built."""
+    try:
+        with open(briefing_paths(memory_root, day)[1], 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def save_state(memory_root, state):
+    """Write the state and its rendered digest, and drop digests older than KEEP_DAYS."""
+    digest_path, state_path = briefing_paths(memory_root, state['day'])
+    directory = os.path.dirname(digest_path)
+    os.makedirs(directory, exist_ok=True)
+    state['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M')
+    _write(state_path, json.dumps(state, indent=1))
+    _write(digest_path, render(state))
+
+    cutoff = (datetime.strptime(state['day'], '%Y-%m-%d') - timedelta(days=KEEP_DAYS)).strftime('%Y-%m-%d')
+    for name in os.listdir(directory):
+        if name[:10] < cutoff and name.endswith(('.md', '.json')):
+            os.remove(os.path.join(directory, name))
+    return digest_path
+
+def build_briefing(memory_root, day, events=None):
+    """Build and save a day's briefing from scratch. Returns the state."""
+    now = datetime.now().strftime('%Y-%m-%d %H:%M')
+    state = {
+        'day': day,
+        'built_at': now,
+        'updated_at': now,
+        'events': load_calendar(day) if events is None else events,
+        'priorities': load_priorities(memory_root),
+        'people': {},
+    }
+    catalog = open_catalog(memory_root)
+    try:
+        _resolve_attendees(catalog, state)
+        for event in state['events']:
+            for att in event['attendees']:
+                if att['dir'] and att['dir'] not in state['people']:
+                    state['people'][att['dir']] = person_context(catalog, catalog.entity(att['dir']))
+    finally:
+        catalog.close()
+    save_state(memory_root, state)
+    return state
+
+def refresh_briefing(memory_root, paths):
+    """
+    Bring existing digests (today's and tomorrow's) up to date with files
+    that were just written. Only affected people are looked up again; the
+    catalog must already include paths. Returns the days refreshed.
+    """
+    rels = {os.path.relpath(os.path.abspath(p), memory_root).replace(os.sep, '/') for p in paths}
+    states = [s for s in (load_state(memory_root, resolve_day(d)) for d in ('today', 'tomorrow')) if s]
+    if not states:
+        return []
+
+    catalog = open_catalog(memory_root, refresh=False)
+    refreshed = []
+    try:
+        touched = set()
+        for rel in rels:
+            if rel.startswith('meetings/'):
+                touched.update(catalog.attendee_dirs(rel))
+            else:
+                etype, edir = entity_of(rel)
+                if etype == 'person':
+                    touched.add(edir)
+
+        for state in states:
+            changed = set(state['people']) & touched
+            changed |= _resolve_attendees(catalog, state)
+            priorities = PRIORITIES_FILE in rels
+            if not changed and not priorities:
+                continue
+            if priorities:
+                state['priorities'] = load_priorities(memory_root)
+            for person_dir in changed:
+                state['people'][person_dir] = person_context(catalog, catalog.entity(person_dir))
+            save_state(memory_root, state)
+            refreshed.append(state['day'])
+    finally:
+        catalog.close()
+    return refreshed
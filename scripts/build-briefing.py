@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed morning briefing digest
+
+Reads the day's calendar events from the Granola cache and, for every
+attendee with a profile, their last interaction, recent meeting topics and
+open action items, then writes MEMORY_ROOT/config/briefing/YYYY-MM-DD.md
+(see briefing.py). Nightly consolidation runs it for the next day;
+watch-granola.py and log-meeting-to-memory.py keep it current after that.
+
+Usage:
+    python3 build-briefing.py                      # Build today's digest
+    python3 build-briefing.py --date tomorrow      # What nightly consolidation runs
+    python3 build-briefing.py --show               # Print today's digest, building it if missing
+    python3 build-briefing.py --json               # Print the state it was rendered from
+"""
+
+import json
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(__file__))
+from briefing import briefing_paths, build_briefing, load_state, resolve_day
+from memory_config import get_memory_root
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the precomputed morning briefing digest')
+    parser.add_argument('--memory-root', default=None, help='Override memory root from config')
+    parser.add_argument('--date', default='today', help="Day to brief: today, tomorrow or YYYY-MM-DD")
+    parser.add_argument('--show', action='store_true', help='Print the digest (built only if missing)')
+    parser.add_argument('--json', action='store_true', help='Print the briefing state as JSON')
+    args = parser.parse_args()
+
+    memory_root = args.memory_root or get_memory_root()
+    if not os.path.isdir(memory_root):
+        print(f"ERROR: Memory root not found: {memory_root}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        day = resolve_day(args.date)
+    except ValueError:
+        print(f"ERROR: --date must be today, tomorrow or YYYY-MM-DD (got {args.date})", file=sys.stderr)
+        sys.exit(2)
+
+    digest_path = briefing_paths(memory_root, day)[0]
+    state = load_state(memory_root, day) if args.show else None
+    if state is None or not os.path.exists(digest_path):
+        state = build_briefing(memory_root, day)
+
+    if args.json:
+        print(json.dumps(state, indent=2))
+    elif args.show:
+        with open(digest_path, 'r') as f:
+            sys.stdout.write(f.read())
+    else:
+        people = sum(1 for event in state['events'] for att in event['attendees'] if att['dir'])
+        print(f"Briefing for {day}: {len(state['events'])} meeting(s), {people} attendee(s) with profiles")
+        print(f"  {digest_path}")
+
+if __name__ == '__main__':
+    main()
@@ -82,6 +82,21 @@ for interaction_file in "$MEMORY_ROOT/people"/*/interactions/"$THIS_MONTH.md"; d
     fi
 done
 
+# Pack months older than the retention horizon into .archive/
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+if [ -f "$SCRIPT_DIR/archive-memory.py" ]; then
+    echo ""
+    echo "🗄️  Archiving old months..."
+    python3 "$SCRIPT_DIR/archive-memory.py" --memory-root "$MEMORY_ROOT" compact || echo "  ⚠️  Archiving failed"
+fi
+
+# Precompute tomorrow morning's briefing while nothing else is running
+if [ -f "$SCRIPT_DIR/build-briefing.py" ]; then
+    echo ""
+    echo "🌅 Precomputing tomorrow's briefing..."
+    python3 "$SCRIPT_DIR/build-briefing.py" --memory-root "$MEMORY_ROOT" --date tomorrow || echo "  ⚠️  Briefing failed"
+fi
+
 echo ""
 echo "✅ Consolidation complete!"
 echo ""
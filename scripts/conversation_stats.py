@@ -0,0 +1,150 @@
+"""
+Per-meeting conversation analytics from transcript segment timings.
+
+Granola tags every segment with its source (microphone: the user;
+system: everyone on the call) and start/end timestamps. From the merged
+segments of a meeting, conversation_stats() works out:
+
+    talk_share                 the user's share of speaking time (0-1)
+    longest_monologue_seconds  longest run of one side speaking without a
+    longest_monologue_by       silence, and whose it was ('you' or 'call')
+    silence_gaps               pauses of SILENCE_SECONDS or more where nobody
+    silence_seconds            spoke, and their total length
+    segments_per_minute        segment rate over the transcript's span
+
+log-meeting-to-memory.py writes them into the meeting frontmatter, the
+catalog aggregates them per person and per month (query-memory.py
+conversation), and rebuild-memory.py backfills them for past meetings.
+
+With NumPy every statistic is a handful of array operations over the
+timestamp columns (running max for overlap, reduceat for runs), so a full
+history is computed in well under a second; without it the same figures
+come from one pass over the arrays.
+"""
+
+import math
+from array import array
+
+from granola_segments import NUMPY_AVAILABLE, SOURCE_MICROPHONE, SOURCE_SYSTEM, SOURCE_UNKNOWN, _numpy
+
+# A pause this long (nobody speaking) counts as a silence and ends a monologue
+SILENCE_SECONDS = 5.0
+
+# Frontmatter field -> catalog column type, in the order they're written
+FIELDS = (
+    ('talk_share', 'REAL'),
+    ('longest_monologue_seconds', 'REAL'),
+    ('longest_monologue_by', 'TEXT'),
+    ('silence_gaps', 'INTEGER'),
+    ('silence_seconds', 'REAL'),
+    ('segments_per_minute', 'REAL'),
+)
+
+SPEAKERS = {SOURCE_MICROPHONE: 'you', SOURCE_SYSTEM: 'call'}
+
+class SegmentTimes:
+    """Start/end/source columns of a merged transcript, appended in start order."""
+
+    __slots__ = ('starts', 'ends', 'sources')
+
+    def __init__(self):
+        self.starts = array('d')
+        self.ends = array('d')
+        self.sources = array('B')
+
+    def append(self, start, end, source):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.sources.append(source)
+
+    def __len__(self):
+        return len(self.starts)
+
+def _result(talk, listen, monologue, monologue_source, gaps, silence, count, span):
+    return {
+        'talk_share': round(talk / (talk + listen), 2) if talk + listen > 0 else None,
+        'longest_monologue_seconds': round(monologue, 1),
+        'longest_monologue_by': SPEAKERS.get(monologue_source, ''),
+        'silence_gaps': gaps,
+        'silence_seconds': round(silence, 1),
+        'segments_per_minute': round(count / (span / 60), 1) if span > 0 else 0.0,
+    }
+
+def _stats_numpy(times):
+    np = _numpy()
+    starts = np.frombuffer(times.starts, dtype=np.float64)
+    ends = np.frombuffer(times.ends, dtype=np.float64)
+    sources = np.frombuffer(times.sources, dtype=np.uint8)
+    valid = ~(np.isnan(starts) | np.isnan(ends))
+    starts, sources = starts[valid], sources[valid]
+    ends = np.maximum(ends[valid], starts)
+    if not len(starts):
+        return None
+
+    spoken = ends - starts
+    talk = float(spoken[sources == SOURCE_MICROPHONE].sum())
+    listen = float(spoken[sources == SOURCE_SYSTEM].sum())
+
+    # How far speech has reached before each segment starts (segments overlap)
+    reach = np.maximum.accumulate(ends)
+    pauses = starts[1:] - reach[:-1]
+    silent = pauses >= SILENCE_SECONDS
+
+    # Runs of one side speaking, broken by a change of side or a silence
+    breaks = np.concatenate(([True], (sources[1:] != sources[:-1]) | silent))
+    run_starts = np.flatnonzero(breaks)
+    run_lengths = np.maximum.reduceat(ends, run_starts) - starts[run_starts]
+    run_lengths[sources[run_starts] == SOURCE_UNKNOWN] = 0
+    longest = int(np.argmax(run_lengths))
+
+    return _result(talk, listen, float(run_lengths[longest]), int(sources[run_starts[longest]]),
+                   int(silent.sum()), float(pauses[silent].sum()), len(starts), float(reach[-1] - starts[0]))
+
+def _stats_python(times):
+    talk = listen = silence = 0.0
+    gaps = count = 0
+    first = reach = None
+    monologue, monologue_source = 0.0, SOURCE_UNKNOWN
+    run_source, run_start, run_end = None, 0.0, 0.0
+
+    for start, end, source in zip(times.starts, times.ends, times.sources):
+        if math.isnan(start) or math.isnan(end):
+            continue
+        end = max(end, start)
+        count += 1
+        if source == SOURCE_MICROPHONE:
+            talk += end - start
+        elif source == SOURCE_SYSTEM:
+            listen += end - start
+
+        is_silence = reach is not None and start - reach >= SILENCE_SECONDS
+        if is_silence:
+            gaps += 1
+            silence += start - reach
+        if source != run_source or is_silence:
+            if run_source not in (None, SOURCE_UNKNOWN) and run_end - run_start > monologue:
+                monologue, monologue_source = run_end - run_start, run_source
+            run_source, run_start, run_end = source, start, end
+        else:
+            run_end = max(run_end, end)
+        if first is None:
+            first = start
+        reach = end if reach is None else max(reach, end)
+
+    if not count:
+        return None
+    if run_source != SOURCE_UNKNOWN and run_end - run_start > monologue:
+        monologue, monologue_source = run_end - run_start, run_source
+    return _result(talk, listen, monologue, monologue_source, gaps, silence, count, reach - first)
+
+def conversation_stats(times):
+    """The FIELDS for one meeting's SegmentTimes, or None without usable timestamps."""
+    if not len(times):
+        return None
+    return _stats_numpy(times) if NUMPY_AVAILABLE else _stats_python(times)
+
+def frontmatter_lines(stats):
+    """The stats as frontmatter lines ('' for None, so meetings without timings keep the old layout)."""
+    if not stats:
+        return ''
+    return ''.join(f"\n{name}: {'' if stats[name] is None else stats[name]}" for name, _ in FIELDS)
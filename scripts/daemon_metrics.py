@@ -0,0 +1,266 @@
+"""
+Metrics and structured event logs for the Granola daemons.
+
+The daemons' only record used to be free-text log lines, so a slow cache
+parse or syncs creeping from two minutes after a meeting to twenty showed
+up only as a feeling. Each daemon now keeps:
+
+- a Metrics registry (counters, gauges, histograms) written as a
+  Prometheus textfile to MEMORY_ROOT/config/metrics/<daemon>.prom, for
+  node_exporter's textfile collector or anything that reads the format.
+  Values are cumulative since the daemon started.
+- an EventLog: one JSON object per line in MEMORY_ROOT/logs/<daemon>.jsonl
+  (cache reads, syncs, errors), through a buffered handle that is flushed
+  whenever the textfile is written and rotated by size.
+
+What the series mean is defined once, in DEFINITIONS. Only the standard
+library is used; the daemons import this at startup.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+METRICS_DIR = os.path.join('config', 'metrics')
+PREFIX = 'workmemory_'
+
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+# Transcript end to meeting file written. Syncs wait SETTLE_SECONDS (2 min)
+# for the transcript to settle, so the interesting range starts there.
+LAG_BUCKETS = (150, 180, 240, 300, 600, 900, 1800, 3600, 4 * 3600, 24 * 3600)
+PARSE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SYNC_BUCKETS = (1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# name -> (type, help, histogram buckets)
+DEFINITIONS = {
+    'started_timestamp_seconds': ('gauge', 'When the daemon started (Unix time)', None),
+    'cache_parse_seconds': ('histogram', 'Time to read and parse the Granola cache', PARSE_BUCKETS),
+    'cache_events_total': ('counter', 'Granola cache change notifications received', None),
+    'cache_reads_total': ('counter', 'Granola cache reads (torn reads included)', None),
+    'cache_events_coalesced_total': ('counter', 'Change notifications absorbed into another read', None),
+    'cache_torn_reads_total': ('counter', 'Cache reads that caught Granola mid-write', None),
+    'calendar_triggers_total': ('counter', 'Calendar events whose sync time came, by whether a transcript matched', None),
+    'transcripts_queued_total': ('counter', 'New transcripts queued for sync', None),
+    'sync_jobs_total': ('counter', 'Sync attempts by result (synced, retry, failed)', None),
+    'sync_duration_seconds': ('histogram', 'Logger run time per meeting', SYNC_BUCKETS),
+    'sync_lag_seconds': ('histogram', 'Transcript end to meeting file written', LAG_BUCKETS),
+    'errors_total': ('counter', 'Errors by type', None),
+    'queue_jobs': ('gauge', 'Sync queue jobs by status', None),
+}
+
+ERROR_TYPE_RE = re.compile(r'^(\w+(?:Error|Exception|Interrupt))\b', re.MULTILINE)
+
+def error_type(error_text):
+    """Short error class for a failed sync's output (the last exception named, 'timeout', or 'exit')."""
+    if error_text.startswith('timed out'):
+        return 'timeout'
+    found = ERROR_TYPE_RE.findall(error_text)
+    return found[-1] if found else 'exit'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    """Thread-safe registry of the series in DEFINITIONS."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = {}  # (name, sorted label pairs) -> number or Histogram
+
+    def _key(self, name, labels):
+        if name not in DEFINITIONS:
+            raise KeyError(f"undefined metric: {name}")
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.series[key] = self.series.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.series[key] = value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.series.get(key)
+            if histogram is None:
+                histogram = self.series[key] = Histogram(DEFINITIONS[name][2])
+            histogram.observe(value)
+
+    def value(self, name, **labels):
+        """Current value (a Histogram for histograms), None if never recorded."""
+        with self.lock:
+            return self.series.get(self._key(name, labels))
+
+    def render(self):
+        """The registry in the Prometheus text exposition format."""
+        return render_metrics(self)
+
+def _merge(series, key, value):
+    """Add one registry's value for a series to the merged series (a copy for histograms)."""
+    current = series.get(key)
+    if isinstance(value, Histogram):
+        if current is None:
+            current = series[key] = Histogram(value.buckets)
+        current.counts = [a + b for a, b in zip(current.counts, value.counts)]
+        current.sum += value.sum
+        current.count += value.count
+    elif current is None or DEFINITIONS[key[0]][0] == 'gauge':
+        series[key] = value
+    else:
+        series[key] = current + value
+
+def render_metrics(*registries):
+    """
+    Registries in the Prometheus text exposition format, merged by metric.
+
+    Each metric gets one HELP/TYPE block (a textfile collector rejects a
+    file that repeats one), and a series recorded in several registries
+    (errors_total in both the watcher's shared and a root's registry) is
+    summed; for gauges the last registry wins.
+    """
+    series = {}
+    for registry in registries:
+        with registry.lock:
+            for key, value in registry.series.items():
+                _merge(series, key, value)
+
+    lines = []
+    for name, (kind, help_text, _) in DEFINITIONS.items():
+        keys = sorted(key for key in series if key[0] == name)
+        if not keys:
+            continue
+        full = PREFIX + name
+        lines.append(f"# HELP {full} {help_text}")
+        lines.append(f"# TYPE {full} {kind}")
+        for key in keys:
+            labels, value = key[1], series[key]
+            if kind != 'histogram':
+                lines.append(f"{full}{_labels(labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(value.buckets + (float('inf'),), value.counts + [0]):
+                cumulative += count
+                bucket_count = value.count if bound == float('inf') else cumulative
+                lines.append(f"{full}_bucket{_labels(labels, [('le', _number(bound))])} {bucket_count}")
+            lines.append(f"{full}_sum{_labels(labels)} {_number(value.sum)}")
+            lines.append(f"{full}_count{_labels(labels)} {value.count}")
+    return '\n'.join(lines) + '\n' if lines else ''
+
+def metrics_path(memory_root, daemon):
+    return os.path.join(memory_root, METRICS_DIR, f"{daemon}.prom")
+
+def write_textfile(path, *registries):
+    """Write the registries, merged, to one textfile (atomically: collectors may read it at any time)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(render_metrics(*registries))
+    os.replace(tmp, path)
+
+class RotatingLog:
+    """
+    Append-only log file kept open, rotated to path.1 .. path.N by size.
+
+    One instance per path (see open_log), shared by every thread writing
+    to it, so rotation never races another handle.
+    """
+
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS, buffering=-1):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.buffering = buffering
+        self.lock = threading.Lock()
+        self._open()
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = open(self.path, 'a', buffering=self.buffering)
+        self.size = self.file.tell()
+
+    def _rotate(self):
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def write(self, text):
+        with self.lock:
+            self.file.write(text)
+            self.size += len(text)
+            if self.size >= self.max_bytes:
+                self._rotate()
+
+    def flush(self):
+        with self.lock:
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+def open_log(path, buffering=-1):
+    """The process's RotatingLog for path (created on first use)."""
+    path = os.path.abspath(path)
+    with _logs_lock:
+        if path not in _logs:
+            _logs[path] = RotatingLog(path, buffering=buffering)
+        return _logs[path]
+
+class EventLog:
+    """Structured JSONL events: {"ts": ..., "event": kind, ...fields}."""
+
+    def __init__(self, memory_root, daemon):
+        self.log = open_log(os.path.join(memory_root, 'logs', f"{daemon}.jsonl"))
+
+    def event(self, kind, **fields):
+        record = {'ts': round(time.time(), 3), 'event': kind}
+        record.update(fields)
+        self.log.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def flush(self):
+        self.log.flush()
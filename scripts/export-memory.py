@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Export meetings, attendees and interactions as columnar files
+
+Questions about meeting load (hours per week, meetings per contact,
+internal vs external split) otherwise mean parsing every markdown file.
+This exports the rows log-meeting-to-memory.py records for each meeting
+(the meeting file from get_meetings_for_date(), the attendee interaction
+entries from update_person_interactions()), as the catalog holds them, into
+one directory per table and month:
+
+    <out>/meetings/month=YYYY-MM/part-0000.parquet
+    <out>/attendees/month=YYYY-MM/part-0000.parquet
+    <out>/interactions/month=YYYY-MM/part-0000.parquet
+
+Parquet needs pyarrow. Without it the default is CSV, with column types in
+<out>/schema.json; --format npz writes one NumPy array per column instead.
+The month=YYYY-MM directories load as a partitioned dataset in pandas,
+DuckDB or pyarrow.
+
+Exports are incremental. manifest.json records, per month, the mtime and
+size of every source file and a digest of the rows it contributed.
+Unchanged months are skipped, rows appended to a file (a new meeting, new
+interaction entries) go into a new part file, and a month whose existing
+rows changed is rewritten.
+
+Usage:
+    python3 export-memory.py                          # To MEMORY_ROOT/config/export/
+    python3 export-memory.py --out ~/analytics/work-memory --format parquet
+    python3 export-memory.py --since 2026-01
+    python3 export-memory.py --full                   # Rewrite everything
+
+Optional:
+    pip install pyarrow    # Parquet output
+"""
+
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sys
+import argparse
+from datetime import date
+
+from importlib.util import find_spec
+
+sys.path.insert(0, os.path.dirname(__file__))
+from memory_catalog import open_catalog
+from memory_config import get_memory_root
+
+# Imported only when a part file in that format is written
+PYARROW_AVAILABLE = find_spec('pyarrow') is not None
+NUMPY_AVAILABLE = find_spec('numpy') is not None
+
+EXPORT_DIR = os.path.join('config', 'export')
+MANIFEST_FILE = 'manifest.json'
+SCHEMA_FILE = 'schema.json'
+EXTENSIONS = {'parquet': '.parquet', 'csv': '.csv', 'npz': '.npz'}
+
+COLUMNS = {
+    'meetings': [
+        ('path', 'string'), ('doc_id', 'string'), ('title', 'string'), ('date', 'date'), ('week', 'string'),
+        ('duration_minutes', 'float64'), ('was_split', 'bool'),
+        ('attendees', 'int32'), ('internal', 'int32'), ('external', 'int32'),
+    ],
+    'attendees': [
+        ('meeting_path', 'string'), ('date', 'date'), ('email', 'string'), ('name', 'string'),
+        ('domain', 'string'), ('category', 'string'), ('person_dir', 'string'),
+    ],
+    'interactions': [
+        ('path', 'string'), ('entity_dir', 'string'), ('category', 'string'), ('date', 'date'), ('title', 'string'),
+    ],
+}
+
+def iso_week(day):
+    try:
+        year, week, _ = date.fromisoformat(day).isocalendar()
+    except ValueError:
+        return ''
+    return f"{year}-W{week:02d}"
+
+def collect(catalog):
+    """{month: {source path: {'mtime', 'size', 'rows': {table: [row]}}}} from the catalog."""
+    exported = catalog.export_rows()
+    months = {}
+
+    def add(table, row, values):
+        month = (row['date'] or '')[:7]
+        if len(month) != 7:
+            return
+        source = months.setdefault(month, {}).setdefault(
+            row['source'], {'mtime': row['mtime'], 'size': row['size'], 'rows': {}}
+        )
+        source['rows'].setdefault(table, []).append(values)
+
+    split = {}
+    for row in exported['attendees']:
+        email = row['email']
+        add('attendees', row, [row['meeting_path'], row['date'], email, row['name'],
+                               email.split('@')[-1] if '@' in email else '', row['category'], row['person_dir']])
+        counts = split.setdefault(row['meeting_path'], {'all': 0, 'internal': 0, 'external': 0})
+        counts['all'] += 1
+        if row['category'] in counts:
+            counts[row['category']] += 1
+
+    for row in exported['meetings']:
+        counts = split.get(row['path'], {'all': 0, 'internal': 0, 'external': 0})
+        add('meetings', row, [row['path'], row['doc_id'], row['title'], row['date'], iso_week(row['date']),
+                              float(row['duration_minutes'] or 0), bool(row['was_split']),
+                              counts['all'], counts['internal'], counts['external']])
+
+    for row in exported['interactions']:
+        add('interactions', row, [row['path'], row['entity_dir'], row['category'], row['date'], row['title']])
+    return months
+
+def rows_digest(rows):
+    return hashlib.sha1(json.dumps(rows, separators=(',', ':')).encode()).hexdigest()
+
+def plan_month(previous, current):
+    """
+    Compare a month's source files with what the last export recorded.
+
+    Returns ('rewrite', every row), ('append', new rows) or ('skip', {}),
+    rows being {table: [row]}. A file's rows count as appended only if its
+    previously exported rows are still its first rows, unchanged.
+    """
+    everything = {table: [row for source in current.values() for row in source['rows'].get(table, [])]
+                  for table in COLUMNS}
+    if previous is None or set(previous['files']) - set(current):
+        return 'rewrite', everything
+
+    appended = {table: [] for table in COLUMNS}
+    for path, source in current.items():
+        old = previous['files'].get(path, {'mtime': None, 'size': None, 'tables': {}})
+        if old['mtime'] == source['mtime'] and old['size'] == source['size']:
+            continue
+        for table in COLUMNS:
+            rows = source['rows'].get(table, [])
+            count, digest = old['tables'].get(table, (0, rows_digest([])))
+            if len(rows) < count or rows_digest(rows[:count]) != digest:
+                return 'rewrite', everything
+            appended[table].extend(rows[count:])
+    if any(appended.values()):
+        return 'append', appended
+    return 'skip', {}
+
+def manifest_entry(current, parts):
+    return {
+        'parts': parts,
+        'files': {
+            path: {
+                'mtime': source['mtime'],
+                'size': source['size'],
+                'tables': {table: [len(rows), rows_digest(rows)] for table, rows in source['rows'].items()},
+            }
+            for path, source in current.items()
+        },
+    }
+
+# -- writers ----------------------------------------------------------------
+
+def _date_or_none(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def write_parquet(path, table, rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    types = {'string': pa.string(), 'date': pa.date32(), 'int32': pa.int32(), 'float64': pa.float64(),
+             'bool': pa.bool_()}
+    arrays = {}
+    for i, (name, kind) in enumerate(COLUMNS[table]):
+        values = [row[i] for row in rows]
+        if kind == 'date':
+            values = [_date_or_none(v) for v in values]
+        arrays[name] = pa.array(values, type=types[kind])
+    pq.write_table(pa.table(arrays), path)
+
+def write_csv(path, table, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _ in COLUMNS[table]])
+        for row in rows:
+            writer.writerow(['true' if v is True else 'false' if v is False else v for v in row])
+
+def write_npz(path, table, rows):
+    import numpy as np
+    dtypes = {'string': str, 'date': 'datetime64[D]', 'int32': np.int32, 'float64': np.float64, 'bool': bool}
+    arrays = {}
+    for i, (name, kind) in enumerate(COLUMNS[table]):
+        values = [row[i] for row in rows]
+        if kind == 'date':
+            values = [v if _date_or_none(v) else 'NaT' for v in values]
+        arrays[name] = np.array(values, dtype=dtypes[kind])
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+WRITERS = {'parquet': write_parquet, 'csv': write_csv, 'npz': write_npz}
+
+def write_part(out_dir, table, month, part, rows, fmt):
+    directory = os.path.join(out_dir, table, f"month={month}")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"part-{part:04d}{EXTENSIONS[fmt]}")
+    tmp = f"{path}.tmp"
+    WRITERS[fmt](tmp, table, rows)
+    os.replace(tmp, path)
+
+def remove_month(out_dir, month):
+    for table in COLUMNS:
+        shutil.rmtree(os.path.join(out_dir, table, f"month={month}"), ignore_errors=True)
+
+# -- export -----------------------------------------------------------------
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_json(out_dir, name, data):
+    path = os.path.join(out_dir, name)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(data, f, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+def export(memory_root, out_dir, fmt, since=None, full=False):
+    """Bring the export up to date. Returns {month: (action, {table: rows written})}."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    tables = {table: dict(columns) for table, columns in COLUMNS.items()}
+    # Parts written under other column types can't be appended to
+    if full or manifest is None or manifest.get('format') != fmt or manifest.get('tables') != tables:
+        for table in COLUMNS:
+            shutil.rmtree(os.path.join(out_dir, table), ignore_errors=True)
+        manifest = {'format': fmt, 'tables': tables, 'months': {}}
+    save_json(out_dir, SCHEMA_FILE, {
+        'format': fmt,
+        'partitioning': 'month=YYYY-MM',
+        'tables': tables,
+    })
+
+    catalog = open_catalog(memory_root)
+    try:
+        months = collect(catalog)
+    finally:
+        catalog.close()
+
+    results = {}
+    for month in sorted(set(months) | set(manifest['months'])):
+        if since and month < since:
+            continue
+        current = months.get(month)
+        previous = manifest['months'].get(month)
+        if current is None:
+            # Every source file of the month is gone
+            remove_month(out_dir, month)
+            del manifest['months'][month]
+            results[month] = ('removed', {})
+            save_json(out_dir, MANIFEST_FILE, manifest)
+            continue
+
+        action, rows = plan_month(previous, current)
+        if action == 'rewrite':
+            remove_month(out_dir, month)
+            parts = {}
+        else:
+            parts = dict(previous['parts'])
+        for table, table_rows in rows.items():
+            if table_rows:
+                write_part(out_dir, table, month, parts.get(table, 0), table_rows, fmt)
+                parts[table] = parts.get(table, 0) + 1
+        manifest['months'][month] = manifest_entry(current, parts)
+        # After every month, so an interrupted export resumes cleanly
+        save_json(out_dir, MANIFEST_FILE, manifest)
+        results[month] = (action, {table: len(r) for table, r in rows.items() if r})
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Export meetings, attendees and interactions as columnar files')
+    parser.add_argument('--memory-root', default=None, help='Override memory root from config')
+    parser.add_argument('--out', default=None, help='Output directory (default: MEMORY_ROOT/config/export)')
+    parser.add_argument('--format', choices=['auto', 'parquet', 'csv', 'npz'], default='auto',
+                        help='auto: parquet if pyarrow is installed, otherwise csv')
+    parser.add_argument('--since', help='Only export months from YYYY-MM on')
+    parser.add_argument('--full', action='store_true', help='Discard the previous export and rewrite everything')
+    args = parser.parse_args()
+
+    memory_root = args.memory_root or get_memory_root()
+    if not os.path.isdir(memory_root):
+        print(f"ERROR: Memory root not found: {memory_root}", file=sys.stderr)
+        sys.exit(1)
+
+    fmt = args.format
+    if fmt == 'auto':
+        fmt = 'parquet' if PYARROW_AVAILABLE else 'csv'
+    if fmt == 'parquet' and not PYARROW_AVAILABLE:
+        print("ERROR: Parquet output needs pyarrow (pip install pyarrow), or use --format csv", file=sys.stderr)
+        sys.exit(1)
+    if fmt == 'npz' and not NUMPY_AVAILABLE:
+        print("ERROR: NPZ output needs numpy (pip install numpy), or use --format csv", file=sys.stderr)
+        sys.exit(1)
+
+    out_dir = os.path.expanduser(args.out) if args.out else os.path.join(memory_root, EXPORT_DIR)
+    results = export(memory_root, out_dir, fmt, since=args.since, full=args.full)
+
+    print(f"Exported to {out_dir} ({fmt})")
+    unchanged = 0
+    for month, (action, counts) in results.items():
+        if action == 'skip':
+            unchanged += 1
+            continue
+        detail = ', '.join(f"{n} {table}" for table, n in counts.items())
+        print(f"  {month}: {action}{f' ({detail})' if detail else ''}")
+    if unchanged:
+        print(f"  {unchanged} month(s) unchanged")
+
+if __name__ == '__main__':
+    main()
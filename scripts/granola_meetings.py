@@ -0,0 +1,511 @@
+"""
+Granola cache reading and meeting assembly.
+
+Everything process-granola-meetings.py knows about Granola's data: loading
+the cache snapshot, detecting meetings that Granola split into several
+documents, merging their transcripts and collecting attendees. It lives in
+an importable module so log-meeting-to-memory.py (spawned by the daemons
+for every meeting) and the replay harness can use it without executing a
+script file.
+"""
+
+import json
+import sys
+import os
+import heapq
+import math
+import time
+from collections import deque
+from datetime import datetime
+
+from conversation_stats import SegmentTimes, conversation_stats
+from granola_segments import (
+    SOURCE_MICROPHONE, as_segment_table, build_segment_tables, ended_after, format_epoch,
+)
+from memory_config import GRANOLA_CACHE
+
+# A continuation starts at most this long after the previous document
+# ended, or this long before it (split documents can overlap)
+SPLIT_GAP_SECONDS = 120
+SPLIT_OVERLAP_SECONDS = 300
+
+# Document fields meeting assembly reads; a lean load drops the rest
+# (ProseMirror notes, panels, chat history), which is most of a document
+DOCUMENT_FIELDS = (
+    'title', 'created_at', 'updated_at', 'google_calendar_event', 'people', 'notes_plain', 'overview',
+)
+
+def trim_documents(documents):
+    """Documents reduced to DOCUMENT_FIELDS."""
+    return {
+        doc_id: {key: doc[key] for key in DOCUMENT_FIELDS if key in doc} if isinstance(doc, dict) else doc
+        for doc_id, doc in documents.items()
+    }
+
+def load_granola_data(lean=False, required=True):
+    """
+    Load and parse Granola's cache file.
+
+    lean (used under a memory budget, see memory_budget.py) trims documents
+    to DOCUMENT_FIELDS and frees each raw transcript as soon as its segment
+    table is built, so the parsed JSON and the tables never coexist in full.
+    A missing cache exits with an error, or returns None if not required
+    (the daemons wait for Granola to write one).
+    """
+    if not os.path.exists(GRANOLA_CACHE):
+        if not required:
+            return None
+        print(f"ERROR: Granola cache not found at {GRANOLA_CACHE}", file=sys.stderr)
+        sys.exit(1)
+
+    with open(GRANOLA_CACHE, 'r') as f:
+        data = json.load(f)
+
+    # Drop each layer as soon as the next one is parsed out of it
+    cache = data.pop('cache', '')
+    del data
+    inner = json.loads(cache)
+    del cache
+    state = inner.get('state', {})
+    documents = state.get('documents', {})
+    if lean:
+        documents = trim_documents(documents)
+
+    # Transcripts are converted to compact segment tables once per snapshot
+    return {
+        'documents': documents,
+        'transcripts': build_segment_tables(state.get('transcripts', {}), consume=lean),
+        'people': state.get('people', []),
+        'events': state.get('events', []),
+        'meetings_metadata': state.get('meetingsMetadata', {})
+    }
+
+def transcript_bytes(transcripts, doc_ids, splits):
+    """
+    Rough memory cost of assembling these meetings at once.
+
+    The merged transcript_text is about the size of the segment text plus
+    speaker labels, held alongside the tables it came from.
+    """
+    total = 0
+    for doc_id in doc_ids:
+        for d in [doc_id] + splits.get(doc_id, []):
+            table = transcripts.get(d)
+            if table:
+                total += 2 * as_segment_table(table).nbytes()
+    return total
+
+def release_meeting(transcripts, meeting):
+    """Free a written meeting's segment tables and transcript text."""
+    for doc_id in [meeting.get('doc_id')] + meeting.get('continuation_ids', []):
+        transcripts.pop(doc_id, None)
+    meeting['transcript_text'] = ''
+
+def parse_timestamp(ts):
+    """Parse ISO timestamp to datetime."""
+    if not ts:
+        return None
+    try:
+        ts = ts.replace('Z', '+00:00')
+        return datetime.fromisoformat(ts)
+    except:
+        return None
+
+def get_transcript_text(segments, include_speakers=True):
+    """Convert transcript segments to readable text."""
+    lines = []
+    for seg in segments:
+        source = seg.get('source', 'unknown')
+        text = seg.get('text', '').strip()
+
+        if not text:
+            continue
+
+        if include_speakers:
+            speaker = "[YOU]" if source == 'microphone' else "[CALL]"
+            lines.append(f"{speaker}: {text}")
+        else:
+            lines.append(text)
+
+    return '\n'.join(lines)
+
+def merge_transcripts(tables):
+    """
+    Lazily merge several segment tables in start time order.
+
+    Each table is in time order on its own (as Granola writes them); this
+    does a k-way merge across the main document and its continuations
+    without building a concatenated copy. Yields (table, row) pairs.
+
+    When split documents overlap in time, Granola repeats the overlapping
+    segments in both. A segment is dropped if a segment with the same source
+    and text was already emitted and is still "open" (its end is at or after
+    this segment's start).
+    """
+    def rows(k, table):
+        for i, start in enumerate(table.starts):
+            yield (0.0 if math.isnan(start) else start, k, i)
+
+    recent = deque()  # (end, source, text) of emitted segments still overlapping
+
+    for start, k, i in heapq.merge(*(rows(k, t) for k, t in enumerate(tables))):
+        table = tables[k]
+        end = table.ends[i]
+        if math.isnan(end):
+            end = start
+
+        while recent and recent[0][0] < start:
+            recent.popleft()
+
+        key = (table.sources[i], table.text(i))
+        if any((src, text) == key for _, src, text in recent):
+            continue
+
+        recent.append((end, key[0], key[1]))
+        yield table, i
+
+def assemble_transcript(segment_lists, include_speakers=True):
+    """
+    Merge segment tables and collect everything callers need in one pass.
+
+    Accepts SegmentTables or raw Granola segment lists. Returns a dict with
+    the merged segment count, first start / last end timestamps (ISO, as
+    Granola writes them), duration in minutes, the readable transcript and
+    the conversation analytics of the merged segments (None without timings).
+    """
+    tables = [as_segment_table(s) for s in segment_lists]
+    count = 0
+    first_start = math.nan
+    last_end = math.nan
+    lines = []
+    times = SegmentTimes()
+
+    for table, i in merge_transcripts(tables):
+        count += 1
+        times.append(table.starts[i], table.ends[i], table.sources[i])
+        if math.isnan(first_start):
+            first_start = table.starts[i]
+
+        end = table.ends[i]
+        if not math.isnan(end) and (math.isnan(last_end) or end >= last_end):
+            last_end = end
+
+        text = table.text(i)
+        if not text:
+            continue
+        if include_speakers:
+            speaker = "[YOU]" if table.sources[i] == SOURCE_MICROPHONE else "[CALL]"
+            lines.append(f"{speaker}: {text}")
+        else:
+            lines.append(text)
+
+    duration = (last_end - first_start) / 60
+    if math.isnan(duration):
+        duration = 0
+
+    return {
+        'segments': count,
+        'start_time': format_epoch(first_start),
+        'end_time': format_epoch(last_end),
+        'duration_minutes': round(duration, 1),
+        'transcript_text': '\n'.join(lines),
+        'conversation': conversation_stats(times),
+    }
+
+def detect_split_meetings(documents, transcripts):
+    """
+    Detect meetings that were split into multiple documents.
+
+    A split is identified when:
+    1. An untitled document exists
+    2. It starts within SPLIT_GAP_SECONDS of another meeting ending, or at
+       most SPLIT_OVERLAP_SECONDS before it ended (split documents can
+       overlap in time)
+    3. It has no calendar event (or same calendar event)
+    """
+    splits = {}  # Maps main doc_id -> list of continuation doc_ids
+
+    # Build list of meetings with timing info
+    meetings = []
+    for doc_id, doc in documents.items():
+        if not isinstance(doc, dict):
+            continue
+
+        table = transcripts.get(doc_id)
+        if not table:
+            continue
+
+        title = doc.get('title', '') or ''
+        gcal = doc.get('google_calendar_event', {})
+        gcal_id = gcal.get('id', '') if gcal else ''
+
+        table = as_segment_table(table)
+        start = table.first_start
+        end = table.last_end
+
+        if not math.isnan(start) and not math.isnan(end):
+            meetings.append({
+                'doc_id': doc_id,
+                'title': title,
+                'start': start,
+                'end': end,
+                'gcal_id': gcal_id,
+                'is_untitled': not title or title.strip() == ''
+            })
+
+    # Sort by start time
+    meetings.sort(key=lambda x: x['start'])
+
+    # Find splits: untitled meetings that start right after another
+    for i, mtg in enumerate(meetings):
+        if mtg['is_untitled']:
+            # Look for preceding meeting within 2 minutes
+            for j in range(i - 1, -1, -1):
+                prev = meetings[j]
+                gap = mtg['start'] - prev['end']
+
+                if gap < -SPLIT_OVERLAP_SECONDS:
+                    continue  # Recorded during prev, not after it
+                if gap <= SPLIT_GAP_SECONDS:
+                    if mtg['gcal_id'] and mtg['gcal_id'] != prev['gcal_id']:
+                        break  # A different calendar event
+                    # This is likely a continuation
+                    main_id = prev['doc_id']
+                    if main_id not in splits:
+                        splits[main_id] = []
+                    splits[main_id].append(mtg['doc_id'])
+                    break
+                else:
+                    break  # Too far apart
+
+    return splits
+
+def collect_attendees(doc, identities=None):
+    """
+    A document's attendees ({'email', 'name', 'response'}, plus 'person_id'
+    with an IdentityIndex), from its calendar event and Granola's people
+    field, once per email. The user (the calendar's self) is left out.
+    """
+    gcal = doc.get('google_calendar_event', {})
+
+    # Get attendees from multiple sources, keyed by email
+    attendees = {}
+
+    # Source 1: Google Calendar event attendees (most reliable)
+    if gcal:
+        gcal_attendees = gcal.get('attendees', [])
+        for att in gcal_attendees:
+            if isinstance(att, dict) and att.get('email'):
+                # Skip self (the user)
+                if att.get('self'):
+                    continue
+                attendees[att['email'].lower()] = {
+                    'email': att['email'],
+                    'name': att.get('displayName', ''),
+                    'response': att.get('responseStatus', '')
+                }
+
+    # Source 2: Granola's people.attendees field (has more details)
+    people = doc.get('people', {})
+    if isinstance(people, dict):
+        people_attendees = people.get('attendees', [])
+        if isinstance(people_attendees, list):
+            for att in people_attendees:
+                if isinstance(att, dict) and att.get('email'):
+                    email = att['email']
+                    details = att.get('details', {}).get('person', {})
+                    name = details.get('name', {}).get('fullName', '')
+                    # Check if already added from gcal
+                    existing = attendees.get(email.lower())
+                    if existing:
+                        # Enhance with more details from Granola
+                        if name and not existing['name']:
+                            existing['name'] = name
+                    else:
+                        attendees[email.lower()] = {
+                            'email': email,
+                            'name': name,
+                            'response': ''
+                        }
+
+    # Source 3: identity index (state.people + every other document)
+    if identities is not None:
+        return resolve_attendees(attendees.values(), identities)
+
+    return list(attendees.values())
+
+def resolve_attendees(attendees, identities):
+    """
+    Copies of attendees with each one's canonical 'person_id' from an
+    IdentityIndex, and missing names filled from what Granola knows. The
+    watcher assembles a meeting once without identities and resolves it
+    per memory root with this.
+    """
+    resolved = []
+    for att in attendees:
+        att = dict(att, person_id=identities.resolve(att['email'], att['name']))
+        if not att['name']:
+            att['name'] = identities.display_name(att['email'])
+        resolved.append(att)
+    return resolved
+
+def build_meeting(doc_id, doc, transcripts, splits, identities=None):
+    """
+    Assemble the meeting record for one (main) Granola document.
+
+    Continuations listed in splits are merged in. If an IdentityIndex is
+    given, each attendee gets a canonical 'person_id' and missing names are
+    filled from what Granola knows about them.
+    """
+    title = doc.get('title', '') or '[Untitled]'
+
+    # Merge any continuations
+    continuation_ids = splits.get(doc_id, [])
+    segment_lists = [transcripts.get(doc_id) or []]
+    segment_lists += [transcripts.get(cont_id) or [] for cont_id in continuation_ids]
+
+    if not any(segment_lists):
+        return {
+            'doc_id': doc_id,
+            'title': title,
+            'has_transcript': False,
+            'continuation_ids': continuation_ids,
+            'metadata': doc
+        }
+
+    transcript = assemble_transcript(segment_lists)
+
+    # Get calendar event info
+    gcal = doc.get('google_calendar_event', {})
+    attendees = collect_attendees(doc, identities)
+
+    return {
+        'doc_id': doc_id,
+        'title': title,
+        'has_transcript': True,
+        'segments': transcript['segments'],
+        'duration_minutes': transcript['duration_minutes'],
+        'start_time': transcript['start_time'],
+        'end_time': transcript['end_time'],
+        'transcript_text': transcript['transcript_text'],
+        'conversation': transcript['conversation'],
+        'continuation_ids': continuation_ids,
+        'was_split': len(continuation_ids) > 0,
+        'attendees': attendees,
+        'calendar_event': {
+            'id': gcal.get('id', ''),
+            'scheduled_start': gcal.get('start', {}).get('dateTime', '') if gcal else '',
+            'scheduled_end': gcal.get('end', {}).get('dateTime', '') if gcal else '',
+        } if gcal else None,
+        'metadata': {
+            'created_at': doc.get('created_at', ''),
+            'updated_at': doc.get('updated_at', ''),
+            'notes_plain': doc.get('notes_plain', ''),
+            'overview': doc.get('overview', ''),
+        }
+    }
+
+def get_meeting(documents, transcripts, doc_id, identities=None):
+    """
+    Assemble the meeting for a single document ID, or None if unknown.
+
+    A continuation document resolves to the meeting it was split from.
+    """
+    splits = detect_split_meetings(documents, transcripts)
+    for main_id, continuation_ids in splits.items():
+        if doc_id in continuation_ids:
+            doc_id = main_id
+            break
+
+    doc = documents.get(doc_id)
+    if not isinstance(doc, dict):
+        return None
+    return build_meeting(doc_id, doc, transcripts, splits, identities)
+
+def date_meeting_ids(documents, splits, target_date):
+    """Main (non-continuation) documents created on target_date."""
+    continuation_ids = {c for conts in splits.values() for c in conts}
+    return [
+        doc_id for doc_id, doc in documents.items()
+        if isinstance(doc, dict) and doc_id not in continuation_ids and target_date in doc.get('created_at', '')
+    ]
+
+def range_meeting_ids(documents, splits, since=None, until=None):
+    """Main documents created between since and until (YYYY-MM-DD, inclusive, either open), oldest first."""
+    continuation_ids = {c for conts in splits.values() for c in conts}
+    found = []
+    for doc_id, doc in documents.items():
+        if not isinstance(doc, dict) or doc_id in continuation_ids:
+            continue
+        created = doc.get('created_at', '') or ''
+        day = created[:10]
+        if not day or (since and day < since) or (until and day > until):
+            continue
+        found.append((created, doc_id))
+    return [doc_id for _, doc_id in sorted(found)]
+
+def iter_meetings(documents, transcripts, doc_ids, splits, identities=None):
+    """Assemble meetings one at a time, so a caller can write and release each before the next."""
+    for doc_id in doc_ids:
+        yield build_meeting(doc_id, documents[doc_id], transcripts, splits, identities)
+
+def get_meetings_for_date(documents, transcripts, target_date, identities=None):
+    """
+    Get all meetings for a specific date.
+
+    identities is an optional IdentityIndex (see build_meeting).
+    """
+    splits = detect_split_meetings(documents, transcripts)
+    doc_ids = date_meeting_ids(documents, splits, target_date)
+    return list(iter_meetings(documents, transcripts, doc_ids, splits, identities))
+
+def recent_meeting_ids(documents, transcripts, splits, minutes_ago=5):
+    """Main documents whose meeting (including continuations) ended in the last N minutes."""
+    cutoff = time.time() - minutes_ago * 60
+    continuation_doc_ids = {c for conts in splits.values() for c in conts}
+
+    # Continuations are merged into their main document below
+    candidates = [
+        doc_id for doc_id, doc in documents.items()
+        if isinstance(doc, dict) and doc_id not in continuation_doc_ids
+    ]
+    end_times = {doc_id: as_segment_table(transcripts.get(doc_id)).last_end for doc_id in candidates}
+
+    # The meeting ends when the last of its continuations ends
+    for doc_id, continuation_ids in splits.items():
+        if doc_id in end_times:
+            ends = [end_times[doc_id]]
+            ends += [as_segment_table(transcripts.get(c)).last_end for c in continuation_ids]
+            ends = [e for e in ends if not math.isnan(e)]
+            if ends:
+                end_times[doc_id] = max(ends)
+
+    return ended_after(end_times, cutoff)
+
+def iter_recent_meetings(documents, transcripts, doc_ids, splits):
+    """The lightweight records get_recent_meetings() returns, one at a time."""
+    for doc_id in doc_ids:
+        doc = documents[doc_id]
+        title = doc.get('title', '') or '[Untitled]'
+
+        continuation_ids = splits.get(doc_id, [])
+        segment_lists = [transcripts.get(doc_id) or []]
+        segment_lists += [transcripts.get(cont_id) or [] for cont_id in continuation_ids]
+        transcript = assemble_transcript(segment_lists)
+
+        yield {
+            'doc_id': doc_id,
+            'title': title,
+            'segments': transcript['segments'],
+            'duration_minutes': transcript['duration_minutes'],
+            'end_time': transcript['end_time'],
+            'transcript_text': transcript['transcript_text'],
+            'continuation_ids': continuation_ids,
+            'was_split': len(continuation_ids) > 0,
+        }
+
+def get_recent_meetings(documents, transcripts, minutes_ago=5):
+    """Get meetings that ended within the last N minutes."""
+    splits = detect_split_meetings(documents, transcripts)
+    doc_ids = recent_meeting_ids(documents, transcripts, splits, minutes_ago)
+    return list(iter_recent_meetings(documents, transcripts, doc_ids, splits))
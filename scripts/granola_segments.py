@@ -0,0 +1,170 @@
+"""
+Compact transcript segment tables for Granola documents.
+
+Granola stores each transcript as a list of JSON dicts with ISO timestamp
+strings. Keeping those around costs several hundred bytes per segment and
+every timing query has to re-parse the timestamps. A SegmentTable holds the
+same data column-wise instead:
+
+- starts / ends: epoch seconds in array('d') (NaN when Granola had no value)
+- sources: one byte per segment, an index into SOURCES
+- text: one string buffer plus array('I') offsets into it
+
+Tables are built once when the cache snapshot is loaded. If NumPy is
+installed the columns are exposed as zero-copy ndarrays for vectorized
+queries; otherwise the same queries run over the arrays directly.
+"""
+
+import math
+from array import array
+from datetime import datetime, timezone
+
+from importlib.util import find_spec
+
+# NumPy is imported on first use: it costs more than everything else the
+# daemon-spawned scripts load at startup. NUMPY_AVAILABLE only checks that
+# it is installed.
+NUMPY_AVAILABLE = find_spec('numpy') is not None
+np = None
+
+def _numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+# Segment source enum (index into this tuple is what gets stored)
+SOURCES = ('unknown', 'microphone', 'system')
+SOURCE_UNKNOWN = 0
+SOURCE_MICROPHONE = 1
+SOURCE_SYSTEM = 2
+_SOURCE_CODES = {name: code for code, name in enumerate(SOURCES)}
+
+NAN = float('nan')
+
+def parse_epoch(ts):
+    """Parse an ISO timestamp to epoch seconds, or NaN if missing/invalid."""
+    if not ts:
+        return NAN
+    try:
+        return datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
+    except (ValueError, AttributeError):
+        return NAN
+
+def format_epoch(epoch):
+    """Format epoch seconds the way Granola writes timestamps (UTC, ms, 'Z')."""
+    if epoch is None or math.isnan(epoch):
+        return ''
+    dt = datetime.fromtimestamp(epoch, timezone.utc)
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.') + f"{dt.microsecond // 1000:03d}Z"
+
+class SegmentTable:
+    """Column-oriented transcript segments for a single Granola document."""
+
+    __slots__ = ('starts', 'ends', 'sources', 'offsets', 'buffer')
+
+    def __init__(self, segments=()):
+        self.starts = array('d')
+        self.ends = array('d')
+        self.sources = array('B')
+        self.offsets = array('I', [0])
+        parts = []
+        position = 0
+
+        for seg in segments:
+            if not isinstance(seg, dict):
+                continue
+            text = (seg.get('text') or '').strip()
+            self.starts.append(parse_epoch(seg.get('start_timestamp', '')))
+            self.ends.append(parse_epoch(seg.get('end_timestamp', '')))
+            self.sources.append(_SOURCE_CODES.get(seg.get('source', 'unknown'), SOURCE_UNKNOWN))
+            parts.append(text)
+            position += len(text)
+            self.offsets.append(position)
+
+        self.buffer = ''.join(parts)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __bool__(self):
+        return len(self.starts) > 0
+
+    def text(self, i):
+        """Text of segment i (already stripped)."""
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]]
+
+    def source(self, i):
+        """Source name of segment i ('microphone', 'system' or 'unknown')."""
+        return SOURCES[self.sources[i]]
+
+    def start_column(self):
+        """Start times as an ndarray view (NumPy) or the raw array."""
+        return _numpy().frombuffer(self.starts, dtype='float64') if NUMPY_AVAILABLE else self.starts
+
+    def end_column(self):
+        """End times as an ndarray view (NumPy) or the raw array."""
+        return _numpy().frombuffer(self.ends, dtype='float64') if NUMPY_AVAILABLE else self.ends
+
+    @property
+    def first_start(self):
+        """Start of the first segment, in epoch seconds (NaN if unknown)."""
+        return self.starts[0] if self.starts else NAN
+
+    @property
+    def last_end(self):
+        """Latest segment end, in epoch seconds (NaN if unknown)."""
+        if not self.ends:
+            return NAN
+        if NUMPY_AVAILABLE:
+            np = _numpy()
+            ends = self.end_column()
+            return float(np.nanmax(ends)) if not np.isnan(ends).all() else NAN
+        valid = [e for e in self.ends if not math.isnan(e)]
+        return max(valid) if valid else NAN
+
+    def nbytes(self):
+        """Approximate memory held by the table's columns and text buffer."""
+        return (
+            self.starts.itemsize * len(self.starts)
+            + self.ends.itemsize * len(self.ends)
+            + self.sources.itemsize * len(self.sources)
+            + self.offsets.itemsize * len(self.offsets)
+            + len(self.buffer.encode('utf-8'))
+        )
+
+def as_segment_table(segments):
+    """Return segments as a SegmentTable, converting a raw Granola list if needed."""
+    if isinstance(segments, SegmentTable):
+        return segments
+    return SegmentTable(segments or ())
+
+def build_segment_tables(transcripts, consume=False):
+    """
+    Build a SegmentTable for every document in Granola's transcripts map.
+
+    With consume, each raw segment list is removed from transcripts as soon
+    as its table is built, keeping peak memory near one copy of the data.
+    """
+    tables = {}
+    for doc_id in list(transcripts):
+        segments = transcripts.pop(doc_id) if consume else transcripts[doc_id]
+        if isinstance(segments, list):
+            tables[doc_id] = SegmentTable(segments)
+    return tables
+
+def ended_after(end_times, cutoff):
+    """
+    Return the keys of end_times (doc ID -> epoch end) ending at or after cutoff.
+
+    Uses one vectorized comparison over all documents when NumPy is available.
+    """
+    doc_ids = list(end_times)
+    if not doc_ids:
+        return []
+    if NUMPY_AVAILABLE:
+        np = _numpy()
+        mask = np.fromiter(end_times.values(), dtype=np.float64, count=len(doc_ids)) >= cutoff
+        return [d for d, keep in zip(doc_ids, mask) if keep]
+    return [d for d, end in end_times.items() if end >= cutoff]
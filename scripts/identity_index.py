@@ -0,0 +1,350 @@
+"""
+Attendee identity resolution for Work Memory.
+
+The same person reaches us from four places: Google Calendar attendees on a
+document or in the state['events'] calendar, Granola's per-document
+people.attendees, and the top-level state['people'] list. Names differ
+between them ("Sarah Chen" vs "Sarah M. Chen" vs nothing at all), so
+deriving profile slugs from names splits one person across several folders.
+
+IdentityIndex keeps a union-find over email and name keys. Emails that appear
+on the same person record are merged; a name is linked to a person only
+while it is unambiguous. Every person gets a canonical ID - the slug of their
+profile folder - which stays stable once assigned and is what callers use
+for paths. Lookups are dict hits plus path-compressed finds.
+
+The index is persisted under MEMORY_ROOT/config/index/identities.json and
+rebuilt only when the Granola cache snapshot changes.
+"""
+
+import json
+import os
+import re
+
+from memory_config import slugify
+
+INDEX_DIR = os.path.join('config', 'index')
+INDEX_FILE = 'identities.json'
+INDEX_VERSION = 1
+
+def normalize_email(email):
+    """Lowercase and trim an email; returns '' for anything that isn't one."""
+    email = (email or '').strip().lower()
+    if '@' not in email or len(email) < 5:
+        return ''
+    return email
+
+def normalize_name(name):
+    """Lowercase and collapse whitespace in a display name."""
+    return ' '.join((name or '').lower().split())
+
+def name_from_email(email):
+    """Best-effort display name from an email's local part."""
+    return email.split('@')[0].replace('.', ' ').title()
+
+class IdentityIndex:
+    """Union-find over email/name keys with stable canonical person IDs."""
+
+    def __init__(self):
+        self.parent = {}       # key -> parent key ('email:...' / 'name:...')
+        self.person_ids = {}   # root key -> canonical person ID (slug)
+        self.names = {}        # root key -> best display name
+        self.ambiguous = set() # name keys seen on more than one person
+        self.with_email = set()  # roots whose group contains an email
+        self.taken_ids = set()
+        self.snapshot = None
+
+    # -- union-find -------------------------------------------------------
+
+    def _find(self, key):
+        parent = self.parent
+        root = key
+        while parent[root] != root:
+            root = parent[root]
+        while parent[key] != root:
+            parent[key], key = root, parent[key]
+        return root
+
+    def _add(self, key):
+        if key not in self.parent:
+            self.parent[key] = key
+        return self._find(key)
+
+    def _union(self, a, b):
+        ra, rb = self._find(a), self._find(b)
+        if ra == rb:
+            return ra
+        # Keep the root that already owns a canonical ID (the older person)
+        if ra not in self.person_ids and rb in self.person_ids:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        if rb in self.with_email:
+            self.with_email.discard(rb)
+            self.with_email.add(ra)
+        if rb in self.person_ids:
+            # Both had IDs: the absorbed one stays reserved so paths don't collide
+            self.person_ids.pop(rb)
+        if not self.names.get(ra) and self.names.get(rb):
+            self.names[ra] = self.names[rb]
+        self.names.pop(rb, None)
+        return ra
+
+    # -- building ---------------------------------------------------------
+
+    def add_person(self, emails=(), name='', person_id=None):
+        """
+        Record one observation of a person and return their canonical ID.
+
+        All emails given together are treated as aliases of one person. The
+        name links to the person unless it already belongs to someone else.
+        person_id pins the canonical ID (used when seeding from existing
+        profile folders).
+        """
+        email_keys = ['email:' + e for e in (normalize_email(x) for x in emails) if e]
+        name_key = 'name:' + normalize_name(name) if normalize_name(name) else None
+
+        if not email_keys and not name_key:
+            return None
+
+        if email_keys:
+            root = self._add(email_keys[0])
+            self.with_email.add(root)
+            for key in email_keys[1:]:
+                self._add(key)
+                self.with_email.add(self._find(key))
+                root = self._union(root, key)
+            if name_key and name_key not in self.ambiguous:
+                if name_key not in self.parent:
+                    self._add(name_key)
+                    root = self._union(root, name_key)
+                else:
+                    name_root = self._find(name_key)
+                    if name_root not in self.with_email:
+                        # Previously seen by name only: now we know their email
+                        root = self._union(root, name_root)
+                    elif name_root != root:
+                        # Same name, different email: stop resolving by name alone
+                        self.ambiguous.add(name_key)
+        else:
+            if name_key in self.ambiguous:
+                return None
+            root = self._add(name_key)
+
+        if name and (not self.names.get(root) or len(name) > len(self.names[root])):
+            self.names[root] = name.strip()
+
+        if person_id:
+            if root in self.person_ids and self.person_ids[root] != person_id:
+                self.taken_ids.add(person_id)
+            else:
+                self.person_ids[root] = person_id
+                self.taken_ids.add(person_id)
+
+        return self._person_id(root, email_keys)
+
+    def _person_id(self, root, email_keys=()):
+        if root not in self.person_ids:
+            name = self.names.get(root) or (
+                name_from_email(email_keys[0][len('email:'):]) if email_keys else ''
+            )
+            base = slugify(name) or 'unknown'
+            candidate, n = base, 2
+            while candidate in self.taken_ids:
+                candidate = f"{base}-{n}"
+                n += 1
+            self.person_ids[root] = candidate
+            self.taken_ids.add(candidate)
+        return self.person_ids[root]
+
+    # -- lookups ----------------------------------------------------------
+
+    def resolve(self, email='', name=''):
+        """Return the canonical person ID for an email and/or name, or None."""
+        email = normalize_email(email)
+        if email and 'email:' + email in self.parent:
+            return self.person_ids.get(self._find('email:' + email))
+        name_key = 'name:' + normalize_name(name)
+        if name and name_key in self.parent and name_key not in self.ambiguous:
+            return self.person_ids.get(self._find(name_key))
+        return None
+
+    def display_name(self, email='', name=''):
+        """Best known display name for a person, or '' if unknown."""
+        email = normalize_email(email)
+        key = 'email:' + email if email else 'name:' + normalize_name(name)
+        if key not in self.parent:
+            return ''
+        return self.names.get(self._find(key), '')
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    # -- persistence ------------------------------------------------------
+
+    def to_dict(self):
+        groups = {}
+        for key in self.parent:
+            groups.setdefault(self._find(key), []).append(key)
+        people = []
+        for root, keys in groups.items():
+            people.append({
+                'id': self.person_ids.get(root),
+                'name': self.names.get(root, ''),
+                'emails': sorted(k[len('email:'):] for k in keys if k.startswith('email:')),
+                'names': sorted(k[len('name:'):] for k in keys if k.startswith('name:')),
+            })
+        return {
+            'version': INDEX_VERSION,
+            'snapshot': self.snapshot,
+            'reserved_ids': sorted(self.taken_ids),
+            'ambiguous_names': sorted(k[len('name:'):] for k in self.ambiguous),
+            'people': people,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls()
+        index.snapshot = data.get('snapshot')
+        index.taken_ids = set(data.get('reserved_ids', []))
+        index.ambiguous = {'name:' + n for n in data.get('ambiguous_names', [])}
+        for person in data.get('people', []):
+            keys = ['email:' + e for e in person.get('emails', [])]
+            keys += ['name:' + n for n in person.get('names', [])]
+            if not keys:
+                continue
+            root = index._add(keys[0])
+            for key in keys[1:]:
+                index._add(key)
+                index.parent[index._find(key)] = root
+            if person.get('emails'):
+                index.with_email.add(root)
+            if person.get('id'):
+                index.person_ids[root] = person['id']
+                index.taken_ids.add(person['id'])
+            if person.get('name'):
+                index.names[root] = person['name']
+        return index
+
+def index_path(memory_root):
+    return os.path.join(memory_root, INDEX_DIR, INDEX_FILE)
+
+def load_index(memory_root):
+    """Load the persisted index, or None if missing/unreadable."""
+    path = index_path(memory_root)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != INDEX_VERSION:
+        return None
+    return IdentityIndex.from_dict(data)
+
+def save_index(index, memory_root):
+    """Write the index atomically."""
+    path = index_path(memory_root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(index.to_dict(), f)
+    os.replace(tmp, path)
+
+def seed_from_profiles(index, memory_root):
+    """Pin canonical IDs to existing profile folders (people/<type>/<slug>)."""
+    people_dir = os.path.join(memory_root, 'people')
+    if not os.path.isdir(people_dir):
+        return
+    for person_type in ('internal', 'external'):
+        type_dir = os.path.join(people_dir, person_type)
+        if not os.path.isdir(type_dir):
+            continue
+        for slug in sorted(os.listdir(type_dir)):
+            profile_path = os.path.join(type_dir, slug, 'profile.md')
+            if not os.path.exists(profile_path):
+                continue
+            with open(profile_path, 'r') as f:
+                content = f.read(2048)
+            email = re.search(r'^email:\s*(\S+)', content, re.MULTILINE)
+            name = re.search(r'^name:\s*(.+)', content, re.MULTILINE)
+            index.add_person(
+                [email.group(1)] if email else [],
+                name.group(1).strip() if name else '',
+                person_id=slug,
+            )
+
+def _granola_person(person):
+    """Extract (emails, name) from a Granola people entry or attendee."""
+    if not isinstance(person, dict):
+        return [], ''
+    emails = [person.get('email', '')]
+    emails += [e for e in person.get('emails', []) or [] if isinstance(e, str)]
+    details = (person.get('details') or {}).get('person') or {}
+    name = (
+        person.get('name') if isinstance(person.get('name'), str) else ''
+    ) or person.get('displayName', '') or (details.get('name') or {}).get('fullName', '')
+    return [e for e in emails if e], name or ''
+
+def add_event_attendees(index, event):
+    """Add a calendar event's attendees (other than the user) to the index."""
+    for att in event.get('attendees', []) or []:
+        if isinstance(att, dict) and att.get('email') and not att.get('self'):
+            index.add_person([att['email']], att.get('displayName', ''))
+
+def add_snapshot(index, data):
+    """Add every person seen in a loaded Granola snapshot to the index."""
+    for person in data.get('people', []) or []:
+        emails, name = _granola_person(person)
+        index.add_person(emails, name)
+
+    for event in data.get('events', []) or []:
+        if isinstance(event, dict):
+            add_event_attendees(index, event)
+
+    for doc in (data.get('documents') or {}).values():
+        if not isinstance(doc, dict):
+            continue
+        add_event_attendees(index, doc.get('google_calendar_event') or {})
+        people = doc.get('people') or {}
+        if isinstance(people, dict):
+            for att in people.get('attendees', []) or []:
+                emails, name = _granola_person(att)
+                if emails:
+                    index.add_person(emails, name)
+
+def snapshot_key(cache_path):
+    """The cache file's identity (mtime and size), or None if it's missing."""
+    try:
+        st = os.stat(cache_path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+def build_identity_index(data, memory_root=None, cache_path=None, snapshot=None):
+    """
+    Return the identity index for a loaded Granola snapshot.
+
+    With a memory_root, the persisted index is reused when it was built from
+    the same cache snapshot; otherwise it is extended with the snapshot's
+    people and saved. Without one, an in-memory index is built. snapshot is
+    the cache's key (snapshot_key()) when data was read, if the caller took
+    it; by default the cache file's current key is used.
+    """
+    snapshot = snapshot or (snapshot_key(cache_path) if cache_path else None)
+    index = load_index(memory_root) if memory_root else None
+
+    if index is not None and snapshot and index.snapshot == snapshot:
+        return index
+
+    if index is None:
+        index = IdentityIndex()
+        if memory_root:
+            seed_from_profiles(index, memory_root)
+
+    add_snapshot(index, data)
+    index.snapshot = snapshot
+
+    if memory_root:
+        save_index(index, memory_root)
+    return index
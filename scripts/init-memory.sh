@@ -482,6 +482,20 @@ Your actual memory files are at:
 Built with ❤️  for Guilders by Tony Kipkemboi
 EOF
 
+# Seed people profiles and interaction histories from Granola, if installed
+GRANOLA_CACHE="$HOME/Library/Application Support/Granola/cache-v3.json"
+SEED_SCRIPT="$SKILL_DIR/scripts/seed-memory.py"
+SEED_OUTPUT=""
+if [ -f "$GRANOLA_CACHE" ] && [ -f "$SEED_SCRIPT" ] && command -v python3 &> /dev/null; then
+    if [ "$QUIET_MODE" = false ]; then
+        echo -e "${YELLOW}Seeding profiles from your Granola history...${NC}"
+        echo ""
+    fi
+    SEED_OUTPUT=$(python3 "$SEED_SCRIPT" --memory-root "$FULL_PATH" --quiet 2>/dev/null) || SEED_OUTPUT=""
+fi
+SEEDED_PROFILES=$(echo "$SEED_OUTPUT" | grep '^SEEDED_PROFILES=' | cut -d= -f2)
+SEEDED_MEETINGS=$(echo "$SEED_OUTPUT" | grep '^SEEDED_MEETINGS=' | cut -d= -f2)
+
 # Success!
 if [ "$QUIET_MODE" = true ]; then
     # Minimal output for Claude
@@ -489,6 +503,9 @@ if [ "$QUIET_MODE" = true ]; then
     echo "MEMORY_ROOT=$FULL_PATH"
     echo "ORG=Guild"
     echo "TIMEZONE=$TIMEZONE"
+    if [ -n "$SEED_OUTPUT" ]; then
+        echo "$SEED_OUTPUT"
+    fi
 else
     # Verbose output for interactive mode
     echo ""
@@ -519,6 +536,12 @@ else
     echo "   ✓ logs/                Activity logs and history"
     echo "   ✓ config/              System configuration and templates"
     echo ""
+    if [ -n "$SEEDED_PROFILES" ]; then
+        echo -e "${GREEN}👥 PEOPLE SEEDED FROM GRANOLA${NC}"
+        echo ""
+        echo "   $SEEDED_PROFILES profiles, with interaction history from $SEEDED_MEETINGS meetings"
+        echo ""
+    fi
     echo -e "${CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
     echo ""
     echo -e "${GREEN}🚀 WHAT YOU CAN DO NOW${NC}"
@@ -4,14 +4,37 @@ Log Granola meetings to Work Memory
 
 This script:
 1. Processes Granola meetings (handling splits)
-2. Creates/updates meeting logs in WorkMemory/meetings/
+2. Creates/updates meeting logs in WorkMemory/meetings/, tagged with
+   keyphrase topics from the transcript and Granola notes, and linked to
+   the projects and teams the title and transcript mention
 3. Links meetings to people profiles in WorkMemory/people/
-4. Updates interaction logs for attendees
+4. Updates interaction logs for attendees, and the activity logs of
+   linked projects and teams
+5. Updates the catalog (config/catalog.db) and the related-meetings
+   index (config/index/related/) for the files it wrote
+
+Several runs (both daemons' sync workers, manual runs) can write at once:
+files are created exclusively, and log entries are appended under a file
+lock only if their idempotency key isn't there yet (memory_locks.py). In
+months compacted into .archive/, meetings and entries the archive already
+has are not written again.
 
 Usage:
     python3 log-meeting-to-memory.py --date 2026-01-29
     python3 log-meeting-to-memory.py --recent 5  # Meetings ended in last 5 mins
     python3 log-meeting-to-memory.py --doc-id <granola-doc-id>
+    python3 log-meeting-to-memory.py --doc-id <id> --memory-root <root> --user-email <email>
+    python3 log-meeting-to-memory.py --meeting-json - --memory-root <root> < meeting.json
+    python3 log-meeting-to-memory.py --date 2026-01-29 --memory-budget 256 --memory-report
+
+With a memory budget (--memory-budget, or memory_budget_mb in the config)
+the cache is loaded lean, and if assembling the selected meetings at once
+would cross it they are assembled, written and released one at a time.
+
+--meeting-json reads one meeting record (granola_meetings.build_meeting,
+attendees already resolved for this root) instead of loading the cache:
+the watcher parses each cache snapshot once and hands every root's sync
+jobs the meetings it assembled (see watch-granola.py).
 
 Environment:
     MEMORY_ROOT: Path to WorkMemory (default: ~/Documents/WorkMemory)
@@ -20,42 +43,29 @@ Environment:
 import json
 import os
 import sys
-import re
 from datetime import datetime
-from pathlib import Path
 import argparse
 
-# Import the meeting processor
 sys.path.insert(0, os.path.dirname(__file__))
-from importlib.util import spec_from_loader, module_from_spec
-from importlib.machinery import SourceFileLoader
-
-# Load the processor module
-processor_path = os.path.join(os.path.dirname(__file__), 'process-granola-meetings.py')
-spec = spec_from_loader("processor", SourceFileLoader("processor", processor_path))
-processor = module_from_spec(spec)
-spec.loader.exec_module(processor)
-
-# Get memory root from config or default
-def get_memory_root():
-    config_file = os.path.expanduser("~/.claude/skills/memory-management/memory-management.local.md")
-    if os.path.exists(config_file):
-        with open(config_file, 'r') as f:
-            content = f.read()
-            match = re.search(r'memory_root:\s*(.+)', content)
-            if match:
-                return match.group(1).strip()
-    return os.path.expanduser("~/Documents/WorkMemory")
-
-MEMORY_ROOT = get_memory_root()
-
-def slugify(text):
-    """Convert text to filename-safe slug."""
-    text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[\s_]+', '-', text)
-    text = re.sub(r'-+', '-', text)
-    return text.strip('-')[:50]
+import granola_meetings
+from identity_index import build_identity_index
+from memory_archive import archived_meeting
+from memory_budget import MemoryBudget
+from memory_config import (
+    GRANOLA_CACHE, get_memory_budget_mb, get_memory_root, get_org_name, get_user_domain, get_user_email,
+)
+from memory_locks import append_once
+from memory_templates import (
+    entry_key, meeting_date, meeting_rel_path, person_folder, render_activity_entry, render_interaction_entry,
+    render_log_entry, render_meeting, render_profile,
+)
+
+# The catalog, related-meetings index, topic tagger and project linker
+# (SQLite, NumPy) are imported where they're used: most daemon-spawned
+# runs find the meeting already logged and never need them.
+
+# Project/team matcher, compiled once per run and memory root
+_linkers = {}
 
 def extract_attendees_from_transcript(transcript_text, known_attendees):
     """
@@ -65,327 +75,296 @@ def extract_attendees_from_transcript(transcript_text, known_attendees):
     # This is a placeholder - could be enhanced with NLP
     return known_attendees
 
+def meeting_file_path(meeting, memory_root):
+    """Where a meeting's file lives: meetings/YYYY-MM/YYYY-MM-DD-<title slug>.md."""
+    date_str = meeting_date(meeting, datetime.now().strftime('%Y-%m-%d'))
+    return os.path.join(memory_root, *meeting_rel_path(meeting, date_str).split('/'))
+
 def create_meeting_file(meeting, memory_root):
     """Create a meeting markdown file in WorkMemory."""
-    date_str = meeting.get('start_time', '')[:10] or datetime.now().strftime('%Y-%m-%d')
-    month_dir = os.path.join(memory_root, 'meetings', date_str[:7])
-    os.makedirs(month_dir, exist_ok=True)
-
-    title = meeting.get('title', 'Untitled Meeting')
-    slug = slugify(title)
-    filename = f"{date_str}-{slug}.md"
-    filepath = os.path.join(month_dir, filename)
+    date_str = meeting_date(meeting, datetime.now().strftime('%Y-%m-%d'))
+    filepath = meeting_file_path(meeting, memory_root)
+    archived = archived_meeting(memory_root, meeting_rel_path(meeting, date_str), meeting.get('doc_id'))
+    if archived:
+        print(f"  Meeting already archived: {archived}")
+        return filepath, False
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-    # Check if file already exists
-    if os.path.exists(filepath):
+    # Exclusive create: of two runs racing on one meeting, only one writes it
+    try:
+        with open(filepath, 'x') as f:
+            f.write(render_meeting(meeting, date_str))
+    except FileExistsError:
         print(f"  Meeting file already exists: {filepath}")
         return filepath, False
 
-    # Build attendee list for frontmatter
-    attendees_yaml = []
-    for att in meeting.get('attendees', []):
-        if isinstance(att, dict) and att.get('email'):
-            attendees_yaml.append(f"  - email: {att['email']}")
-            if att.get('name'):
-                attendees_yaml.append(f"    name: {att['name']}")
-
-    # Build frontmatter
-    frontmatter = f"""---
-title: {title}
-date: {date_str}
-duration_minutes: {meeting.get('duration_minutes', 0)}
-source: granola
-granola_doc_id: {meeting.get('doc_id', '')}
-was_split: {meeting.get('was_split', False)}
-attendees:
-{chr(10).join(attendees_yaml) if attendees_yaml else '  - unknown'}
-topics: []
-outcome: pending_review
----
-"""
-
-    # Build content
-    content = f"""{frontmatter}
-# {title}
-
-## Summary
-
-*[Auto-captured from Granola - needs review]*
-
-## Key Points
-
--
-
-## Action Items
-
-- [ ] Review and update this meeting summary
-
-## Notes
-
-Meeting duration: {meeting.get('duration_minutes', 0)} minutes
-Transcript segments: {meeting.get('segments', 0)}
-{'**Note:** This meeting was split across multiple Granola documents and merged.' if meeting.get('was_split') else ''}
-
-## Transcript Preview
-
-```
-{meeting.get('transcript_text', '')[:2000]}
-{'...[truncated]' if len(meeting.get('transcript_text', '')) > 2000 else ''}
-```
-"""
-
-    with open(filepath, 'w') as f:
-        f.write(content)
-
     print(f"  Created: {filepath}")
     return filepath, True
 
-def update_person_interactions(meeting, memory_root, user_email='tony.kipkemboi@guild.com', user_domain='guild.com'):
+def update_person_interactions(meeting, memory_root, user_email=None, user_domain=None, org_name=None):
     """
     Update interaction logs for ALL meeting attendees.
     Creates person profiles if they don't exist.
 
     Distinguishes between:
-    - internal/ : Guild colleagues (@guild.com)
+    - internal/ : Colleagues at org_name (@user_domain)
     - external/ : External contacts (other domains)
+
+    user_email/user_domain/org_name default to the skill config's (see memory_config.py).
+    Returns the profile and interaction log paths it wrote.
     """
-    date_str = meeting.get('start_time', '')[:10] or datetime.now().strftime('%Y-%m-%d')
+    user_email = user_email or get_user_email()
+    user_domain = user_domain or get_user_domain()
+    org_name = org_name or get_org_name()
+    date_str = meeting_date(meeting, datetime.now().strftime('%Y-%m-%d'))
     month = date_str[:7]
-    title = meeting.get('title', 'Untitled Meeting')
+    written = []
 
     for att in meeting.get('attendees', []):
-        if not isinstance(att, dict):
-            continue
-
-        email = att.get('email', '')
-        if not email:
+        person = person_folder(att, user_email, user_domain, org_name)
+        if person is None:
             continue
 
-        # Skip empty or invalid emails
-        if '@' not in email or len(email) < 5:
-            continue
-
-        # Skip self (the user running this)
-        if email.lower() == user_email.lower():
-            continue
-
-        # Determine if internal or external
-        is_internal = f'@{user_domain}' in email.lower()
-        person_type = 'internal' if is_internal else 'external'
-
-        # Create person slug from email or name
-        name = att.get('name', '') or email.split('@')[0].replace('.', ' ').title()
-        slug = slugify(name)
-
         # Use subdirectory based on type
-        person_dir = os.path.join(memory_root, 'people', person_type, slug)
+        person_dir = os.path.join(memory_root, 'people', person['type'], person['slug'])
         interactions_dir = os.path.join(person_dir, 'interactions')
         os.makedirs(interactions_dir, exist_ok=True)
 
-        # Determine company/team
-        if is_internal:
-            company = 'Guild'
-            # Could extract team from email pattern or other source later
-            team = ''
-        else:
-            domain = email.split('@')[1] if '@' in email else ''
-            company = domain.split('.')[0].title() if domain else 'Unknown'
-            team = ''
-
         # Create or update profile if doesn't exist
         profile_path = os.path.join(person_dir, 'profile.md')
         if not os.path.exists(profile_path):
-            if is_internal:
-                profile_content = f"""---
-name: {name}
-canonical_name: {slug}
-email: {email}
-type: internal
-company: Guild
-team:
-role:
-first_interaction: {date_str}
-last_interaction: {date_str}
-interaction_count: 1
----
-
-# {name}
-
-## Role at Guild
-
-- Email: {email}
-- Team: *[To be filled in]*
-- Role: *[To be filled in]*
-
-## Working Relationship
-
-*[Notes about how you work together, communication preferences, etc.]*
-
-## Notes
-
-*Profile auto-created from meeting attendance on {date_str}*
-"""
-            else:
-                profile_content = f"""---
-name: {name}
-canonical_name: {slug}
-email: {email}
-type: external
-company: {company}
-role:
-first_interaction: {date_str}
-last_interaction: {date_str}
-interaction_count: 1
----
-
-# {name}
-
-## Background
-
-- Company: {company}
-- Email: {email}
-- Role: *[To be filled in]*
-
-## Relationship
-
-*[How did you meet? What's the context of your interactions?]*
-
-## Notes
-
-*Profile auto-created from meeting attendance on {date_str}*
-"""
-            with open(profile_path, 'w') as f:
-                f.write(profile_content)
-            print(f"  Created {person_type} profile: {slug}")
-
-        # Add to monthly interaction log
+            try:
+                with open(profile_path, 'x') as f:
+                    f.write(render_profile(person, date_str))
+                written.append(profile_path)
+                print(f"  Created {person['type']} profile: {person['slug']}")
+            except FileExistsError:
+                pass
+
+        # Append to monthly interaction log (once per meeting and person)
         interaction_file = os.path.join(interactions_dir, f"{month}.md")
-        interaction_entry = f"""
-## {date_str} - {title}
-
-**Type:** Meeting
-**Duration:** {meeting.get('duration_minutes', 0)} minutes
-
-*[See meeting log for details]*
-
----
-"""
-
-        # Append to interaction log
-        mode = 'a' if os.path.exists(interaction_file) else 'w'
-        with open(interaction_file, mode) as f:
-            if mode == 'w':
-                f.write(f"# Interactions - {month}\n\n")
-            f.write(interaction_entry)
+        if append_once(memory_root, interaction_file, f"# Interactions - {month}\n\n",
+                       render_interaction_entry(meeting, date_str, person['slug']),
+                       entry_key(meeting, date_str, person['slug'])):
+            written.append(interaction_file)
+            print(f"  Updated interactions for: {person['name']}")
+        else:
+            print(f"  Already in interactions for: {person['name']}")
 
-        print(f"  Updated interactions for: {name}")
+    return written
 
 def log_to_daily_log(meeting, memory_root):
     """Add meeting to daily activity log."""
-    date_str = meeting.get('start_time', '')[:10] or datetime.now().strftime('%Y-%m-%d')
+    date_str = meeting_date(meeting, datetime.now().strftime('%Y-%m-%d'))
     month = date_str[:7]
 
     logs_dir = os.path.join(memory_root, 'logs')
     os.makedirs(logs_dir, exist_ok=True)
 
     log_file = os.path.join(logs_dir, f"{month}.md")
-    title = meeting.get('title', 'Untitled Meeting')
-
-    entry = f"""
-### {date_str} - Meeting: {title}
-
-- Duration: {meeting.get('duration_minutes', 0)} minutes
-- Attendees: {len(meeting.get('attendees', []))}
-- Source: Granola
-{'- Note: Meeting was split and auto-merged' if meeting.get('was_split') else ''}
-
----
-"""
-
-    mode = 'a' if os.path.exists(log_file) else 'w'
-    with open(log_file, mode) as f:
-        if mode == 'w':
-            f.write(f"# Activity Log - {month}\n\n")
-        f.write(entry)
-
-def process_meeting(meeting, memory_root):
+    append_once(memory_root, log_file, f"# Activity Log - {month}\n\n",
+                render_log_entry(meeting, date_str), entry_key(meeting, date_str))
+
+def link_projects(meeting, memory_root):
+    """Set the projects and teams the meeting's title and transcript mention."""
+    from project_linker import link_meetings, load_linker
+    if memory_root not in _linkers:
+        _linkers[memory_root] = load_linker(memory_root)
+    link_meetings([meeting], memory_root, _linkers[memory_root])
+
+def log_to_project_activity(meeting, memory_root):
+    """Add the meeting to each linked project and team's monthly activity log. Returns the paths written."""
+    from project_linker import activity_path, linked_dirs
+    date_str = meeting_date(meeting, datetime.now().strftime('%Y-%m-%d'))
+    month = date_str[:7]
+    written = []
+    for edir in linked_dirs(meeting):
+        path = os.path.join(memory_root, *activity_path(edir, month).split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if append_once(memory_root, path, f"# Activity - {month}\n\n",
+                       render_activity_entry(meeting, date_str), entry_key(meeting, date_str)):
+            written.append(path)
+            print(f"  Linked to: {edir}")
+    return written
+
+def update_catalog(memory_root, paths):
+    """Re-index the files this meeting touched (the catalog resyncs anything missed)."""
+    import sqlite3
+    from memory_catalog import Catalog
+    try:
+        catalog = Catalog(memory_root)
+        try:
+            catalog.index_files(paths)
+        finally:
+            catalog.close()
+    except sqlite3.Error as e:
+        print(f"  Warning: could not update catalog: {e}")
+
+def update_related_index(memory_root, paths):
+    """Extend the TF-IDF index with the new meeting and the interaction logs it touched."""
+    import related_index
+    try:
+        related_index.update_index(memory_root, paths)
+    except (OSError, ValueError) as e:
+        print(f"  Warning: could not update related-meetings index: {e}")
+
+def tag_topics(meetings, memory_root):
+    """Pick topics for the whole batch at once (against the related-meetings index's term statistics)."""
+    if not meetings:
+        return
+    from topic_tagger import tag_meetings
+    try:
+        tag_meetings(meetings, memory_root)
+    except (OSError, ValueError) as e:
+        print(f"  Warning: could not tag topics: {e}")
+
+def update_briefing(memory_root, paths):
+    """Refresh the attendees' sections of today's (and tomorrow's) briefing digest, if built."""
+    import sqlite3
+    from briefing import refresh_briefing
+    try:
+        refresh_briefing(memory_root, paths)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"  Warning: could not refresh briefing: {e}")
+
+def process_meeting(meeting, memory_root, user_email=None, user_domain=None, org_name=None):
     """Process a single meeting and log to memory."""
     title = meeting.get('title', 'Untitled')
     print(f"\nProcessing: {title}")
 
     if not meeting.get('has_transcript', True) or not meeting.get('transcript_text'):
-        print(f"  Skipping - no transcript available")
+        print("  Skipping - no transcript available")
         return False
 
+    # Projects and teams go into the frontmatter, so link before rendering
+    if is_new(meeting, memory_root):
+        link_projects(meeting, memory_root)
+
     # Create meeting file
     filepath, created = create_meeting_file(meeting, memory_root)
 
     if created:
         # Update person interactions
-        update_person_interactions(meeting, memory_root)
+        written = update_person_interactions(meeting, memory_root, user_email, user_domain, org_name)
 
-        # Add to daily log
+        # Add to daily log and the linked projects' and teams' activity logs
         log_to_daily_log(meeting, memory_root)
+        linked = log_to_project_activity(meeting, memory_root)
+
+        update_catalog(memory_root, [filepath] + written + linked)
+        update_related_index(memory_root, [filepath] + written)
+        update_briefing(memory_root, [filepath] + written)
 
         return True
 
     return False
 
+def print_dry_run(meeting):
+    print(f"\n  Would process: {meeting.get('title', 'Untitled')}")
+    print(f"    Duration: {meeting.get('duration_minutes', 0)} min")
+    print(f"    Has transcript: {meeting.get('has_transcript', bool(meeting.get('transcript_text')))}")
+    if meeting.get('topics'):
+        print(f"    Topics: {', '.join(meeting['topics'])}")
+
+def is_new(meeting, memory_root):
+    """Whether a meeting is about to be written (and so needs topics)."""
+    if not meeting.get('transcript_text') or os.path.exists(meeting_file_path(meeting, memory_root)):
+        return False
+    date_str = meeting_date(meeting, datetime.now().strftime('%Y-%m-%d'))
+    return not archived_meeting(memory_root, meeting_rel_path(meeting, date_str), meeting.get('doc_id'))
+
+def read_meeting_json(path):
+    """One meeting record from a JSON file, or stdin for '-'."""
+    if path == '-':
+        return json.load(sys.stdin)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def select_meetings(args, documents, transcripts, splits, identities):
+    """The doc IDs and (lazily assembled) meetings the command line asks for."""
+    if args.doc_id:
+        # Process specific document (a continuation resolves to its main meeting)
+        meeting = granola_meetings.get_meeting(documents, transcripts, args.doc_id, identities)
+        if meeting is None:
+            print(f"ERROR: Document {args.doc_id} not found")
+            sys.exit(1)
+        return [meeting['doc_id']], iter([meeting])
+    if args.recent:
+        doc_ids = granola_meetings.recent_meeting_ids(documents, transcripts, splits, args.recent)
+        return doc_ids, granola_meetings.iter_recent_meetings(documents, transcripts, doc_ids, splits)
+    # Default to today
+    target_date = args.date or datetime.now().strftime('%Y-%m-%d')
+    doc_ids = granola_meetings.date_meeting_ids(documents, splits, target_date)
+    return doc_ids, granola_meetings.iter_meetings(documents, transcripts, doc_ids, splits, identities)
+
 def main():
     parser = argparse.ArgumentParser(description='Log Granola meetings to Work Memory')
     parser.add_argument('--date', help='Date to process (YYYY-MM-DD)')
     parser.add_argument('--recent', type=int, help='Process meetings ended in last N minutes')
     parser.add_argument('--doc-id', help='Process specific Granola document')
+    parser.add_argument('--meeting-json', metavar='PATH',
+                        help="Process an already-assembled meeting record ('-' for stdin) without reading the cache")
     parser.add_argument('--dry-run', action='store_true', help='Show what would be done')
+    parser.add_argument('--memory-root', help='Override memory root from config')
+    parser.add_argument('--user-email', help='Memory owner (default: user_email from config)')
+    parser.add_argument('--user-domain', help='Internal email domain (default: user_domain from config)')
+    parser.add_argument('--org-name', help='Company of internal colleagues (default: org_name from config)')
+    parser.add_argument('--memory-budget', type=int, metavar='MB',
+                        help='Memory ceiling (default: memory_budget_mb from config, none if unset)')
+    parser.add_argument('--memory-report', action='store_true',
+                        help='Print peak memory at the end (traces the Python heap, which slows the run)')
 
     args = parser.parse_args()
 
-    print(f"Memory Root: {MEMORY_ROOT}")
-    print(f"Loading Granola data...")
-
-    data = processor.load_granola_data()
-    documents = data['documents']
-    transcripts = data['transcripts']
-
-    if args.doc_id:
-        # Process specific document
-        if args.doc_id not in documents:
-            print(f"ERROR: Document {args.doc_id} not found")
-            sys.exit(1)
-
-        # Build meeting object manually
-        doc = documents[args.doc_id]
-        trans = transcripts.get(args.doc_id, [])
-        # ... (similar to get_meetings_for_date logic)
-        print(f"Single document processing not fully implemented yet")
-        sys.exit(1)
-
-    elif args.recent:
-        meetings = processor.get_recent_meetings(documents, transcripts, args.recent)
-    elif args.date:
-        meetings = processor.get_meetings_for_date(documents, transcripts, args.date)
+    memory_root = args.memory_root or get_memory_root()
+    budget = MemoryBudget(args.memory_budget or get_memory_budget_mb(), trace=args.memory_report)
+    print(f"Memory Root: {memory_root}")
+    if args.meeting_json:
+        # Assembled by the caller, so there is no cache to parse
+        meeting = read_meeting_json(args.meeting_json)
+        transcripts, splits = {}, {}
+        doc_ids = [meeting['doc_id']]
+        meetings = iter([meeting])
     else:
-        # Default to today
-        today = datetime.now().strftime('%Y-%m-%d')
-        meetings = processor.get_meetings_for_date(documents, transcripts, today)
-
-    print(f"Found {len(meetings)} meetings to process")
-
-    if args.dry_run:
-        for mtg in meetings:
-            print(f"\n  Would process: {mtg.get('title', 'Untitled')}")
-            print(f"    Duration: {mtg.get('duration_minutes', 0)} min")
-            print(f"    Has transcript: {mtg.get('has_transcript', bool(mtg.get('transcript_text')))}")
-        return
+        print("Loading Granola data...")
+        data = granola_meetings.load_granola_data(lean=budget.limit_mb is not None)
+        documents = data['documents']
+        transcripts = data['transcripts']
+        identities = build_identity_index(data, memory_root, GRANOLA_CACHE)
+        del data
+        splits = granola_meetings.detect_split_meetings(documents, transcripts)
+        doc_ids, meetings = select_meetings(args, documents, transcripts, splits, identities)
+
+    print(f"Found {len(doc_ids)} meetings to process")
+    budget.streaming = not budget.fits(granola_meetings.transcript_bytes(transcripts, doc_ids, splits))
+    if budget.streaming:
+        print(f"Streaming meetings one at a time (memory budget {budget.limit_mb} MB)")
+    else:
+        meetings = list(meetings)
+        # Only meetings about to be written need topics
+        tag_topics([m for m in meetings if is_new(m, memory_root)], memory_root)
 
     processed = 0
     for meeting in meetings:
-        if process_meeting(meeting, MEMORY_ROOT):
+        if budget.streaming and is_new(meeting, memory_root):
+            tag_topics([meeting], memory_root)
+        if args.dry_run:
+            print_dry_run(meeting)
+        elif process_meeting(meeting, memory_root, args.user_email, args.user_domain, args.org_name):
             processed += 1
+        granola_meetings.release_meeting(transcripts, meeting)
+        budget.sample()
+
+    if args.dry_run:
+        if args.memory_report:
+            print(f"\n{budget.summary()}")
+        return
 
     print(f"\n{'=' * 40}")
     print(f"Processed {processed} meetings")
-    print(f"Memory location: {MEMORY_ROOT}")
+    print(f"Memory location: {memory_root}")
+    if args.memory_report:
+        print(budget.summary())
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Thin client for the Work Memory query server (memory-server.py)
+
+Used by the /mem-* commands: sends one request over the server's Unix
+socket and prints the answer in the same format as the command's own
+find/grep implementation.
+
+Exits with status 3 (printing nothing) if the server isn't running, so the
+command can fall back to the catalog or to scanning the tree itself. /mem-view
+also falls back when the name isn't a unique match, so misspelt or partial
+names get the catalog's ranked fuzzy lookup.
+
+Usage:
+    python3 mem-query.py --memory-root <path> search <query...>
+    python3 mem-query.py --memory-root <path> --since 2025-10 --until 2026-01 search <query...>
+    python3 mem-query.py --memory-root <path> list [people|projects|teams|all]
+    python3 mem-query.py --memory-root <path> view <name>
+    python3 mem-query.py --memory-root <path> recent [days]
+    python3 mem-query.py --memory-root <path> stats
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+import time
+import argparse
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(__file__))
+from memory_tree import entity_label, server_socket_path
+
+SERVER_UNAVAILABLE = 3
+RULE = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+def request(memory_root, op, **args):
+    """Send one request; returns the result, or None if the server is unreachable."""
+    path = server_socket_path(memory_root)
+    if not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(10)
+            sock.connect(path)
+            sock.sendall(json.dumps({'op': op, 'args': args}).encode('utf-8') + b'\n')
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if chunk.endswith(b'\n'):
+                    break
+    except OSError:
+        return None
+    response = json.loads(b''.join(chunks) or b'{}')
+    if not response.get('ok'):
+        return None
+    return response['result']
+
+def show_search(memory_root, query, since=None, until=None):
+    results = request(memory_root, 'search', query=query, since=since, until=until)
+    if results is None:
+        return False
+
+    print(f"🔍 Searching for: \"{query}\"")
+    print(f"Location: {memory_root}")
+    print()
+
+    if not results:
+        print(f"❌ No results found for \"{query}\"")
+        print()
+        print("💡 Try:")
+        print("  • Different search terms")
+        print("  • /mem-list to see what's available")
+        return True
+
+    print(f"Found {len(results)} matches:")
+    print()
+
+    current = None
+    for item in results:
+        if item['path'] != current:
+            etype, name = entity_label(item['path'])
+            suffix = " (archived)" if item.get('archived') else ""
+            print(RULE)
+            print(f"{etype}: {name}")
+            print(f"📄 File: {os.path.basename(item['path'])}{suffix} (line {item['line']})")
+            print()
+            current = item['path']
+        print(f"  {item['text']}")
+        print()
+
+    print(RULE)
+    print()
+    print("💡 Use /mem-view <name> to see full context")
+    return True
+
+def show_list(memory_root, kind):
+    kinds = {'people': 'person', 'person': 'person', 'projects': 'project', 'project': 'project',
+             'teams': 'team', 'team': 'team'}
+    result = request(memory_root, 'list', kind=kinds.get(kind))
+    if result is None:
+        return False
+
+    print("📚 Work Memory Contents")
+    print(f"Location: {memory_root}")
+    print()
+
+    sections = [('person', 'People', '👥'), ('project', 'Projects', '📊'), ('team', 'Teams', '🏢')]
+    for key, title, emoji in sections:
+        items = result['groups'][key]
+        if not items:
+            continue
+        print(f"{emoji} {title} ({len(items)})")
+        print()
+        for item in items:
+            name = item['name'] or item['slug']
+            if key == 'project' and item['status']:
+                print(f"  • {name} [{item['status']}]")
+            elif item['role'] and item['team']:
+                print(f"  • {name} - {item['role']}, {item['team']}")
+            elif item['role']:
+                print(f"  • {name} - {item['role']}")
+            else:
+                print(f"  • {name}")
+        print()
+
+    if kinds.get(kind) is None and result['topics']:
+        print(f"📖 Topics ({result['topics']})")
+        print()
+
+    print("💡 Tip: Use /mem-view <name> to see full details")
+    return True
+
+def show_view(memory_root, name):
+    result = request(memory_root, 'view', name=name)
+    if result is None:
+        return False
+
+    # Misses and ambiguous names go to the catalog's ranked fuzzy lookup
+    matches = result['matches']
+    if len(matches) != 1:
+        return False
+
+    entity = matches[0]
+    location = os.path.join(memory_root, entity['dir'])
+    print(RULE)
+    print()
+    if result['text'] is not None:
+        print(result['text'].rstrip('\n'))
+    else:
+        print(f"❌ {result['main_file'].split('.')[0].title()} not found at: {location}/{result['main_file']}")
+    print()
+    print(RULE)
+    print()
+    print("📂 Available files:")
+    for f in result['files']:
+        print(f"  • {f}")
+    if entity['type'] == 'person' and result['interactions']:
+        print()
+        print(f"💬 Interactions: {result['interactions']} logged")
+    print()
+    print(f"📍 Location: {location}")
+    print()
+    return True
+
+def show_recent(memory_root, days):
+    items = request(memory_root, 'recent', days=days)
+    if items is None:
+        return False
+
+    print(f"⏱️  Recent Activity (Last {days} days)")
+    print(f"Location: {memory_root}")
+    print()
+
+    if not items:
+        print(f"❌ No activity found in the last {days} days")
+        print()
+        print("💡 Try:")
+        print("  • Increasing the time window: /mem-recent 30")
+        print("  • Logging interactions: use memory management")
+        return True
+
+    print(f"Found {len(items)} files modified in the last {days} days")
+    print()
+
+    groups = {'people': {}, 'projects': {}, 'other': {}}
+    for item in items:
+        parts = item['path'].split('/')
+        when = time.strftime('%Y-%m-%d %H:%M', time.localtime(item['mtime']))
+        if parts[0] == 'people':
+            person = parts[2] if len(parts) > 3 and parts[1] in ('internal', 'external') else parts[1]
+            groups['people'].setdefault(person, []).append(f"{when} - {parts[-1]}")
+        elif parts[0] == 'projects':
+            groups['projects'].setdefault(parts[1], []).append(f"{when} - {parts[-1]}")
+        elif parts[0] == 'me':
+            groups['other'].setdefault('Your profile', []).append(f"{when} - {parts[-1]}")
+        else:
+            groups['other'].setdefault('Other', []).append(f"{when} - {item['path']}")
+
+    for key, title in (('people', '👥 People Updates'), ('projects', '📊 Project Updates'),
+                       ('other', '📝 Other Updates')):
+        if not groups[key]:
+            continue
+        print(f"{title} ({len(groups[key])})")
+        print()
+        for entity, lines in groups[key].items():
+            print(f"  {entity}")
+            for line in lines[:3]:
+                print(f"    • {line}")
+            print()
+
+    print(RULE)
+    print()
+    print("💡 Use /mem-view <name> to see full context")
+    print(f"   Or /mem-recent {days * 2} to look back further")
+    return True
+
+def show_stats(memory_root, org='', initialized=''):
+    stats = request(memory_root, 'stats')
+    if stats is None:
+        return False
+
+    size = stats['bytes']
+    for unit in ('B', 'K', 'M', 'G'):
+        if size < 1024 or unit == 'G':
+            break
+        size /= 1024
+
+    print(RULE)
+    print(f"📊 Work Memory Statistics - {org}")
+    print(RULE)
+    print()
+    print("🗄️  System Information")
+    print()
+    print(f"  Location: {memory_root}")
+    print(f"  Initialized: {initialized}")
+    print()
+    print("📈 Entity Counts")
+    print()
+    print(f"  👥 People: {stats['people']}")
+    print(f"  📊 Projects: {stats['projects']}")
+    print(f"  🏢 Teams: {stats['teams']}")
+    print(f"  📖 Topics: {stats['topics']}")
+    print()
+    print("💬 Interaction Logs")
+    print()
+    print(f"  Total files: {stats['interaction_files']}")
+    print(f"  This month: {stats['this_month']}")
+    print()
+    print("💾 Storage")
+    print()
+    print(f"  Total size: {size:.1f}{unit}")
+    if stats['archived_files']:
+        print(f"  Archived files: {stats['archived_files']}")
+    print()
+    print("⏱️  Recent Activity")
+    print()
+    if stats['recent']:
+        for item in stats['recent']:
+            when = time.strftime('%Y-%m-%d %H:%M', time.localtime(item['mtime']))
+            print(f"  • {when} - {item['path']}")
+    else:
+        print("  No recent activity")
+    print()
+    if stats['top_people']:
+        print("🔝 Most Interactions")
+        print()
+        for person in stats['top_people']:
+            name = person['name'] or person['dir'].rsplit('/', 1)[-1]
+            print(f"  • {name} - {person['count']} interaction logs")
+        print()
+    print(RULE)
+    print()
+    print(f"💡 Memory Health: {'✅ Active' if stats['people'] > 0 else '⚠️ No data yet'}")
+    print()
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the Work Memory query server')
+    parser.add_argument('--memory-root', required=True)
+    parser.add_argument('--org', default='', help='Organization name (stats header)')
+    parser.add_argument('--initialized', default='', help='Init date (stats header)')
+    parser.add_argument('--since', metavar='YYYY-MM', help='search: skip monthly files (and archives) before this month')
+    parser.add_argument('--until', metavar='YYYY-MM', help='search: skip monthly files (and archives) after this month')
+    parser.add_argument('op', choices=['search', 'list', 'view', 'recent', 'stats'])
+    parser.add_argument('args', nargs='*')
+
+    args = parser.parse_args()
+    root = args.memory_root
+
+    # Render into a buffer so a failure never leaves half an answer on screen
+    # before the command falls back to its own scan
+    buffer = io.StringIO()
+    status = 0
+    try:
+        with redirect_stdout(buffer):
+            if args.op == 'search':
+                ok = show_search(root, ' '.join(args.args), args.since, args.until)
+            elif args.op == 'list':
+                ok = show_list(root, args.args[0] if args.args else 'all')
+            elif args.op == 'view':
+                ok = show_view(root, ' '.join(args.args))
+            elif args.op == 'recent':
+                ok = show_recent(root, int(args.args[0]) if args.args else 7)
+            else:
+                ok = show_stats(root, args.org, args.initialized)
+        status = 0 if ok else SERVER_UNAVAILABLE
+    except SystemExit as e:
+        status = e.code
+    except Exception:
+        status = SERVER_UNAVAILABLE
+
+    if status != SERVER_UNAVAILABLE:
+        sys.stdout.write(buffer.getvalue())
+    sys.exit(status)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Work Memory Query Server - keeps the memory tree warm for /mem-* commands
+
+Every /mem-* command used to re-read the config and walk the whole tree
+with find/grep. This server loads the tree once (text, frontmatter,
+entities, archived months), keeps it fresh as files change, and answers
+search/list/view/recent/stats over a Unix domain socket in milliseconds.
+
+The commands talk to it through mem-query.py and fall back to their
+original find/grep implementation when the server isn't running.
+
+Freshness:
+- With watchdog installed, changes under MEMORY_ROOT mark the tree dirty
+  and the next request re-stats it (only changed files are re-read)
+- Without watchdog, a request re-stats the tree if it's older than 2s
+
+Protocol: one JSON line per request ({"op": ..., "args": {...}}), one JSON
+line per response ({"ok": true, "result": ...} or {"ok": false, "error": ...}).
+
+Usage:
+    python3 memory-server.py            # Run in the foreground
+    python3 memory-server.py --stop     # Stop a running server
+
+Optional:
+    pip install watchdog
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import argparse
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+sys.path.insert(0, os.path.dirname(__file__))
+from memory_tree import MemoryTree, server_socket_path
+from memory_config import get_memory_root
+
+POLL_STALENESS_SECONDS = 2.0
+
+def log(message):
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+class TreeChangeHandler(FileSystemEventHandler):
+    """Marks the tree dirty on any change under MEMORY_ROOT."""
+
+    def __init__(self, server):
+        self.server = server
+
+    def on_any_event(self, event):
+        self.server.dirty = True
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            response = {'ok': True, 'result': self.server.dispatch(request)}
+        except Exception as e:
+            response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+class QueryServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, tree):
+        self.tree = tree
+        self.lock = threading.Lock()
+        self.dirty = True
+        self.watching = False
+        super().__init__(socket_path, QueryHandler)
+
+    def ensure_fresh(self):
+        """Re-stat the tree if something changed (or, when polling, if it's stale)."""
+        stale = time.time() - self.tree.loaded_at > POLL_STALENESS_SECONDS
+        if self.dirty or (not self.watching and stale):
+            self.dirty = False
+            self.tree.refresh()
+
+    def dispatch(self, request):
+        op = request.get('op')
+        args = request.get('args') or {}
+        with self.lock:
+            if op == 'ping':
+                return {'memory_root': self.tree.memory_root, 'files': len(self.tree.files)}
+            self.ensure_fresh()
+            if op == 'search':
+                return self.tree.search(args['query'], args.get('ignore_case', True), args.get('regex', False),
+                                        since=args.get('since'), until=args.get('until'))
+            if op == 'list':
+                return self.tree.list(args.get('kind'))
+            if op == 'view':
+                return self.tree.view(args['name'])
+            if op == 'recent':
+                return self.tree.recent(int(args.get('days', 7)))
+            if op == 'stats':
+                return self.tree.stats()
+        raise ValueError(f"unknown op: {op}")
+
+def server_running(socket_path):
+    """True if something is accepting connections on socket_path."""
+    if not os.path.exists(socket_path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            sock.connect(socket_path)
+            sock.sendall(b'{"op": "ping"}\n')
+            return bool(sock.recv(1))
+    except OSError:
+        return False
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def serve(memory_root):
+    socket_path = server_socket_path(memory_root)
+
+    if server_running(socket_path):
+        print(f"Query server already running for {memory_root}")
+        return
+    if os.path.exists(socket_path):
+        os.remove(socket_path)  # Stale socket from a crashed server
+
+    tree = MemoryTree(memory_root)
+    started = time.time()
+    tree.refresh()
+    log(f"Loaded {len(tree.files)} files ({len(tree.archived)} archived) "
+        f"in {(time.time() - started) * 1000:.0f} ms")
+
+    server = QueryServer(socket_path, tree)
+    os.chmod(socket_path, 0o600)
+    server.dirty = False
+
+    observer = None
+    if WATCHDOG_AVAILABLE:
+        observer = Observer()
+        observer.schedule(TreeChangeHandler(server), memory_root, recursive=True)
+        observer.start()
+        server.watching = True
+        log(f"Watching {memory_root} for changes")
+    else:
+        log(f"watchdog not installed; re-checking the tree at most every {POLL_STALENESS_SECONDS:.0f}s")
+
+    with open(socket_path + '.pid', 'w') as f:
+        f.write(str(os.getpid()))
+
+    # SIGTERM (launchctl stop / --stop) shuts down like Ctrl+C
+    signal.signal(signal.SIGTERM, _interrupt)
+
+    log(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log("Stopping query server...")
+    finally:
+        if observer:
+            observer.stop()
+            observer.join()
+        server.server_close()
+        for path in (socket_path, socket_path + '.pid'):
+            if os.path.exists(path):
+                os.remove(path)
+
+def stop(memory_root):
+    pid_file = server_socket_path(memory_root) + '.pid'
+    if not os.path.exists(pid_file):
+        print("Query server is not running")
+        return
+    with open(pid_file, 'r') as f:
+        pid = int(f.read().strip())
+    try:
+        os.kill(pid, signal.SIGTERM)
+        print(f"Stopped query server (pid {pid})")
+    except ProcessLookupError:
+        os.remove(pid_file)
+        print("Query server was not running (removed stale pid file)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Warm query server for /mem-* commands')
+    parser.add_argument('--memory-root', help='Path to WorkMemory (default: from config)')
+    parser.add_argument('--stop', action='store_true', help='Stop the running server')
+
+    args = parser.parse_args()
+    memory_root = args.memory_root or get_memory_root()
+
+    if args.stop:
+        stop(memory_root)
+    else:
+        serve(memory_root)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+"""
+Monthly archives for old Work Memory files.
+
+Meeting logs, interaction logs and activity logs are all written per month
+and never touched again once the month is over, but every find/grep-based
+command still walks them. Compaction packs one month's files into a single
+zip under MEMORY_ROOT/.archive/ next to a small JSON member index:
+
+    .archive/2025-01.zip          # members stored under their original paths
+    .archive/2025-01.index.json   # path, size, mtime and kind of each member
+
+The index answers "which archived files exist / changed when" (and, for
+meetings, which Granola document they hold) without opening the zip, and
+zip's central directory gives random access to a single member. Readers
+only open a month's archive when the requested time range includes that
+month.
+
+Archived months stay writable: a late or manual sync of an archived month
+checks the archive first (archived_meeting(), read_member()), so it only
+writes what the archive doesn't have yet, as loose files. Compacting the
+month again merges those into the archived copies by entry key.
+"""
+
+import json
+import os
+import re
+import zipfile
+from datetime import datetime
+
+from memory_templates import ENTRY_KEY_RE
+
+ARCHIVE_DIR = '.archive'
+INDEX_SUFFIX = '.index.json'
+
+MONTH_RE = re.compile(r'^\d{4}-\d{2}$')
+DOC_ID_RE = re.compile(r'^granola_doc_id:[ \t]*(\S+)', re.MULTILINE)
+# Interaction/activity entries ("## YYYY-MM-DD - ...") and daily log entries ("### ...")
+ENTRY_HEAD_RE = re.compile(r'^#{2,3} \d{4}-\d{2}-\d{2}\b', re.MULTILINE)
+
+def month_of(rel_path):
+    """
+    Return the YYYY-MM a memory file belongs to, or None if it isn't monthly.
+
+    Recognized layouts:
+        meetings/YYYY-MM/<file>.md
+        people/<type>/<slug>/interactions/YYYY-MM.md
+        logs/YYYY-MM.md
+    """
+    parts = rel_path.replace(os.sep, '/').split('/')
+    if len(parts) == 3 and parts[0] == 'meetings' and MONTH_RE.match(parts[1]):
+        return parts[1]
+    if len(parts) >= 3 and parts[-2] == 'interactions' and parts[0] == 'people':
+        stem = parts[-1][:-3] if parts[-1].endswith('.md') else ''
+        return stem if MONTH_RE.match(stem) else None
+    if len(parts) == 2 and parts[0] == 'logs' and parts[1].endswith('.md'):
+        stem = parts[1][:-3]
+        return stem if MONTH_RE.match(stem) else None
+    return None
+
+def kind_of(rel_path):
+    """Classify a monthly file as 'meeting', 'interaction' or 'log'."""
+    if rel_path.startswith('meetings/'):
+        return 'meeting'
+    if '/interactions/' in rel_path:
+        return 'interaction'
+    return 'log'
+
+def _month_end(month):
+    year, mon = int(month[:4]), int(month[5:7])
+    if mon == 12:
+        return datetime(year + 1, 1, 1)
+    return datetime(year, mon + 1, 1)
+
+def _in_range(month, since=None, until=None):
+    return (not since or month >= since) and (not until or month <= until)
+
+def archive_paths(memory_root, month):
+    base = os.path.join(memory_root, ARCHIVE_DIR, month)
+    return base + '.zip', base + INDEX_SUFFIX
+
+# -- finding loose files --------------------------------------------------
+
+def loose_files_by_month(memory_root):
+    """Map YYYY-MM -> list of relative paths of monthly files still on disk."""
+    months = {}
+
+    def add(rel_path):
+        month = month_of(rel_path)
+        if month:
+            months.setdefault(month, []).append(rel_path)
+
+    meetings_dir = os.path.join(memory_root, 'meetings')
+    if os.path.isdir(meetings_dir):
+        for month in os.listdir(meetings_dir):
+            month_dir = os.path.join(meetings_dir, month)
+            if os.path.isdir(month_dir):
+                for f in os.listdir(month_dir):
+                    if f.endswith('.md'):
+                        add(f"meetings/{month}/{f}")
+
+    people_dir = os.path.join(memory_root, 'people')
+    if os.path.isdir(people_dir):
+        for root, dirs, files in os.walk(people_dir):
+            if os.path.basename(root) != 'interactions':
+                continue
+            rel_dir = os.path.relpath(root, memory_root).replace(os.sep, '/')
+            for f in files:
+                add(f"{rel_dir}/{f}")
+
+    logs_dir = os.path.join(memory_root, 'logs')
+    if os.path.isdir(logs_dir):
+        for f in os.listdir(logs_dir):
+            add(f"logs/{f}")
+
+    return months
+
+def months_to_compact(memory_root, retention_days, now=None):
+    """Months with loose files whose last day is older than the retention horizon."""
+    now = now or datetime.now()
+    months = loose_files_by_month(memory_root)
+    return sorted(
+        m for m in months
+        if (now - _month_end(m)).days >= retention_days
+    )
+
+# -- writing --------------------------------------------------------------
+
+def load_month_index(memory_root, month):
+    _, index_path = archive_paths(memory_root, month)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r') as f:
+        return json.load(f)
+
+def merge_member(archived, loose):
+    """
+    An archived log plus the entries of its loose copy it doesn't have yet.
+
+    Entries match by idempotency key, or by text for entries written before
+    keys existed; the loose copy's header is dropped.
+    """
+    starts = [m.start() for m in ENTRY_HEAD_RE.finditer(loose)]
+    keys = set(ENTRY_KEY_RE.findall(archived))
+    added = []
+    for i, start in enumerate(starts):
+        entry = loose[start:starts[i + 1] if i + 1 < len(starts) else len(loose)].strip('\n')
+        entry_keys = ENTRY_KEY_RE.findall(entry)
+        if (entry_keys and keys.issuperset(entry_keys)) or entry in archived:
+            continue
+        keys.update(entry_keys)
+        added.append(f"\n{entry}\n")
+    if not added:
+        return archived
+    return archived.rstrip('\n') + '\n' + ''.join(added)
+
+def compact_month(memory_root, month, dry_run=False):
+    """
+    Pack a month's loose files into its archive and remove them.
+
+    If the month was archived before (a late or manual sync wrote an old
+    month again), existing members are kept: a loose log's new entries are
+    merged into the archived copy (merge_member), and a loose meeting file
+    replaces its archived copy. The files' stripe locks (memory_locks.py)
+    are held throughout, so writers wait for the archive to be in place.
+
+    Returns the list of relative paths that were packed.
+    """
+    loose = sorted(loose_files_by_month(memory_root).get(month, []))
+    if not loose or dry_run:
+        return loose
+
+    zip_path, index_path = archive_paths(memory_root, month)
+    os.makedirs(os.path.dirname(zip_path), exist_ok=True)
+
+    # Hold the files' locks from reading them until they're removed, so an
+    # entry appended meanwhile (append_once) can't be lost; memory_locks
+    # imports this module, hence the late import
+    from memory_locks import files_lock
+    with files_lock(memory_root, [os.path.join(memory_root, rel_path) for rel_path in loose]):
+        members = {}
+        contents = {}
+        existing = load_month_index(memory_root, month)
+        if existing and os.path.exists(zip_path):
+            with zipfile.ZipFile(zip_path, 'r') as zf:
+                for member in existing.get('members', []):
+                    members[member['path']] = member
+                    contents[member['path']] = zf.read(member['path'])
+
+        for rel_path in loose:
+            full_path = os.path.join(memory_root, rel_path)
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            st = os.stat(full_path)
+            kind = kind_of(rel_path)
+            if rel_path in contents and kind != 'meeting':
+                data = merge_member(contents[rel_path].decode('utf-8', errors='replace'),
+                                    data.decode('utf-8', errors='replace')).encode('utf-8')
+            contents[rel_path] = data
+            members[rel_path] = {
+                'path': rel_path,
+                'size': len(data),
+                'mtime': max(st.st_mtime, members.get(rel_path, {}).get('mtime', 0)),
+                'kind': kind,
+            }
+            if kind == 'meeting':
+                doc_id = DOC_ID_RE.search(data.decode('utf-8', errors='replace'))
+                if doc_id:
+                    members[rel_path]['doc_id'] = doc_id.group(1)
+
+        tmp_zip = zip_path + '.tmp'
+        with zipfile.ZipFile(tmp_zip, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for rel_path in sorted(contents):
+                zf.writestr(rel_path, contents[rel_path])
+
+        tmp_index = index_path + '.tmp'
+        with open(tmp_index, 'w') as f:
+            json.dump({
+                'month': month,
+                'compacted_at': datetime.now().isoformat(timespec='seconds'),
+                'members': [members[p] for p in sorted(members)],
+            }, f, indent=1)
+
+        os.replace(tmp_zip, zip_path)
+        os.replace(tmp_index, index_path)
+
+        # Only remove originals once the archive and its index are in place
+        for rel_path in loose:
+            full_path = os.path.join(memory_root, rel_path)
+            os.remove(full_path)
+            parent = os.path.dirname(full_path)
+            if rel_path.startswith('meetings/') and not os.listdir(parent):
+                os.rmdir(parent)
+
+    return loose
+
+# -- reading --------------------------------------------------------------
+
+def archived_months(memory_root, since=None, until=None):
+    """Archived months (YYYY-MM) within [since, until], oldest first."""
+    archive_dir = os.path.join(memory_root, ARCHIVE_DIR)
+    if not os.path.isdir(archive_dir):
+        return []
+    months = []
+    for f in os.listdir(archive_dir):
+        if f.endswith(INDEX_SUFFIX):
+            month = f[:-len(INDEX_SUFFIX)]
+            if MONTH_RE.match(month) and _in_range(month, since, until):
+                months.append(month)
+    return sorted(months)
+
+def iter_members(memory_root, since=None, until=None, kind=None):
+    """Yield member index entries for archived months in range (no zip access)."""
+    for month in archived_months(memory_root, since, until):
+        index = load_month_index(memory_root, month) or {}
+        for member in index.get('members', []):
+            if kind is None or member.get('kind') == kind:
+                yield member
+
+def read_member(memory_root, rel_path):
+    """Return the text of one archived file, or None if it isn't archived."""
+    month = month_of(rel_path)
+    if not month:
+        return None
+    zip_path, _ = archive_paths(memory_root, month)
+    if not os.path.exists(zip_path):
+        return None
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        try:
+            return zf.read(rel_path).decode('utf-8', errors='replace')
+        except KeyError:
+            return None
+
+def archived_doc_ids(memory_root, since=None, until=None):
+    """{granola_doc_id: rel_path} of archived meeting files in range."""
+    found = {}
+    for month in archived_months(memory_root, since, until):
+        index = load_month_index(memory_root, month) or {}
+        for member in index.get('members', []):
+            if member.get('kind') == 'meeting' and member.get('doc_id'):
+                found.setdefault(member['doc_id'], member['path'])
+    return found
+
+def archived_meeting(memory_root, rel_path, doc_id=None):
+    """
+    Where a meeting file is archived: rel_path itself, or the archived
+    meeting of the same month with this Granola doc ID (it was renamed in
+    Granola since). None if the meeting isn't archived.
+    """
+    month = month_of(rel_path)
+    index = load_month_index(memory_root, month) if month else None
+    if not index:
+        return None
+    if any(member['path'] == rel_path for member in index.get('members', [])):
+        return rel_path
+    if doc_id:
+        return archived_doc_ids(memory_root, month, month).get(doc_id)
+    return None
+
+def iter_texts(memory_root, since=None, until=None, kind=None):
+    """Yield (rel_path, text) for archived files in range, one zip open per month."""
+    for month in archived_months(memory_root, since, until):
+        index = load_month_index(memory_root, month) or {}
+        members = [m for m in index.get('members', []) if kind is None or m.get('kind') == kind]
+        if not members:
+            continue
+        zip_path, _ = archive_paths(memory_root, month)
+        with zipfile.ZipFile(zip_path, 'r') as zf:
+            for member in members:
+                yield member['path'], zf.read(member['path']).decode('utf-8', errors='replace')
+
+def grep(memory_root, pattern, since=None, until=None, ignore_case=True):
+    """Yield (rel_path, line_number, line) for archived lines matching pattern."""
+    flags = re.IGNORECASE if ignore_case else 0
+    regex = re.compile(pattern, flags)
+    for rel_path, text in iter_texts(memory_root, since, until):
+        for line_no, line in enumerate(text.splitlines(), 1):
+            if regex.search(line):
+                yield rel_path, line_no, line
+
+def month_for_days_ago(days, now=None):
+    """The YYYY-MM containing the date N days ago (lower bound for 'recent' queries)."""
+    now = now or datetime.now()
+    return datetime.fromtimestamp(now.timestamp() - days * 86400).strftime('%Y-%m')
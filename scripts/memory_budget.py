@@ -0,0 +1,91 @@
+"""
+Memory ceiling and peak usage reporting for the Granola pipeline.
+
+get_meetings_for_date() assembles every meeting of the day, each with its
+full transcript_text, before the first one is written, on top of the whole
+parsed cache snapshot. On a cache with years of long transcripts that is
+the process's peak. A MemoryBudget samples the resident set size (and,
+with trace=True, the Python heap via tracemalloc), so a run can report its
+peak, and tells the caller whether holding a batch would cross the ceiling
+(memory_budget_mb in the skill config). Over the ceiling, callers take
+their streaming path: one meeting at a time, its transcript released as
+soon as it is written.
+
+RSS comes from /proc/self/statm where there is one (Linux); elsewhere
+(macOS) the only stdlib figure is the peak from getrusage(), which
+overstates current usage and so errs towards streaming.
+"""
+
+import os
+import sys
+
+MB = 1024 * 1024
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (0 if unknown)."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes on Linux
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def current_rss():
+    """Current resident set size in bytes, falling back to the peak."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return peak_rss()
+
+class MemoryBudget:
+    """Tracks peak memory against an optional ceiling (in MB)."""
+
+    def __init__(self, limit_mb=None, trace=False):
+        self.limit_mb = limit_mb or None
+        self.trace = trace
+        self.streaming = False
+        self.peak = 0
+        self.samples = 0
+        if trace:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def sample(self):
+        """Record current usage; returns the current RSS in bytes."""
+        rss = current_rss()
+        self.peak = max(self.peak, rss)
+        self.samples += 1
+        return rss
+
+    def fits(self, extra_bytes=0):
+        """Whether holding extra_bytes more stays under the ceiling (always, without one)."""
+        rss = self.sample()
+        if self.limit_mb is None:
+            return True
+        return rss + extra_bytes <= self.limit_mb * MB
+
+    def report(self):
+        """{'peak_rss_mb', 'peak_heap_mb' (traced only), 'limit_mb', 'streaming', 'samples'}."""
+        self.sample()
+        report = {
+            'peak_rss_mb': round(max(self.peak, peak_rss()) / MB, 1),
+            'limit_mb': self.limit_mb,
+            'streaming': self.streaming,
+            'samples': self.samples,
+        }
+        if self.trace:
+            import tracemalloc
+            report['peak_heap_mb'] = round(tracemalloc.get_traced_memory()[1] / MB, 1)
+        return report
+
+    def summary(self):
+        report = self.report()
+        text = f"Peak memory: {report['peak_rss_mb']} MB RSS"
+        if 'peak_heap_mb' in report:
+            text += f", {report['peak_heap_mb']} MB Python heap"
+        if self.limit_mb:
+            text += f" (budget {self.limit_mb} MB, {'streamed' if self.streaming else 'batched'})"
+        return text
@@ -0,0 +1,834 @@
+"""
+SQLite catalog of Work Memory people, projects, teams, meetings and
+interactions.
+
+/mem-list and /mem-view used to discover entities by listing directories
+and grepping frontmatter, so questions like "external contacts at Acme I
+haven't met in 60 days" meant reading every profile. The catalog keeps the
+structured parts of the tree in MEMORY_ROOT/config/catalog.db:
+
+    entities      one row per people/projects/teams folder (frontmatter fields)
+    meetings      one row per meetings/YYYY-MM/*.md (title, date, duration, doc ID,
+                  conversation analytics from conversation_stats.py)
+    attendees     meeting -> attendee email/name (joined to people by email)
+    interactions  one row per "## YYYY-MM-DD - title" entry in interaction logs
+                  (and in project/team activity logs: meetings linked to them)
+    entity_grams  trigram -> entity posting list for fuzzy lookup (slug, name, email)
+    meeting_topics  topic -> meeting posting list (from the `topics` frontmatter list)
+    action_items  one row per checkbox item ("- [ ]" / "- [x]") in meeting files,
+                  interaction logs and action-items.md: status, owner, due date
+    files         mtime/size of every catalogued file, for incremental sync
+
+log-meeting-to-memory.py updates it for the files it writes; sync() picks up
+anything else (manual edits, archived months) by re-reading only files whose
+mtime or size changed, and rebuild() recreates it from disk.
+"""
+
+import math
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+import memory_archive
+from conversation_stats import FIELDS as CONVERSATION_FIELDS
+from memory_tree import parse_frontmatter, parse_list, entity_of, SKIP_DIRS
+
+CATALOG_FILE = os.path.join('config', 'catalog.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    archived INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entities (
+    dir TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    category TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    team TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS entities_type ON entities (type, slug);
+CREATE INDEX IF NOT EXISTS entities_slug ON entities (slug);
+CREATE INDEX IF NOT EXISTS entities_email ON entities (email);
+CREATE INDEX IF NOT EXISTS entities_name ON entities (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS entity_keys (
+    id INTEGER PRIMARY KEY,
+    dir TEXT NOT NULL UNIQUE,
+    grams INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entity_grams (
+    gram TEXT NOT NULL,
+    key_id INTEGER NOT NULL,
+    PRIMARY KEY (gram, key_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entity_grams_key ON entity_grams (key_id);
+CREATE TABLE IF NOT EXISTS meetings (
+    path TEXT PRIMARY KEY,
+    doc_id TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    duration_minutes REAL NOT NULL DEFAULT 0,
+    was_split INTEGER NOT NULL DEFAULT 0,
+    talk_share REAL,
+    longest_monologue_seconds REAL,
+    longest_monologue_by TEXT,
+    silence_gaps INTEGER,
+    silence_seconds REAL,
+    segments_per_minute REAL
+);
+CREATE INDEX IF NOT EXISTS meetings_date ON meetings (date);
+CREATE TABLE IF NOT EXISTS attendees (
+    meeting_path TEXT NOT NULL,
+    email TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (meeting_path, email)
+);
+CREATE INDEX IF NOT EXISTS attendees_email ON attendees (email);
+CREATE TABLE IF NOT EXISTS interactions (
+    path TEXT NOT NULL,
+    entity_dir TEXT NOT NULL,
+    date TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS interactions_entity ON interactions (entity_dir, date);
+CREATE INDEX IF NOT EXISTS interactions_path ON interactions (path);
+CREATE TABLE IF NOT EXISTS meeting_topics (
+    topic TEXT NOT NULL,
+    meeting_path TEXT NOT NULL,
+    PRIMARY KEY (topic, meeting_path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS meeting_topics_path ON meeting_topics (meeting_path);
+CREATE TABLE IF NOT EXISTS action_items (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    entity_dir TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    context TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    owner TEXT NOT NULL DEFAULT '',
+    owner_key TEXT NOT NULL DEFAULT '',
+    due TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL,
+    PRIMARY KEY (path, line)
+);
+CREATE INDEX IF NOT EXISTS action_items_status ON action_items (status, due);
+CREATE INDEX IF NOT EXISTS action_items_entity ON action_items (entity_dir, status);
+CREATE INDEX IF NOT EXISTS action_items_owner ON action_items (owner_key, status);
+"""
+
+ATTENDEE_RE = re.compile(r'^\s*-\s*email:\s*(\S+)\s*(?:\n\s+name:\s*(.+))?', re.MULTILINE)
+INTERACTION_RE = re.compile(r'^##\s+(\d{4}-\d{2}-\d{2})\s*-?\s*(.*)$', re.MULTILINE)
+
+# Action items: "- [ ] text" (open) or "- [x] text" (done). The owner is an
+# @mention, a leading "Name:" / "**Name**:", or "Owner: Name"; the due date
+# follows "due", "by" or "before" (or Obsidian's 📅).
+ACTION_ITEM_RE = re.compile(r'^\s*[-*]\s+\[([ xX])\]\s+(.+?)\s*$')
+MENTION_RE = re.compile(r'(?<![\w.])@([A-Za-z][\w.-]*[A-Za-z0-9])')
+LEADING_OWNER_RE = re.compile(r"^\*{0,2}([A-Z][\w'.-]*(?: [A-Z0-9][\w'.-]*){0,2})\*{0,2}:\*{0,2}\s")
+OWNER_FIELD_RE = re.compile(r"\b[Oo]wner:\**\s*\[?([A-Za-z][\w'.-]*(?: [A-Z0-9][\w'.-]*){0,2})")
+DUE_RE = re.compile(r'(?:\b(?:due|by|before)\b:?\**\s*(?:on\s+)?|📅\s*)(\d{4}-\d{2}-\d{2})', re.IGNORECASE)
+# Written into every new meeting file by log-meeting-to-memory.py
+PLACEHOLDER_ITEMS = {'Review and update this meeting summary'}
+ACTION_ITEMS_FILE = 'action-items.md'
+
+# Per-person activity: every dated interaction entry plus every catalogued
+# meeting whose attendee list has the person's email
+ACTIVITY_SQL = """
+SELECT dir, MIN(day) AS first_met, MAX(day) AS last_met, COUNT(DISTINCT meeting) AS meetings
+FROM (
+    SELECT entity_dir AS dir, date AS day, NULL AS meeting FROM interactions
+    UNION ALL
+    SELECT p.dir, m.date, m.path
+    FROM attendees a
+    JOIN meetings m ON m.path = a.meeting_path
+    JOIN entities p ON p.type = 'person' AND p.email != '' AND p.email = a.email
+)
+GROUP BY dir
+"""
+
+# Fuzzy lookup: candidates must share at least this fraction of the query's
+# trigrams, and a single candidate is picked only if it scores at least
+# FUZZY_ACCEPT and beats the runner-up by FUZZY_MARGIN
+FUZZY_MIN_SCORE = 0.3
+FUZZY_ACCEPT = 0.6
+FUZZY_MARGIN = 0.2
+FUZZY_CANDIDATES = 200    # Best-overlap candidates re-ranked by closeness
+
+PEOPLE_SORTS = {
+    'name': "COALESCE(NULLIF(e.name, ''), e.slug) COLLATE NOCASE",
+    'company': "e.company COLLATE NOCASE",
+    'last_met': "act.last_met",
+    'first_met': "act.first_met",
+    'meetings': "COALESCE(act.meetings, 0)",
+}
+
+def main_file_for(entity_type):
+    return 'profile.md' if entity_type == 'person' else 'overview.md'
+
+def trigrams(text):
+    """
+    Padded character trigrams of each word in text ("sarah" -> " sa", "sar",
+    "ara", "rah", "ah "), so prefixes and typos still share most grams.
+    """
+    grams = set()
+    for word in re.findall(r'[a-z0-9]+', text.lower()):
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def parse_topics(header):
+    """Lower-cased topics from a frontmatter block, inline or block-list form."""
+    return [topic.lower() for topic in parse_list(header, 'topics') or []]
+
+def owner_key(owner):
+    """Folder-slug form of an owner ("Sarah Chen" / "sarah.chen" -> "sarah-chen")."""
+    return re.sub(r'[^a-z0-9]+', '-', owner.lower()).strip('-')
+
+def item_owner(text):
+    """Who an action item is assigned to, as written ('' if it doesn't say)."""
+    for pattern in (MENTION_RE, OWNER_FIELD_RE, LEADING_OWNER_RE):
+        match = pattern.search(text)
+        # A leading "TODO:" or "FYI:" isn't a person
+        if match and not match.group(1).isupper():
+            return match.group(1).strip()
+    return ''
+
+def extract_action_items(text, date='', context=''):
+    """
+    Checkbox items in a markdown file, as dicts with line (1-based), date,
+    context, status ('open' or 'done'), owner, due and text.
+
+    Items under a "## YYYY-MM-DD - title" heading (interaction log entries)
+    take that entry's date and title; the rest get date and context.
+    Fenced code (transcript previews) and placeholder items are skipped.
+    """
+    items, fenced = [], False
+    for number, line in enumerate(text.split('\n'), 1):
+        if line.lstrip().startswith('```'):
+            fenced = not fenced
+            continue
+        if fenced:
+            continue
+        if line.startswith('## '):
+            entry = INTERACTION_RE.match(line)
+            if entry:
+                date, context = entry.group(1), entry.group(2).strip()
+            continue
+        match = ACTION_ITEM_RE.match(line)
+        if not match or match.group(2) in PLACEHOLDER_ITEMS:
+            continue
+        item_text = match.group(2)
+        due = DUE_RE.search(item_text)
+        items.append({
+            'line': number,
+            'date': date,
+            'context': context,
+            'status': 'open' if match.group(1) == ' ' else 'done',
+            'owner': item_owner(item_text),
+            'due': due.group(1) if due else '',
+            'text': item_text,
+        })
+    return items
+
+def _conversation_value(value, kind):
+    """A conversation analytics frontmatter value as its column type (None if missing)."""
+    if kind == 'TEXT':
+        return value or None
+    try:
+        return int(value) if kind == 'INTEGER' else float(value)
+    except ValueError:
+        return None
+
+def days_ago(days, today=None):
+    """ISO date `days` days before today."""
+    today = today or datetime.now()
+    return (today - timedelta(days=days)).strftime('%Y-%m-%d')
+
+class Catalog:
+    """SQLite catalog for one memory root."""
+
+    def __init__(self, memory_root):
+        self.memory_root = memory_root
+        self.path = os.path.join(memory_root, CATALOG_FILE)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_empty(self):
+        return self.conn.execute('SELECT 1 FROM files LIMIT 1').fetchone() is None
+
+    # -- indexing ---------------------------------------------------------
+
+    def _forget(self, rel_path):
+        self.conn.execute('DELETE FROM meetings WHERE path = ?', (rel_path,))
+        self.conn.execute('DELETE FROM attendees WHERE meeting_path = ?', (rel_path,))
+        self.conn.execute('DELETE FROM meeting_topics WHERE meeting_path = ?', (rel_path,))
+        self.conn.execute('DELETE FROM interactions WHERE path = ?', (rel_path,))
+        self.conn.execute('DELETE FROM action_items WHERE path = ?', (rel_path,))
+        self.conn.execute('DELETE FROM files WHERE path = ?', (rel_path,))
+
+    def _index_text(self, rel_path, text, mtime, size, archived=False):
+        """Replace everything the catalog knows about one file."""
+        self._forget(rel_path)
+        self.conn.execute(
+            'INSERT INTO files (path, mtime, size, archived) VALUES (?, ?, ?, ?)',
+            (rel_path, mtime, size, int(archived)),
+        )
+
+        if rel_path.startswith('meetings/'):
+            self._index_meeting(rel_path, text)
+            return
+
+        etype, edir = entity_of(rel_path)
+        if not etype:
+            return
+        cur = self.conn.execute(
+            'INSERT OR IGNORE INTO entities (dir, type, slug) VALUES (?, ?, ?)',
+            (edir, etype, edir.rsplit('/', 1)[-1]),
+        )
+        if cur.rowcount:
+            self._index_grams(edir, edir.rsplit('/', 1)[-1])
+        if rel_path == f"{edir}/{main_file_for(etype)}":
+            self._index_entity(edir, etype, parse_frontmatter(text))
+        elif '/interactions/' in rel_path or rel_path.startswith(f"{edir}/activity/"):
+            self.conn.executemany(
+                'INSERT INTO interactions (path, entity_dir, date, title) VALUES (?, ?, ?, ?)',
+                [(rel_path, edir, day, title.strip()) for day, title in INTERACTION_RE.findall(text)],
+            )
+            self._index_action_items(rel_path, text, edir)
+        elif rel_path == f"{edir}/{ACTION_ITEMS_FILE}":
+            self._index_action_items(rel_path, text, edir)
+
+    def _index_meeting(self, rel_path, text):
+        fields = parse_frontmatter(text)
+        try:
+            duration = float(fields.get('duration_minutes') or 0)
+        except ValueError:
+            duration = 0.0
+        date = fields.get('date') or os.path.basename(rel_path)[:10]
+        conversation = [_conversation_value(fields.get(name, ''), kind) for name, kind in CONVERSATION_FIELDS]
+        self.conn.execute(
+            'INSERT INTO meetings (path, doc_id, title, date, duration_minutes, was_split, '
+            f"{', '.join(name for name, _ in CONVERSATION_FIELDS)}) "
+            f"VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' * len(CONVERSATION_FIELDS))})",
+            (rel_path, fields.get('granola_doc_id', ''), fields.get('title', ''), date, duration,
+             int(fields.get('was_split', '').lower() == 'true'), *conversation),
+        )
+        header = text.split('\n---', 2)[0] if text.startswith('---') else ''
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO attendees (meeting_path, email, name) VALUES (?, ?, ?)',
+            [(rel_path, email.lower(), (name or '').strip()) for email, name in ATTENDEE_RE.findall(header)],
+        )
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO meeting_topics (topic, meeting_path) VALUES (?, ?)',
+            [(topic, rel_path) for topic in parse_topics(header)],
+        )
+        self._index_action_items(rel_path, text, '', date, fields.get('title', ''))
+
+    def _index_action_items(self, rel_path, text, edir, date='', context=''):
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO action_items '
+            '(path, line, entity_dir, date, context, status, owner, owner_key, due, text) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(rel_path, item['line'], edir, item['date'], item['context'], item['status'],
+              item['owner'], owner_key(item['owner']), item['due'], item['text'])
+             for item in extract_action_items(text, date, context)],
+        )
+
+    def _index_grams(self, edir, slug, name='', email=''):
+        # The email domain is left out: it's shared by everyone at a company
+        grams = trigrams(' '.join((slug, name, email.split('@')[0])))
+        row = self.conn.execute('SELECT id FROM entity_keys WHERE dir = ?', (edir,)).fetchone()
+        if row:
+            key_id = row['id']
+            self.conn.execute('DELETE FROM entity_grams WHERE key_id = ?', (key_id,))
+            self.conn.execute('UPDATE entity_keys SET grams = ? WHERE id = ?', (len(grams), key_id))
+        else:
+            key_id = self.conn.execute(
+                'INSERT INTO entity_keys (dir, grams) VALUES (?, ?)', (edir, len(grams))
+            ).lastrowid
+        self.conn.executemany('INSERT INTO entity_grams (gram, key_id) VALUES (?, ?)', [(g, key_id) for g in grams])
+
+    def _index_entity(self, edir, etype, fields):
+        category = ''
+        if etype == 'person':
+            parts = edir.split('/')
+            category = parts[1] if len(parts) == 3 else fields.get('type', '')
+        name = fields.get('name') or fields.get('project_name') or fields.get('team_name') or ''
+        email = fields.get('email', '').lower()
+        self._index_grams(edir, edir.rsplit('/', 1)[-1], name, email)
+        self.conn.execute(
+            'UPDATE entities SET name = ?, email = ?, category = ?, company = ?, team = ?, role = ?, status = ? '
+            'WHERE dir = ?',
+            (
+                name,
+                email,
+                category,
+                fields.get('company', ''),
+                fields.get('team', ''),
+                fields.get('role', ''),
+                fields.get('status', ''),
+                edir,
+            ),
+        )
+
+    def _prune_entities(self):
+        """Drop entities whose folder no longer has any catalogued file."""
+        self.conn.execute(
+            "DELETE FROM entities WHERE NOT EXISTS "
+            "(SELECT 1 FROM files f WHERE f.path >= entities.dir || '/' AND f.path < entities.dir || '0')"
+        )
+        self.conn.execute(
+            'DELETE FROM entity_grams WHERE key_id IN '
+            '(SELECT id FROM entity_keys WHERE dir NOT IN (SELECT dir FROM entities))'
+        )
+        self.conn.execute('DELETE FROM entity_keys WHERE dir NOT IN (SELECT dir FROM entities)')
+
+    def index_files(self, paths):
+        """Re-index specific files (absolute or root-relative), e.g. right after writing them."""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            for path in paths:
+                full = path if os.path.isabs(path) else os.path.join(self.memory_root, path)
+                rel = os.path.relpath(full, self.memory_root).replace(os.sep, '/')
+                try:
+                    st = os.stat(full)
+                    with open(full, 'r', errors='replace') as f:
+                        text = f.read()
+                except OSError:
+                    self._forget(rel)
+                    continue
+                self._index_text(rel, text, st.st_mtime, st.st_size)
+            self._prune_entities()
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+    def _scan(self):
+        """Current (mtime, size, archived) of every catalogue-able file on disk."""
+        root = self.memory_root
+        found = {}
+        for member in memory_archive.iter_members(root):
+            found[member['path']] = (member['mtime'], member['size'], True)
+        for dirpath, dirnames, filenames in os.walk(root):
+            if dirpath == root:
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                if not name.endswith('.md'):
+                    continue
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                found[os.path.relpath(full, root).replace(os.sep, '/')] = (st.st_mtime, st.st_size, False)
+        return found
+
+    def sync(self):
+        """
+        Bring the catalog up to date with disk, re-reading only files whose
+        mtime or size changed. Returns (indexed, removed) counts.
+        """
+        found = self._scan()
+        known = {row['path']: (row['mtime'], row['size'], bool(row['archived']))
+                 for row in self.conn.execute('SELECT path, mtime, size, archived FROM files')}
+
+        removed = [rel for rel in known if rel not in found]
+        changed = [rel for rel, stamp in found.items() if known.get(rel) != stamp]
+        if not removed and not changed:
+            return 0, 0
+
+        changed_archived = {rel for rel in changed if found[rel][2]}
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            for rel in removed:
+                self._forget(rel)
+            for rel in changed:
+                if rel in changed_archived:
+                    continue
+                try:
+                    with open(os.path.join(self.memory_root, rel), 'r', errors='replace') as f:
+                        text = f.read()
+                except OSError:
+                    continue
+                mtime, size, _ = found[rel]
+                self._index_text(rel, text, mtime, size)
+            if changed_archived:
+                for rel, text in memory_archive.iter_texts(self.memory_root):
+                    if rel in changed_archived:
+                        mtime, size, _ = found[rel]
+                        self._index_text(rel, text, mtime, size, archived=True)
+            self._prune_entities()
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return len(changed), len(removed)
+
+    def rebuild(self):
+        """Drop everything and re-catalogue the tree from disk."""
+        self.conn.execute('BEGIN IMMEDIATE')
+        for table in ('files', 'entities', 'entity_keys', 'entity_grams',
+                      'meetings', 'attendees', 'interactions', 'meeting_topics', 'action_items'):
+            self.conn.execute(f'DELETE FROM {table}')
+        self.conn.execute('COMMIT')
+        return self.sync()
+
+    # -- queries ----------------------------------------------------------
+
+    def people(self, category=None, company=None, team=None, role=None, name=None,
+               met_since=None, not_met_since=None, sort='name', desc=False, limit=None, offset=0):
+        """
+        People matching the filters, with first/last met dates and meeting counts.
+
+        met_since / not_met_since are ISO dates: people last met on or after
+        it, or not met since it (including people never met).
+        Returns (total, rows).
+        """
+        where, params = ["e.type = 'person'"], []
+        if category:
+            where.append('e.category = ?')
+            params.append(category)
+        if company:
+            where.append('e.company = ? COLLATE NOCASE')
+            params.append(company)
+        if team:
+            where.append('e.team = ? COLLATE NOCASE')
+            params.append(team)
+        if role:
+            where.append("e.role LIKE '%' || ? || '%'")
+            params.append(role)
+        if name:
+            where.append("(e.name LIKE '%' || ? || '%' OR e.slug LIKE '%' || ? || '%' OR e.email LIKE ? || '%')")
+            params.extend([name, name, name])
+        if met_since:
+            where.append('act.last_met >= ?')
+            params.append(met_since)
+        if not_met_since:
+            where.append('(act.last_met IS NULL OR act.last_met < ?)')
+            params.append(not_met_since)
+
+        base = (
+            f"SELECT e.*, act.first_met, act.last_met, COALESCE(act.meetings, 0) AS meetings "
+            f"FROM entities e LEFT JOIN ({ACTIVITY_SQL}) act ON act.dir = e.dir "
+            f"WHERE {' AND '.join(where)}"
+        )
+        return self._page(base, params, PEOPLE_SORTS[sort], desc, limit, offset)
+
+    def meetings(self, since=None, until=None, attendee=None, title=None, topic=None,
+                 desc=True, limit=None, offset=0):
+        """
+        Meetings in a date range, optionally with a given attendee (email,
+        name or person slug), title substring or topic. Returns (total, rows).
+        """
+        where, params = ['1 = 1'], []
+        if since:
+            where.append('m.date >= ?')
+            params.append(since)
+        if until:
+            where.append('m.date <= ?')
+            params.append(until)
+        if title:
+            where.append("m.title LIKE '%' || ? || '%'")
+            params.append(title)
+        if topic:
+            where.append('m.path IN (SELECT meeting_path FROM meeting_topics WHERE topic = LOWER(?))')
+            params.append(topic)
+        if attendee:
+            where.append(
+                "EXISTS (SELECT 1 FROM attendees a LEFT JOIN entities p ON p.type = 'person' AND p.email = a.email "
+                "WHERE a.meeting_path = m.path AND (a.email = LOWER(?) OR a.name LIKE '%' || ? || '%' "
+                "OR p.slug = ? OR p.name LIKE '%' || ? || '%'))"
+            )
+            params.extend([attendee] * 4)
+
+        base = (
+            "SELECT m.*, (SELECT COUNT(*) FROM attendees a WHERE a.meeting_path = m.path) AS attendee_count "
+            f"FROM meetings m WHERE {' AND '.join(where)}"
+        )
+        return self._page(base, params, 'm.date', desc, limit, offset)
+
+    def topics(self, since=None, limit=None, offset=0):
+        """Topics by number of meetings tagged with them. Returns (total, rows)."""
+        where, params = '', []
+        if since:
+            where = 'WHERE m.date >= ?'
+            params.append(since)
+        base = (
+            'SELECT t.topic, COUNT(*) AS meetings, MAX(m.date) AS last_date '
+            f'FROM meeting_topics t JOIN meetings m ON m.path = t.meeting_path {where} GROUP BY t.topic'
+        )
+        return self._page(base, params, 'meetings', True, limit, offset)
+
+    def action_items(self, person_dir=None, status='open', overdue=False, due_by=None,
+                     since=None, until=None, today=None, limit=None, offset=0):
+        """
+        Action items, soonest due first (undated last), then newest.
+
+        person_dir limits them to items involving one person: assigned to
+        them (by slug, name or first name), in their interaction log or
+        action-items.md, or from a meeting they attended. status is 'open',
+        'done' or None for both; overdue means open with a due date before
+        today; due_by is an ISO date; since/until bound the item's meeting
+        or entry date. Returns (total, rows).
+        """
+        where, params = ['1 = 1'], []
+        if status:
+            where.append('a.status = ?')
+            params.append(status)
+        if overdue:
+            where.append("a.status = 'open' AND a.due != '' AND a.due < ?")
+            params.append(today or datetime.now().strftime('%Y-%m-%d'))
+        if due_by:
+            where.append("a.due != '' AND a.due <= ?")
+            params.append(due_by)
+        if since:
+            where.append('a.date >= ?')
+            params.append(since)
+        if until:
+            where.append("a.date != '' AND a.date <= ?")
+            params.append(until)
+        if person_dir:
+            where.append(
+                "(a.entity_dir = ? "
+                "OR a.path IN (SELECT at.meeting_path FROM attendees at JOIN entities p "
+                "              ON p.type = 'person' AND p.email != '' AND p.email = at.email WHERE p.dir = ?) "
+                "OR (a.owner_key != '' AND EXISTS (SELECT 1 FROM entities p WHERE p.dir = ? "
+                "    AND (p.slug = a.owner_key OR p.slug LIKE a.owner_key || '-%' "
+                "         OR LOWER(REPLACE(p.name, ' ', '-')) = a.owner_key))))"
+            )
+            params.extend([person_dir] * 3)
+
+        base = f"SELECT a.* FROM action_items a WHERE {' AND '.join(where)}"
+        total = self.conn.execute(f'SELECT COUNT(*) FROM ({base})', params).fetchone()[0]
+        sql = f"{base} ORDER BY a.due = '', a.due, a.date DESC, a.path, a.line"
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params = params + [limit, offset]
+        return total, [dict(row) for row in self.conn.execute(sql, params)]
+
+    def conversation(self, by='month', since=None, until=None, person_dir=None, limit=None, offset=0):
+        """
+        Conversation analytics of meetings with timings, aggregated by 'month'
+        or by 'person' (the people who attended), newest month / most
+        meetings first. Shares, monologues and rates are per-meeting
+        averages. person_dir limits it to meetings that person attended.
+        Returns (total, rows).
+        """
+        where, params = ['m.talk_share IS NOT NULL'], []
+        if since:
+            where.append('m.date >= ?')
+            params.append(since)
+        if until:
+            where.append('m.date <= ?')
+            params.append(until)
+        attended = (
+            "m.path IN (SELECT a.meeting_path FROM attendees a JOIN entities p "
+            "ON p.type = 'person' AND p.email != '' AND p.email = a.email WHERE p.dir = ?)"
+        )
+        if person_dir:
+            where.append(attended)
+            params.append(person_dir)
+
+        measures = (
+            "COUNT(DISTINCT m.path) AS meetings, "
+            "ROUND(AVG(m.talk_share), 2) AS talk_share, "
+            "ROUND(AVG(m.longest_monologue_seconds), 1) AS avg_longest_monologue_seconds, "
+            "MAX(m.longest_monologue_seconds) AS longest_monologue_seconds, "
+            "ROUND(AVG(m.silence_gaps), 1) AS silence_gaps, "
+            "ROUND(AVG(m.silence_seconds), 1) AS silence_seconds, "
+            "ROUND(AVG(m.segments_per_minute), 1) AS segments_per_minute, "
+            "MAX(m.date) AS last_date"
+        )
+        if by == 'person':
+            base = (
+                f"SELECT p.dir, p.name, {measures} FROM meetings m "
+                "JOIN attendees a ON a.meeting_path = m.path "
+                "JOIN entities p ON p.type = 'person' AND p.email != '' AND p.email = a.email "
+                f"WHERE {' AND '.join(where)} GROUP BY p.dir"
+            )
+            return self._page(base, params, 'meetings', True, limit, offset)
+        base = f"SELECT SUBSTR(m.date, 1, 7) AS month, {measures} FROM meetings m WHERE {' AND '.join(where)} GROUP BY month"
+        return self._page(base, params, 'month', True, limit, offset)
+
+    def _page(self, base, params, order, desc, limit, offset):
+        total = self.conn.execute(f'SELECT COUNT(*) FROM ({base})', params).fetchone()[0]
+        # NULLs last in both directions
+        sql = f"{base} ORDER BY ({order}) IS NULL, {order} {'DESC' if desc else 'ASC'}"
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params = params + [limit, offset]
+        return total, [dict(row) for row in self.conn.execute(sql, params)]
+
+    def entities(self, kind=None):
+        """Entities (optionally of one type), ordered by slug."""
+        if kind:
+            rows = self.conn.execute('SELECT * FROM entities WHERE type = ? ORDER BY slug', (kind,))
+        else:
+            rows = self.conn.execute('SELECT * FROM entities ORDER BY slug')
+        return [dict(row) for row in rows]
+
+    def fuzzy(self, query, limit=10):
+        """
+        Entities ranked by trigram overlap with query.
+
+        score is the fraction of the query's trigrams the entity has (so
+        "sara" scores 0.75 against "sarah-chen" and "sarha chen" 0.67); ties
+        go to the closer overall match (Jaccard). Only the query's posting
+        lists are read.
+        """
+        grams = sorted(trigrams(query))
+        if not grams:
+            return []
+        min_shared = max(1, math.ceil(len(grams) * FUZZY_MIN_SCORE))
+        rows = self.conn.execute(
+            f"SELECT e.*, CAST(hits.shared AS REAL) / ? AS score, "
+            f"CAST(hits.shared AS REAL) / (? + k.grams - hits.shared) AS closeness "
+            f"FROM (SELECT key_id, COUNT(*) AS shared FROM entity_grams "
+            f"      WHERE gram IN ({','.join('?' * len(grams))}) "
+            f"      GROUP BY key_id HAVING shared >= ? ORDER BY shared DESC LIMIT ?) hits "
+            f"JOIN entity_keys k ON k.id = hits.key_id "
+            f"JOIN entities e ON e.dir = k.dir "
+            f"ORDER BY score DESC, closeness DESC, e.dir LIMIT ?",
+            [len(grams), len(grams)] + grams + [min_shared, FUZZY_CANDIDATES, limit],
+        )
+        return [dict(row) for row in rows]
+
+    def find_entities(self, name):
+        """
+        Entities for /mem-view.
+
+        An exact slug, display name or email match wins; otherwise the
+        fuzzy candidates, narrowed to the best one when it is a clear
+        winner. More than one result means the lookup is ambiguous.
+        """
+        normalized = name.lower().strip().replace(' ', '-')
+        rows = self.conn.execute(
+            'SELECT * FROM entities WHERE slug = ? OR name = ? COLLATE NOCASE OR email = ? ORDER BY dir',
+            (normalized, name.strip(), name.lower().strip()),
+        ).fetchall()
+        if rows:
+            return [dict(row) for row in rows]
+
+        candidates = self.fuzzy(name)
+        if candidates:
+            best = candidates[0]
+            runner_up = candidates[1]['score'] if len(candidates) > 1 else 0.0
+            if best['score'] >= FUZZY_ACCEPT and best['score'] - runner_up >= FUZZY_MARGIN:
+                return [best]
+        return candidates
+
+    def activity(self, entity_dir):
+        """(first_met, last_met, meetings) for one person."""
+        row = self.conn.execute(f'SELECT * FROM ({ACTIVITY_SQL}) WHERE dir = ?', (entity_dir,)).fetchone()
+        return (row['first_met'], row['last_met'], row['meetings']) if row else (None, None, 0)
+
+    def meetings_with(self, entity_dir, limit=5):
+        """Most recent catalogued meetings a person attended."""
+        rows = self.conn.execute(
+            "SELECT m.* FROM meetings m JOIN attendees a ON a.meeting_path = m.path "
+            "JOIN entities p ON p.email != '' AND p.email = a.email "
+            "WHERE p.dir = ? ORDER BY m.date DESC LIMIT ?",
+            (entity_dir, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def entity(self, entity_dir):
+        """One entity's catalog row ({'dir': entity_dir} if it isn't catalogued)."""
+        row = self.conn.execute('SELECT * FROM entities WHERE dir = ?', (entity_dir,)).fetchone()
+        return dict(row) if row else {'dir': entity_dir}
+
+    def person_by_email(self, email):
+        """The person whose profile has this email, or None."""
+        row = self.conn.execute(
+            "SELECT * FROM entities WHERE type = 'person' AND email = ? ORDER BY dir LIMIT 1", (email.lower(),)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def last_interaction(self, entity_dir):
+        """(date, title) of a person's latest interaction entry or attended meeting, or None."""
+        row = self.conn.execute(
+            "SELECT day, title FROM ("
+            "    SELECT date AS day, title FROM interactions WHERE entity_dir = ?"
+            "    UNION ALL"
+            "    SELECT m.date, m.title FROM meetings m JOIN attendees a ON a.meeting_path = m.path"
+            "    JOIN entities p ON p.email != '' AND p.email = a.email WHERE p.dir = ?"
+            ") ORDER BY day DESC LIMIT 1",
+            (entity_dir, entity_dir),
+        ).fetchone()
+        return (row['day'], row['title']) if row else None
+
+    def recent_topics(self, entity_dir, limit=5):
+        """Topics of the meetings a person attended, most recently discussed first."""
+        rows = self.conn.execute(
+            "SELECT t.topic, MAX(m.date) AS last_date, COUNT(*) AS meetings "
+            "FROM meeting_topics t JOIN meetings m ON m.path = t.meeting_path "
+            "JOIN attendees a ON a.meeting_path = m.path "
+            "JOIN entities p ON p.email != '' AND p.email = a.email "
+            "WHERE p.dir = ? GROUP BY t.topic ORDER BY last_date DESC, meetings DESC, t.topic LIMIT ?",
+            (entity_dir, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def attendee_dirs(self, meeting_path):
+        """Person folders of a catalogued meeting's attendees."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT p.dir FROM attendees a JOIN entities p ON p.type = 'person' AND p.email = a.email "
+            "WHERE a.meeting_path = ? AND a.email != ''",
+            (meeting_path,),
+        )
+        return [row['dir'] for row in rows]
+
+    def export_rows(self):
+        """
+        Every meeting, attendee and interaction row with the path, mtime and
+        size of the file it came from (in file order), for export-memory.py.
+        Returns {table: [row dict]}.
+        """
+        person_of = "(SELECT {col} FROM entities p WHERE p.type = 'person' AND p.email = a.email ORDER BY p.dir LIMIT 1)"
+        queries = {
+            'meetings': (
+                "SELECT m.path AS source, f.mtime, f.size, m.* FROM meetings m "
+                "JOIN files f ON f.path = m.path ORDER BY m.path"
+            ),
+            'attendees': (
+                "SELECT a.meeting_path AS source, f.mtime, f.size, a.meeting_path, m.date, a.email, a.name, "
+                f"COALESCE({person_of.format(col='category')}, '') AS category, "
+                f"COALESCE({person_of.format(col='dir')}, '') AS person_dir "
+                "FROM attendees a JOIN meetings m ON m.path = a.meeting_path JOIN files f ON f.path = a.meeting_path "
+                "ORDER BY a.meeting_path, a.rowid"
+            ),
+            'interactions': (
+                "SELECT i.path AS source, f.mtime, f.size, i.path, i.entity_dir, COALESCE(e.category, '') AS category, "
+                "i.date, i.title FROM interactions i JOIN files f ON f.path = i.path "
+                "LEFT JOIN entities e ON e.dir = i.entity_dir ORDER BY i.path, i.rowid"
+            ),
+        }
+        return {table: [dict(row) for row in self.conn.execute(sql)] for table, sql in queries.items()}
+
+    def count_files(self, prefix):
+        """Catalogued files (live or archived) under a root-relative prefix."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM files WHERE path >= ? AND path < ?", (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        ).fetchone()[0]
+
+def open_catalog(memory_root, refresh=True):
+    """Open the catalog, building it on first use and syncing it if refresh is set."""
+    catalog = Catalog(memory_root)
+    if refresh or catalog.is_empty():
+        catalog.sync()
+    return catalog
@@ -0,0 +1,87 @@
+"""
+Skill configuration and naming rules shared by every script.
+
+Each entry point used to carry its own copy of get_memory_root() (and
+log-meeting-to-memory.py / smart-meeting-sync.py their own slugify()),
+re-reading the config file whenever asked. The daemons spawn these scripts
+for every meeting, so this module keeps the lookups in one place and
+parses memory-management.local.md at most once per process.
+
+Every lookup takes an optional config file, so one process (the
+multi-root mode of watch-granola.py) can serve several memory roots, each
+with its own user identity (attendees at user_domain are "internal", and
+their profiles say they work at org_name):
+
+    memory_root: /Users/alice/Documents/WorkMemory
+    user_email: alice@guild.com
+    user_domain: guild.com
+    org_name: "Guild"
+
+Only the standard library is imported here; it is on every script's
+startup path.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+CONFIG_FILE = os.path.expanduser("~/.claude/skills/memory-management/memory-management.local.md")
+DEFAULT_MEMORY_ROOT = os.path.expanduser("~/Documents/WorkMemory")
+DEFAULT_RETENTION_DAYS = 365
+GRANOLA_CACHE = os.path.expanduser("~/Library/Application Support/Granola/cache-v3.json")
+DEFAULT_USER_EMAIL = 'tony.kipkemboi@guild.com'
+DEFAULT_ORG_NAME = 'Guild'
+
+FIELD_RE = re.compile(r'^(\w+):[ \t]*(.*?)\s*$', re.MULTILINE)
+
+@lru_cache(maxsize=None)
+def load_config(config_file=CONFIG_FILE):
+    """Top-level `key: value` fields of a skill config ({} if it doesn't exist)."""
+    try:
+        with open(config_file, 'r') as f:
+            content = f.read()
+    except OSError:
+        return {}
+    return {key: value for key, value in FIELD_RE.findall(content) if value}
+
+def get_memory_root(config_file=CONFIG_FILE):
+    return load_config(config_file).get('memory_root') or DEFAULT_MEMORY_ROOT
+
+def get_retention_days(config_file=CONFIG_FILE):
+    value = load_config(config_file).get('retention_days', '')
+    return int(value) if value.isdigit() else DEFAULT_RETENTION_DAYS
+
+def get_memory_budget_mb(config_file=CONFIG_FILE):
+    """Memory ceiling for processing the Granola cache (None: no ceiling, see memory_budget.py)."""
+    value = load_config(config_file).get('memory_budget_mb', '')
+    return int(value) if value.isdigit() and int(value) > 0 else None
+
+def get_user_email(config_file=CONFIG_FILE):
+    """The memory owner's email: skipped as an attendee, never given a profile."""
+    return load_config(config_file).get('user_email') or DEFAULT_USER_EMAIL
+
+def get_user_domain(config_file=CONFIG_FILE):
+    """Email domain of internal colleagues (default: the owner's own domain)."""
+    return load_config(config_file).get('user_domain') or get_user_email(config_file).split('@')[-1]
+
+def get_org_name(config_file=CONFIG_FILE):
+    """The organization internal colleagues work at (the company on their profiles)."""
+    return load_config(config_file).get('org_name', '').strip('"\'') or DEFAULT_ORG_NAME
+
+def root_settings(config_file=CONFIG_FILE):
+    """Memory root and user identity from one skill config."""
+    return {
+        'config_file': config_file,
+        'memory_root': get_memory_root(config_file),
+        'user_email': get_user_email(config_file),
+        'user_domain': get_user_domain(config_file),
+        'org_name': get_org_name(config_file),
+    }
+
+def slugify(text):
+    """Convert text to filename-safe slug."""
+    text = text.lower()
+    text = re.sub(r'[^\w\s-]', '', text)
+    text = re.sub(r'[\s_]+', '-', text)
+    text = re.sub(r'-+', '-', text)
+    return text.strip('-')[:50]
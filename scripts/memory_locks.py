@@ -0,0 +1,90 @@
+"""
+Striped advisory file locks and idempotent appends for the memory tree.
+
+watch-granola.py, smart-meeting-sync.py --daemon and manual
+log-meeting-to-memory.py runs can all sync the same meeting at once, and
+the interaction and activity logs used to be appended blindly: a meeting
+synced twice (or re-synced under a new title after being renamed in
+Granola) got duplicate entries, and two writers that both found a month's
+log missing both wrote its header. Appending writers now:
+
+- lock the file. Locks are striped: a root-relative path hashes to one of
+  STRIPES lock files in MEMORY_ROOT/config/locks/, so the lock directory
+  stays the same size however large the tree grows while writers to
+  different files rarely wait on each other. flock() locks are advisory
+  (readers never wait) and released by the kernel if the writer dies.
+- append an entry only if its idempotency key (memory_templates.entry_key:
+  Granola doc ID plus person) isn't in the file yet, checked under the lock,
+  nor in the archived copy if the month was compacted (memory_archive.py).
+
+Locks are not reentrant: a writer holds one stripe at a time. Work that
+spans many files (compacting a month, memory_archive.compact_month) takes
+all of their stripes with files_lock(), in stripe order, so it can't
+deadlock against another such holder.
+"""
+
+import fcntl
+import os
+import zlib
+from contextlib import ExitStack, contextmanager
+
+from memory_archive import read_member
+from memory_templates import key_line
+
+LOCK_DIR = os.path.join('config', 'locks')
+STRIPES = 64
+
+def stripe(memory_root, path):
+    """Which lock stripe guards path."""
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(memory_root)).replace(os.sep, '/')
+    return zlib.crc32(rel.encode('utf-8')) % STRIPES
+
+@contextmanager
+def _stripe_lock(memory_root, n):
+    lock_dir = os.path.join(memory_root, LOCK_DIR)
+    os.makedirs(lock_dir, exist_ok=True)
+    with open(os.path.join(lock_dir, f"{n:02d}.lock"), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def file_lock(memory_root, path):
+    """Exclusive lock on path's stripe, for the read-check-append of one file."""
+    return _stripe_lock(memory_root, stripe(memory_root, path))
+
+@contextmanager
+def files_lock(memory_root, paths):
+    """Exclusive locks on every stripe guarding paths (each once, in stripe order)."""
+    with ExitStack() as stack:
+        for n in sorted({stripe(memory_root, path) for path in paths}):
+            stack.enter_context(_stripe_lock(memory_root, n))
+        yield
+
+def append_once(memory_root, path, header, entry, key):
+    """
+    Append entry to path unless an entry with this key is already there,
+    starting a missing file with header. Entries written before keys
+    existed are recognised by their exact text. In an archived month the
+    archived copy counts too: the entry is only written (to a new loose
+    file, merged in at the next compaction) if neither has it. Returns
+    whether it appended.
+    """
+    marker = key_line(key)
+    legacy = entry.replace(marker, '')
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(memory_root)).replace(os.sep, '/')
+    with file_lock(memory_root, path):
+        try:
+            with open(path, 'r') as f:
+                text = f.read()
+        except FileNotFoundError:
+            text = None
+        for seen in (text, read_member(memory_root, rel)):
+            if seen is not None and (marker in seen or legacy in seen):
+                return False
+        with open(path, 'a') as f:
+            if text is None:
+                f.write(header)
+            f.write(entry)
+    return True
@@ -0,0 +1,493 @@
+"""
+Regenerate the files log-meeting-to-memory.py derives from Granola.
+
+create_meeting_file() never touches a file that exists and the interaction
+and activity logs are append-only, so a template change (memory_templates.py)
+or a fix to transcript merging, split detection or identity resolution only
+reached meetings logged afterwards. rebuild() re-renders every meeting file,
+interaction entry and activity log entry Granola still has the source for:
+
+1. Stage: MEMORY_ROOT is copied to MEMORY_ROOT.rebuild-staging as hard
+   links, so staging costs one link per file, not a copy.
+2. Render: one task per month on a process pool. A month owns
+   meetings/YYYY-MM/, logs/YYYY-MM.md and every person's
+   interactions/YYYY-MM.md, so no two tasks write the same file. A
+   re-rendered file replaces its link in the staging tree (write, then
+   rename), which leaves the live file untouched.
+3. Swap: MEMORY_ROOT is renamed to MEMORY_ROOT.rebuild-previous and the
+   staging tree renamed into its place, then the previous tree is removed.
+   Files written to the live tree while rebuilding block the swap.
+
+What a person wrote survives a rebuild: meeting sections other than Notes
+and Transcript Preview whose body isn't a template placeholder, sections the
+template doesn't have, the outcome and topics fields, and every interaction
+or log entry that wasn't generated for a meeting being regenerated.
+Meetings keep the projects and teams they were linked to; meetings never
+linked (logged before project_linker.py) are linked, and the linked
+projects' and teams' activity logs regenerated like interaction logs.
+Profiles are only created where missing. Meetings Granola no longer has,
+and archived months (memory_archive.py), are left as they are.
+"""
+
+import math
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import granola_meetings
+from granola_segments import as_segment_table, format_epoch
+from identity_index import IdentityIndex, build_identity_index
+from memory_archive import archived_months
+from memory_catalog import INTERACTION_RE, parse_topics
+from memory_config import GRANOLA_CACHE, get_org_name
+from memory_templates import (
+    DEFAULT_OUTCOME, ENTRY_KEY_RE, GENERATED_SECTIONS, PLACEHOLDER_BODIES, meeting_date, meeting_rel_path,
+    person_folder, render_activity_entry, render_interaction_entry, render_log_entry, render_meeting,
+    render_profile,
+)
+from memory_tree import FRONTMATTER_RE, parse_frontmatter, parse_list
+from project_linker import activity_path, link_meetings, linked_dirs, load_linker
+
+STAGING_SUFFIX = '.rebuild-staging'
+PREVIOUS_SUFFIX = '.rebuild-previous'
+TMP_SUFFIX = '.rebuild-tmp'
+
+SECTION_RE = re.compile(r'^## (.+)$', re.MULTILINE)
+LOG_ENTRY_RE = re.compile(r'^###\s+(\d{4}-\d{2}-\d{2})\s*-\s*Meeting:\s*(.*)$', re.MULTILINE)
+DOC_ID_RE = re.compile(r'^granola_doc_id:[ \t]*(\S+)', re.MULTILINE)
+
+# Lines only the templates write: entries carrying them are regenerated
+GENERATED_INTERACTION = '*[See meeting log for details]*'
+GENERATED_LOG_ENTRY = '- Source: Granola'
+GENERATED_ACTIVITY = '*[Linked from the meeting transcript]*'
+
+# Directories a rebuild neither checks for concurrent writes nor needs to
+# protect: derived state, refreshed after the swap
+UNCHECKED_DIRS = ('config',)
+
+# -- staging ----------------------------------------------------------------
+
+def staging_paths(memory_root):
+    root = os.path.abspath(memory_root).rstrip(os.sep)
+    return root + STAGING_SUFFIX, root + PREVIOUS_SUFFIX
+
+def stage_tree(memory_root, staging):
+    """Hard-link copy of memory_root at staging (symlinks copied as links). Returns the file count."""
+    if os.path.lexists(staging):
+        shutil.rmtree(staging)
+    count = 0
+    for dirpath, dirnames, filenames in os.walk(memory_root):
+        rel = os.path.relpath(dirpath, memory_root)
+        target = staging if rel == '.' else os.path.join(staging, rel)
+        os.makedirs(target, exist_ok=True)
+        for name in list(dirnames):
+            if os.path.islink(os.path.join(dirpath, name)):
+                dirnames.remove(name)
+                filenames.append(name)
+        for name in filenames:
+            src = os.path.join(dirpath, name)
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), os.path.join(target, name))
+            else:
+                os.link(src, os.path.join(target, name))
+            count += 1
+    return count
+
+def live_changes(memory_root, staging, since, written):
+    """Root-relative files the live tree gained or changed after `since` that staging would lose."""
+    conflicts = []
+    for dirpath, dirnames, filenames in os.walk(memory_root):
+        rel_dir = os.path.relpath(dirpath, memory_root)
+        if rel_dir == '.':
+            dirnames[:] = [d for d in dirnames if d not in UNCHECKED_DIRS]
+        for name in filenames:
+            rel = os.path.normpath(os.path.join(rel_dir, name)).replace(os.sep, '/')
+            try:
+                if os.lstat(os.path.join(dirpath, name)).st_mtime <= since:
+                    continue
+            except OSError:
+                continue
+            # An in-place append to a file staging still links reaches both
+            # trees; a new file, or one staging replaced, does not
+            if rel in written or not os.path.lexists(os.path.join(staging, rel)):
+                conflicts.append(rel)
+    return sorted(conflicts)
+
+def swap_trees(memory_root, staging, previous, keep_previous=False):
+    """Move the staging tree into memory_root's place."""
+    root = os.path.abspath(memory_root).rstrip(os.sep)
+    if os.path.lexists(previous):
+        shutil.rmtree(previous)
+    os.rename(root, previous)
+    try:
+        os.rename(staging, root)
+    except OSError:
+        os.rename(previous, root)
+        raise
+    if not keep_previous:
+        shutil.rmtree(previous, ignore_errors=True)
+
+# -- planning ---------------------------------------------------------------
+
+def plan_months(data, since=None, until=None, skip=()):
+    """
+    {month: [main doc ID]} for every Granola meeting with a transcript.
+
+    A meeting's month is that of its first segment across continuations
+    (the start_time build_meeting() gives it). Returns (months, splits).
+    """
+    documents, transcripts = data['documents'], data['transcripts']
+    splits = granola_meetings.detect_split_meetings(documents, transcripts)
+    continuations = {cont_id for cont_ids in splits.values() for cont_id in cont_ids}
+
+    months = {}
+    for doc_id, doc in documents.items():
+        if not isinstance(doc, dict) or doc_id in continuations:
+            continue
+        starts = [
+            as_segment_table(transcripts[d]).first_start
+            for d in [doc_id] + splits.get(doc_id, []) if transcripts.get(d)
+        ]
+        starts = [s for s in starts if not math.isnan(s)]
+        if not starts:
+            continue
+        month = format_epoch(min(starts))[:7]
+        if month in skip or (since and month < since) or (until and month > until):
+            continue
+        months.setdefault(month, []).append(doc_id)
+    return months, splits
+
+# -- merging ----------------------------------------------------------------
+
+def split_sections(text):
+    """(text before the first '## ' heading, [(heading, body)])."""
+    matches = list(SECTION_RE.finditer(text))
+    if not matches:
+        return text, []
+    sections = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections.append((match.group(1).strip(), text[match.end():end]))
+    return text[:matches[0].start()], sections
+
+def is_placeholder(heading, body):
+    return body.strip() in PLACEHOLDER_BODIES.get(heading, ())
+
+def _section_body(body):
+    """A body moved from another file, spaced the way the template spaces sections."""
+    return '\n\n' + body.strip('\n') + '\n\n'
+
+def merge_meeting(new_text, old_text):
+    """
+    The freshly rendered meeting with the old file's human-written sections.
+
+    Returns (text, sections kept). Sections only the old file has go just
+    before the generated ones.
+    """
+    head, new_sections = split_sections(new_text)
+    _, old_sections = split_sections(old_text)
+    old = dict(old_sections)
+    template_headings = {heading for heading, _ in new_sections}
+
+    kept = 0
+    merged = []
+    for heading, body in new_sections:
+        old_body = old.get(heading)
+        if (old_body is not None and heading not in GENERATED_SECTIONS
+                and old_body.strip() != body.strip() and not is_placeholder(heading, old_body)):
+            body = _section_body(old_body)
+            kept += 1
+        merged.append((heading, body))
+
+    extra = [(heading, _section_body(body)) for heading, body in old_sections if heading not in template_headings]
+    if extra:
+        kept += len(extra)
+        at = next((i for i, (heading, _) in enumerate(merged) if heading in GENERATED_SECTIONS), len(merged))
+        merged[at:at] = extra
+
+    text = head + ''.join(f"## {heading}{body}" for heading, body in merged)
+    return text.rstrip('\n') + '\n', kept
+
+def split_entries(text, entry_re):
+    """(preamble, [(date, title, entry text)]) for an interaction or activity log."""
+    matches = list(entry_re.finditer(text))
+    if not matches:
+        return text, []
+    entries = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        entries.append((match.group(1), match.group(2).strip(), text[match.start():end]))
+    return text[:matches[0].start()], entries
+
+def merge_log(old_text, header, entry_re, marker, regenerated):
+    """
+    A month's log with its generated entries for the regenerated meetings replaced.
+
+    regenerated is [(date, title, entry text)]. Entries are kept in date
+    order; same-day entries keep the order they had.
+    """
+    if old_text is None:
+        preamble, entries = header, []
+    else:
+        preamble, entries = split_entries(old_text, entry_re)
+    replaced = {(day, title) for day, title, _ in regenerated}
+    # Keyed entries also match by key, so a meeting renamed since it was logged keeps one entry
+    replaced_keys = {key for _, _, text in regenerated for key in ENTRY_KEY_RE.findall(text)}
+
+    def is_replaced(entry):
+        day, title, text = entry
+        return marker in text and ((day, title) in replaced
+                                   or not replaced_keys.isdisjoint(ENTRY_KEY_RE.findall(text)))
+
+    kept = [e for e in entries if not is_replaced(e)]
+    combined = sorted(kept + list(regenerated), key=lambda e: e[0])
+    return preamble.rstrip('\n') + '\n\n' + ''.join(f"\n{e[2].strip(chr(10))}\n" for e in combined)
+
+# -- per-month rendering (runs in the pool) ---------------------------------
+
+_worker = {}
+
+def _init_worker(settings):
+    """Pool initializer: the Granola snapshot comes with fork, or is loaded once per process."""
+    _worker.update(settings)
+    _worker['identities'] = IdentityIndex.from_dict(settings['identities'])
+    if 'data' not in _worker:
+        _worker['data'] = granola_meetings.load_granola_data()
+
+def _read(root, rel):
+    try:
+        with open(os.path.join(root, rel), 'r') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _write(staging, rel, text):
+    path = os.path.join(staging, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + TMP_SUFFIX
+    with open(tmp, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def _linker(memory_root):
+    """The project/team matcher, compiled once per worker."""
+    if 'linker' not in _worker:
+        _worker['linker'] = load_linker(memory_root)
+    return _worker['linker']
+
+def existing_meetings(memory_root, month):
+    """{granola_doc_id: root-relative path} for a month's meeting files."""
+    month_dir = os.path.join(memory_root, 'meetings', month)
+    found = {}
+    if not os.path.isdir(month_dir):
+        return found
+    for name in sorted(os.listdir(month_dir)):
+        if not name.endswith('.md'):
+            continue
+        text = _read(month_dir, name) or ''
+        match = FRONTMATTER_RE.match(text)
+        doc_id = DOC_ID_RE.search(match.group(1)) if match else None
+        if doc_id:
+            found.setdefault(doc_id.group(1), f"meetings/{month}/{name}")
+    return found
+
+def rebuild_month(month, doc_ids):
+    """Render one month into the staging tree. Returns (month, stats, root-relative paths written)."""
+    data = _worker['data']
+    root, staging = _worker['memory_root'], _worker['staging']
+    user_email, user_domain, org_name = _worker['user_email'], _worker['user_domain'], _worker['org_name']
+    stats = {'meetings': 0, 'meetings_written': 0, 'sections_kept': 0,
+             'interaction_files': 0, 'log_files': 0, 'activity_files': 0, 'profiles_created': 0}
+    written = []
+
+    meetings = []
+    for doc_id in doc_ids:
+        meeting = granola_meetings.build_meeting(
+            doc_id, data['documents'][doc_id], data['transcripts'], _worker['splits'], _worker['identities']
+        )
+        if meeting.get('has_transcript') and meeting.get('transcript_text'):
+            meetings.append(meeting)
+    meetings.sort(key=lambda m: m.get('start_time', ''))
+    stats['meetings'] = len(meetings)
+
+    existing = existing_meetings(root, month)
+    rendered = []
+    for meeting in meetings:
+        date_str = meeting_date(meeting, f"{month}-01")
+        rel = existing.get(meeting['doc_id']) or meeting_rel_path(meeting, date_str)
+        rendered.append((meeting, date_str, rel, _read(root, rel)))
+
+    # Topics are kept from the existing file; only new meetings are tagged
+    untagged = [m for m, _, _, old in rendered if old is None]
+    if untagged:
+        from topic_tagger import tag_meetings
+        try:
+            tag_meetings(untagged, root)
+        except (OSError, ValueError):
+            pass
+
+    interactions = {}
+    activity = {}
+    log_entries = []
+    profiles = set()
+    for meeting, date_str, rel, old in rendered:
+        outcome = DEFAULT_OUTCOME
+        if old is not None:
+            match = FRONTMATTER_RE.match(old)
+            header = match.group(1) if match else ''
+            outcome = parse_frontmatter(old).get('outcome') or DEFAULT_OUTCOME
+            meeting['topics'] = parse_topics(header)
+            meeting['projects'] = parse_list(header, 'projects')
+            meeting['teams'] = parse_list(header, 'teams')
+        # Links are kept like topics; new meetings, and ones logged before
+        # meetings were linked, are matched now
+        if meeting.get('projects') is None and meeting.get('teams') is None:
+            link_meetings([meeting], root, _linker(root))
+        text = render_meeting(meeting, date_str, outcome)
+        if old is not None:
+            text, kept = merge_meeting(text, old)
+            stats['sections_kept'] += kept
+        if text != old:
+            _write(staging, rel, text)
+            written.append(rel)
+            stats['meetings_written'] += 1
+
+        entry_key = (date_str, meeting.get('title', 'Untitled Meeting'))
+        for att in meeting.get('attendees', []):
+            person = person_folder(att, user_email, user_domain, org_name)
+            if person is None:
+                continue
+            person_dir = f"people/{person['type']}/{person['slug']}"
+            profile = f"{person_dir}/profile.md"
+            if profile not in profiles and not os.path.exists(os.path.join(root, profile)):
+                _write(staging, profile, render_profile(person, date_str))
+                written.append(profile)
+                stats['profiles_created'] += 1
+            profiles.add(profile)
+            interactions.setdefault(f"{person_dir}/interactions/{month}.md", []).append(
+                entry_key + (render_interaction_entry(meeting, date_str, person['slug']),)
+            )
+        log_entries.append(entry_key + (render_log_entry(meeting, date_str),))
+        for edir in linked_dirs(meeting):
+            activity.setdefault(activity_path(edir, month), []).append(
+                entry_key + (render_activity_entry(meeting, date_str, rel),)
+            )
+
+    for rel, entries in sorted(interactions.items()):
+        old = _read(root, rel)
+        text = merge_log(old, f"# Interactions - {month}\n\n", INTERACTION_RE, GENERATED_INTERACTION, entries)
+        if text != old:
+            _write(staging, rel, text)
+            written.append(rel)
+            stats['interaction_files'] += 1
+
+    for rel, entries in sorted(activity.items()):
+        old = _read(root, rel)
+        text = merge_log(old, f"# Activity - {month}\n\n", INTERACTION_RE, GENERATED_ACTIVITY, entries)
+        if text != old:
+            _write(staging, rel, text)
+            written.append(rel)
+            stats['activity_files'] += 1
+
+    if log_entries:
+        rel = f"logs/{month}.md"
+        old = _read(root, rel)
+        text = merge_log(old, f"# Activity Log - {month}\n\n", LOG_ENTRY_RE, GENERATED_LOG_ENTRY, log_entries)
+        if text != old:
+            _write(staging, rel, text)
+            written.append(rel)
+            stats['log_files'] += 1
+
+    return month, stats, written
+
+# -- rebuild ----------------------------------------------------------------
+
+def rebuild(memory_root, user_email, user_domain, org_name=None, workers=None, since=None, until=None,
+            swap=True, keep_previous=False, force=False, log=print):
+    """
+    Regenerate every month Granola has meetings for (within since/until, YYYY-MM).
+
+    org_name (default: the skill config's) is the company on new internal
+    profiles.
+
+    Returns {'months', 'stats', 'written', 'conflicts', 'swapped', 'timings'}.
+    With swap=False, or when the live tree changed underneath the rebuild
+    (and force isn't set), the result stays in MEMORY_ROOT.rebuild-staging.
+    """
+    memory_root = os.path.abspath(memory_root)
+    staging, previous = staging_paths(memory_root)
+    timings = {}
+    started = time.time()
+
+    t = time.perf_counter()
+    data = granola_meetings.load_granola_data()
+    identities = build_identity_index(data, memory_root, GRANOLA_CACHE)
+    months, splits = plan_months(data, since, until, skip=set(archived_months(memory_root)))
+    timings['load'] = time.perf_counter() - t
+    log(f"Planned {sum(len(ids) for ids in months.values())} meeting(s) in {len(months)} month(s)")
+
+    t = time.perf_counter()
+    linked = stage_tree(memory_root, staging)
+    timings['stage'] = time.perf_counter() - t
+    log(f"Staged {linked} file(s) at {staging}")
+
+    settings = {
+        'memory_root': memory_root, 'staging': staging, 'splits': splits,
+        'identities': identities.to_dict(), 'user_email': user_email, 'user_domain': user_domain,
+        'org_name': org_name or get_org_name(),
+    }
+    # Largest months first, so one big month doesn't finish last on its own
+    order = sorted(months, key=lambda m: len(months[m]), reverse=True)
+
+    t = time.perf_counter()
+    # Set before the pool forks, so workers inherit the snapshot instead of re-reading it
+    _worker['data'] = data
+    if workers == 1 or len(order) <= 1:
+        _init_worker(settings)
+        results = [rebuild_month(month, months[month]) for month in order]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(settings,)) as pool:
+            results = list(pool.map(rebuild_month, order, [months[m] for m in order]))
+    timings['render'] = time.perf_counter() - t
+
+    stats = {}
+    written = []
+    for _, month_stats, month_written in sorted(results):
+        for key, value in month_stats.items():
+            stats[key] = stats.get(key, 0) + value
+        written.extend(month_written)
+
+    result = {'months': sorted(months), 'stats': stats, 'written': written,
+              'conflicts': [], 'swapped': False, 'timings': timings}
+    if not swap:
+        return result
+
+    t = time.perf_counter()
+    result['conflicts'] = live_changes(memory_root, staging, started, set(written))
+    if result['conflicts'] and not force:
+        timings['swap'] = time.perf_counter() - t
+        return result
+    swap_trees(memory_root, staging, previous, keep_previous)
+    result['swapped'] = True
+    timings['swap'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    refresh_indexes(memory_root, written, log)
+    timings['index'] = time.perf_counter() - t
+    return result
+
+def refresh_indexes(memory_root, written, log=print):
+    """Bring the catalog and the related-meetings index up to date with the rewritten files."""
+    import sqlite3
+    import related_index
+    from memory_catalog import open_catalog
+    try:
+        open_catalog(memory_root).close()
+    except sqlite3.Error as e:
+        log(f"  Warning: could not sync catalog: {e}")
+    try:
+        related_index.update_index(memory_root, written)
+    except (OSError, ValueError) as e:
+        log(f"  Warning: could not update related-meetings index: {e}")
@@ -0,0 +1,182 @@
+"""
+Parallel regex scan of the memory tree for ad-hoc searches.
+
+Queries a token index can't answer (regexes, case-sensitive text, code
+snippets) went to `grep -r` and a per-line bash loop in /mem-search: one
+pipe, one core. scan() instead:
+
+- lists the live markdown files, never descending into config/ or
+  .archive/, and drops monthly files (memory_archive.month_of) outside
+  since/until; files that aren't monthly (profiles, overviews) are kept,
+- groups them by entity (a person's profile and interaction logs, a
+  month of meetings, ...) and packs whole groups into chunks of similar
+  size,
+- scans the chunks on a process pool (the re module holds the GIL, so
+  threads would share one core). Each file is mmapped and the compiled
+  bytes pattern runs over the whole mapping; only matching lines are
+  decoded,
+- yields each entity's matches as soon as its chunk and every chunk
+  before it are done, so output streams in path order.
+
+Archived months in range are searched too, one pool task per month.
+Patterns match line by line as grep does: a match is reported on the line
+it starts on, once per line. Case-insensitive patterns with non-ASCII
+letters are matched on decoded text, since bytes patterns only fold ASCII.
+"""
+
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import memory_archive
+from memory_tree import SKIP_DIRS, entity_of
+
+CHUNKS_PER_WORKER = 4
+# Below this much text a pool costs more than it saves
+MIN_PARALLEL_BYTES = 4 * 1024 * 1024
+
+def compile_pattern(pattern, ignore_case=True, fixed=False):
+    """(regex, on_bytes) for a search; raises re.error for an invalid pattern."""
+    text = re.escape(pattern) if fixed else pattern
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    on_bytes = text.isascii() or not ignore_case
+    return re.compile(text.encode('utf-8') if on_bytes else text, flags), on_bytes
+
+def group_key(rel_path):
+    """The entity folder a file belongs to, else its directory (or the file, at the root)."""
+    _, edir = entity_of(rel_path)
+    return edir or os.path.dirname(rel_path) or rel_path
+
+def list_files(memory_root, since=None, until=None):
+    """[(rel_path, size)] of live markdown files in range, in path order."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(memory_root):
+        if dirpath == memory_root:
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            if not name.endswith('.md'):
+                continue
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, memory_root).replace(os.sep, '/')
+            month = memory_archive.month_of(rel)
+            if month and ((since and month < since) or (until and month > until)):
+                continue
+            try:
+                files.append((rel, os.path.getsize(full)))
+            except OSError:
+                continue
+    return sorted(files)
+
+def plan_chunks(files, chunks):
+    """Pack files into about `chunks` lists of similar total size, never splitting an entity."""
+    groups = {}
+    for rel, size in files:
+        groups.setdefault(group_key(rel), []).append((rel, size))
+    target = max(1, sum(size for _, size in files) // max(1, chunks))
+    planned, current, current_size = [], [], 0
+    for key in sorted(groups):
+        members = groups[key]
+        current.extend(rel for rel, _ in members)
+        current_size += sum(size for _, size in members)
+        if current_size >= target:
+            planned.append(current)
+            current, current_size = [], 0
+    if current:
+        planned.append(current)
+    return planned
+
+def scan_buffer(buf, regex):
+    """[(line number, line)] of lines in buf (bytes, mmap or str) where regex matches."""
+    newline = b'\n' if isinstance(regex.pattern, bytes) else '\n'
+    hits = []
+    pos, line_no, counted = 0, 1, 0
+    size = len(buf)
+    while pos <= size:
+        match = regex.search(buf, pos)
+        if not match:
+            break
+        start = buf.rfind(newline, 0, match.start()) + 1
+        end = buf.find(newline, match.start())
+        if end == -1:
+            end = size
+        line_no += buf[counted:start].count(newline)
+        counted = start
+        line = buf[start:end]
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        hits.append((line_no, line.rstrip('\r')))
+        pos = end + 1
+    return hits
+
+def scan_file(path, regex, on_bytes):
+    """Matching lines of one file ([] if it's empty or unreadable)."""
+    try:
+        with open(path, 'rb') as f:
+            if on_bytes:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return scan_buffer(buf, regex)
+            return scan_buffer(f.read().decode('utf-8', errors='replace'), regex)
+    except (OSError, ValueError):
+        # ValueError: mmap of an empty file
+        return []
+
+def _scan_chunk(task):
+    memory_root, rel_paths, pattern, flags = task
+    regex = re.compile(pattern, flags)
+    on_bytes = isinstance(pattern, bytes)
+    results = []
+    for rel in rel_paths:
+        hits = scan_file(os.path.join(memory_root, rel), regex, on_bytes)
+        if hits:
+            results.append({'path': rel, 'archived': False, 'matches': hits})
+    return results
+
+def _scan_archived_month(task):
+    memory_root, month, pattern, flags = task
+    text_pattern = pattern.decode('utf-8') if isinstance(pattern, bytes) else pattern
+    regex = re.compile(text_pattern, flags)
+    results = []
+    for rel, text in memory_archive.iter_texts(memory_root, month, month):
+        hits = scan_buffer(text, regex)
+        if hits:
+            results.append({'path': rel, 'archived': True, 'matches': hits})
+    return results
+
+def _run(task):
+    kind, payload = task
+    return _scan_chunk(payload) if kind == 'live' else _scan_archived_month(payload)
+
+def _grouped(results):
+    """Chunk results -> [{'entity', 'files'}], in order."""
+    groups = []
+    for item in results:
+        key = group_key(item['path'])
+        if not groups or groups[-1]['entity'] != key:
+            groups.append({'entity': key, 'files': []})
+        groups[-1]['files'].append(item)
+    return groups
+
+def scan(memory_root, regex, since=None, until=None, workers=None, archived=True):
+    """
+    Yield {'entity': group key, 'files': [{'path', 'archived', 'matches':
+    [(line number, line)]}]} for every entity with matches, live files
+    first, in path order. regex comes from compile_pattern().
+    """
+    workers = workers or os.cpu_count() or 1
+    files = list_files(memory_root, since, until)
+    months = memory_archive.archived_months(memory_root, since, until) if archived else []
+
+    total = sum(size for _, size in files)
+    parallel = workers > 1 and (total >= MIN_PARALLEL_BYTES or len(months) > 1)
+    chunks = plan_chunks(files, workers * CHUNKS_PER_WORKER if parallel else 1)
+    tasks = [('live', (memory_root, chunk, regex.pattern, regex.flags)) for chunk in chunks]
+    tasks += [('archive', (memory_root, month, regex.pattern, regex.flags)) for month in months]
+
+    if not parallel:
+        for task in tasks:
+            yield from _grouped(_run(task))
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        for results in pool.map(_run, tasks):
+            yield from _grouped(results)
@@ -0,0 +1,242 @@
+"""
+Bulk seeding of people profiles and interaction histories from Granola.
+
+init-memory.sh creates an empty tree and profiles used to appear one at a
+time as meetings synced, so the first weeks of syncs all paid for profile
+creation and email -> profile lookups (catalog.person_by_email, the
+briefing's attendees) found nobody. seed() builds the people side of the
+tree from the whole Granola history at once:
+
+1. Resolve: state.people, the state.events calendar and every document's
+   attendees go through the identity index in one pass, so each contact is
+   one person under their canonical ID (the folder the logger would use).
+2. Plan: every main document with a transcript (continuations folded in,
+   as the logger merges them) becomes an interaction entry for each of its
+   attendees. Date and duration come from the segment tables; transcripts
+   are never assembled.
+3. Write: everything is rendered in memory, then written in one batch
+   grouped by lock stripe, so each stripe is taken once (memory_locks.py).
+   Profiles are only created where missing, and interaction logs are
+   merged the way rebuilds merge them (memory_rebuild.merge_log): seeding
+   twice, or after meetings were logged, adds nothing twice. Archived
+   months are left alone.
+4. Index: the catalog and related-meetings index pick up the new files.
+
+Seeded profiles carry the whole history (first and last meeting, meeting
+count). Contacts with no recorded meeting (calendar or state.people only)
+get a profile without interaction dates. Meeting files are left to the
+logger and rebuild-memory.py.
+"""
+
+import math
+import os
+import time
+from datetime import datetime
+
+import granola_meetings
+from granola_segments import as_segment_table, format_epoch
+from identity_index import _granola_person, build_identity_index
+from memory_archive import archived_months
+from memory_catalog import INTERACTION_RE
+from memory_config import GRANOLA_CACHE, get_org_name
+from memory_locks import file_lock, stripe
+from memory_rebuild import GENERATED_INTERACTION, TMP_SUFFIX, merge_log, refresh_indexes
+from memory_templates import meeting_date, person_folder, render_interaction_entry, render_profile
+
+def _span(tables):
+    """(first start, last end) across a meeting's segment tables, NaN when unknown."""
+    starts = []
+    for table in tables:
+        start = table.first_start
+        if math.isnan(start):
+            start = min((s for s in table.starts if not math.isnan(s)), default=math.nan)
+        starts.append(start)
+    starts = [s for s in starts if not math.isnan(s)]
+    ends = [e for e in (table.last_end for table in tables) if not math.isnan(e)]
+    return (min(starts) if starts else math.nan), (max(ends) if ends else math.nan)
+
+def plan_meetings(data, identities):
+    """
+    The meetings the logger would write, as the fields an interaction entry
+    needs ('doc_id', 'title', 'start_time', 'duration_minutes', 'attendees'),
+    oldest first.
+    """
+    documents, transcripts = data['documents'], data['transcripts']
+    splits = granola_meetings.detect_split_meetings(documents, transcripts)
+    continuations = {cont_id for cont_ids in splits.values() for cont_id in cont_ids}
+
+    meetings = []
+    for doc_id, doc in documents.items():
+        if not isinstance(doc, dict) or doc_id in continuations:
+            continue
+        tables = [as_segment_table(transcripts[d]) for d in [doc_id] + splits.get(doc_id, []) if transcripts.get(d)]
+        # The logger skips meetings without transcript text
+        if not any(table.buffer for table in tables):
+            continue
+        first, last = _span(tables)
+        if math.isnan(first):
+            continue
+        duration = (last - first) / 60
+        meetings.append({
+            'doc_id': doc_id,
+            'title': doc.get('title', '') or '[Untitled]',
+            'start_time': format_epoch(first),
+            'duration_minutes': 0 if math.isnan(duration) else round(duration, 1),
+            'attendees': granola_meetings.collect_attendees(doc, identities),
+        })
+    meetings.sort(key=lambda m: m['start_time'])
+    return meetings
+
+def _contact(identities, email, name=''):
+    """An attendee record for an email seen anywhere in the snapshot."""
+    return {
+        'email': email,
+        'name': identities.display_name(email, name) or name,
+        'person_id': identities.resolve(email, name),
+    }
+
+def collect_contacts(data, meetings, identities, user_email, user_domain, org_name):
+    """
+    {person folder: {'person', 'meetings': [(date, meeting)]}} for everyone
+    in the snapshot, internal and external, once each.
+    """
+    contacts = {}
+
+    def add(att, date_str=None, meeting=None):
+        person = person_folder(att, user_email, user_domain, org_name)
+        if person is None:
+            return
+        entry = contacts.setdefault(f"people/{person['type']}/{person['slug']}", {'person': person, 'meetings': []})
+        if meeting is not None:
+            entry['meetings'].append((date_str, meeting))
+
+    for meeting in meetings:
+        date_str = meeting_date(meeting, '')
+        for att in meeting['attendees']:
+            add(att, date_str, meeting)
+    for event in data.get('events', []) or []:
+        for att in (event.get('attendees') if isinstance(event, dict) else None) or []:
+            if isinstance(att, dict) and att.get('email') and not att.get('self'):
+                add(_contact(identities, att['email'], att.get('displayName', '')))
+    for person in data.get('people', []) or []:
+        emails, name = _granola_person(person)
+        if emails:
+            add(_contact(identities, emails[0], name))
+    return contacts
+
+def render_seed(memory_root, contacts, today):
+    """
+    ({root-relative profile path: text}, {interaction log path: (month,
+    [(date, title, entry)])}) for the contacts, skipping existing profiles
+    and archived months.
+    """
+    archived = set(archived_months(memory_root))
+    origin = f"Granola history on {today}"
+    profiles, interactions = {}, {}
+    for person_dir, contact in sorted(contacts.items()):
+        person, attended = contact['person'], contact['meetings']
+        profile = f"{person_dir}/profile.md"
+        if not os.path.exists(os.path.join(memory_root, profile)):
+            dates = [date_str for date_str, _ in attended]
+            profiles[profile] = render_profile(
+                person, min(dates, default=''), last=max(dates, default=''), count=len(dates), origin=origin,
+            )
+        for date_str, meeting in attended:
+            month = date_str[:7]
+            if month in archived:
+                continue
+            rel = f"{person_dir}/interactions/{month}.md"
+            interactions.setdefault(rel, (month, []))[1].append(
+                (date_str, meeting['title'], render_interaction_entry(meeting, date_str, person['slug']))
+            )
+    return profiles, interactions
+
+def _replace(path, text):
+    tmp = path + TMP_SUFFIX
+    with open(tmp, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def write_seed(memory_root, profiles, interactions):
+    """
+    Write the rendered files, one lock stripe at a time. Returns
+    (profiles created, interaction logs changed) as root-relative paths.
+    """
+    by_stripe = {}
+    for rel in list(profiles) + list(interactions):
+        by_stripe.setdefault(stripe(memory_root, os.path.join(memory_root, rel)), []).append(rel)
+
+    created, changed = [], []
+    for rels in by_stripe.values():
+        with file_lock(memory_root, os.path.join(memory_root, rels[0])):
+            for rel in rels:
+                path = os.path.join(memory_root, rel)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if rel in profiles:
+                    try:
+                        with open(path, 'x') as f:
+                            f.write(profiles[rel])
+                        created.append(rel)
+                    except FileExistsError:
+                        pass
+                    continue
+                month, entries = interactions[rel]
+                try:
+                    with open(path, 'r') as f:
+                        old = f.read()
+                except FileNotFoundError:
+                    old = None
+                text = merge_log(old, f"# Interactions - {month}\n\n", INTERACTION_RE, GENERATED_INTERACTION, entries)
+                if text != old:
+                    _replace(path, text)
+                    changed.append(rel)
+    return sorted(created), sorted(changed)
+
+def seed(memory_root, user_email, user_domain, org_name=None, dry_run=False, log=print):
+    """
+    Seed profiles and interaction logs from the Granola cache.
+
+    org_name (default: the skill config's) is the company on internal
+    profiles. Returns {'stats', 'written', 'timings'}; with dry_run nothing
+    is written and 'written' lists what would be.
+    """
+    memory_root = os.path.abspath(memory_root)
+    timings = {}
+
+    t = time.perf_counter()
+    data = granola_meetings.load_granola_data(lean=True)
+    timings['load'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    identities = build_identity_index(data, memory_root, GRANOLA_CACHE)
+    meetings = plan_meetings(data, identities)
+    contacts = collect_contacts(data, meetings, identities, user_email, user_domain, org_name or get_org_name())
+    timings['resolve'] = time.perf_counter() - t
+    log(f"Resolved {len(contacts)} contact(s) across {len(meetings)} meeting(s)")
+
+    t = time.perf_counter()
+    profiles, interactions = render_seed(memory_root, contacts, datetime.now().strftime('%Y-%m-%d'))
+    timings['render'] = time.perf_counter() - t
+
+    stats = {
+        'contacts': len(contacts),
+        'internal': sum(1 for c in contacts.values() if c['person']['type'] == 'internal'),
+        'external': sum(1 for c in contacts.values() if c['person']['type'] == 'external'),
+        'meetings': len(meetings),
+        'entries': sum(len(entries) for _, entries in interactions.values()),
+    }
+    if dry_run:
+        stats.update(profiles_created=len(profiles), interaction_files=len(interactions))
+        return {'stats': stats, 'written': sorted(profiles) + sorted(interactions), 'timings': timings}
+
+    t = time.perf_counter()
+    created, changed = write_seed(memory_root, profiles, interactions)
+    timings['write'] = time.perf_counter() - t
+    stats.update(profiles_created=len(created), interaction_files=len(changed))
+
+    written = created + changed
+    t = time.perf_counter()
+    if written:
+        refresh_indexes(memory_root, written, log)
+    timings['index'] = time.perf_counter() - t
+    return {'stats': stats, 'written': written, 'timings': timings}
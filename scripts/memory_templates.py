@@ -0,0 +1,298 @@
+"""
+Layouts of the files log-meeting-to-memory.py derives from Granola.
+
+The meeting file, profile, interaction entry and activity log entry
+templates used to be f-strings inside log-meeting-to-memory.py, so a
+layout change only reached files written afterwards. They live here,
+compiled once at import, so the logger and rebuild-memory.py (which
+regenerates existing files) render exactly the same text.
+
+When a placeholder body below changes, keep the old text in
+PLACEHOLDER_BODIES: rebuilds treat a section whose body is a known
+placeholder as untouched and replace it, and anything else as a human edit
+to preserve.
+
+Appended entries (interaction logs, the activity log, project and team
+activity logs) carry an idempotency key, an HTML comment under the heading
+(entry_key()), so a meeting synced twice by racing writers is appended
+once (see memory_locks.append_once).
+"""
+
+import re
+from string import Template
+
+from conversation_stats import frontmatter_lines
+from memory_config import slugify
+
+MEETING_TEMPLATE = Template("""---
+title: $title
+date: $date
+duration_minutes: $duration
+source: granola
+granola_doc_id: $doc_id
+was_split: $was_split$conversation
+attendees:
+$attendees
+topics:$topics$links
+outcome: $outcome
+---
+
+# $title
+
+## Summary
+
+*[Auto-captured from Granola - needs review]*
+
+## Key Points
+
+-
+
+## Action Items
+
+- [ ] Review and update this meeting summary
+
+## Notes
+
+Meeting duration: $duration minutes
+Transcript segments: $segments
+$split_note
+
+## Transcript Preview
+
+```
+$transcript
+$truncated
+```
+""")
+
+INTERNAL_PROFILE_TEMPLATE = Template("""---
+name: $name
+canonical_name: $slug
+email: $email
+type: internal
+company: $company
+team:
+role:
+first_interaction: $first
+last_interaction: $last
+interaction_count: $count
+---
+
+# $name
+
+## Role at $company
+
+- Email: $email
+- Team: *[To be filled in]*
+- Role: *[To be filled in]*
+
+## Working Relationship
+
+*[Notes about how you work together, communication preferences, etc.]*
+
+## Notes
+
+*Profile auto-created from $origin*
+""")
+
+EXTERNAL_PROFILE_TEMPLATE = Template("""---
+name: $name
+canonical_name: $slug
+email: $email
+type: external
+company: $company
+role:
+first_interaction: $first
+last_interaction: $last
+interaction_count: $count
+---
+
+# $name
+
+## Background
+
+- Company: $company
+- Email: $email
+- Role: *[To be filled in]*
+
+## Relationship
+
+*[How did you meet? What's the context of your interactions?]*
+
+## Notes
+
+*Profile auto-created from $origin*
+""")
+
+INTERACTION_ENTRY_TEMPLATE = Template("""
+## $date - $title
+<!-- key: $key -->
+
+**Type:** Meeting
+**Duration:** $duration minutes
+
+*[See meeting log for details]*
+
+---
+""")
+
+ACTIVITY_ENTRY_TEMPLATE = Template("""
+## $date - $title
+<!-- key: $key -->
+
+**Type:** Meeting
+**Duration:** $duration minutes
+**Meeting:** $meeting
+
+*[Linked from the meeting transcript]*
+
+---
+""")
+
+LOG_ENTRY_TEMPLATE = Template("""
+### $date - Meeting: $title
+<!-- key: $key -->
+
+- Duration: $duration minutes
+- Attendees: $attendee_count
+- Source: Granola
+$split_note
+
+---
+""")
+
+TRANSCRIPT_PREVIEW_CHARS = 2000
+
+# Meeting file sections regenerated from Granola on every rebuild
+GENERATED_SECTIONS = {'Notes', 'Transcript Preview'}
+# Bodies (stripped) the template has ever written into the other sections
+PLACEHOLDER_BODIES = {
+    'Summary': {'*[Auto-captured from Granola - needs review]*'},
+    'Key Points': {'-'},
+    'Action Items': {'- [ ] Review and update this meeting summary'},
+}
+DEFAULT_OUTCOME = 'pending_review'
+
+def meeting_date(meeting, default):
+    return meeting.get('start_time', '')[:10] or default
+
+def meeting_rel_path(meeting, date_str):
+    """meetings/YYYY-MM/YYYY-MM-DD-<title slug>.md"""
+    return f"meetings/{date_str[:7]}/{date_str}-{slugify(meeting.get('title', 'Untitled Meeting'))}.md"
+
+def render_meeting(meeting, date_str, outcome=DEFAULT_OUTCOME):
+    """Full text of a meeting file."""
+    attendees_yaml = []
+    for att in meeting.get('attendees', []):
+        if isinstance(att, dict) and att.get('email'):
+            attendees_yaml.append(f"  - email: {att['email']}")
+            if att.get('name'):
+                attendees_yaml.append(f"    name: {att['name']}")
+
+    topics = meeting.get('topics') or []
+    transcript = meeting.get('transcript_text', '')
+    return MEETING_TEMPLATE.substitute(
+        title=meeting.get('title', 'Untitled Meeting'),
+        date=date_str,
+        duration=meeting.get('duration_minutes', 0),
+        doc_id=meeting.get('doc_id', ''),
+        was_split=meeting.get('was_split', False),
+        conversation=frontmatter_lines(meeting.get('conversation')),
+        attendees='\n'.join(attendees_yaml) if attendees_yaml else '  - unknown',
+        topics=''.join(f"\n  - {topic}" for topic in topics) if topics else ' []',
+        links=link_lines(meeting),
+        outcome=outcome,
+        segments=meeting.get('segments', 0),
+        split_note='**Note:** This meeting was split across multiple Granola documents and merged.'
+                   if meeting.get('was_split') else '',
+        transcript=transcript[:TRANSCRIPT_PREVIEW_CHARS],
+        truncated='...[truncated]' if len(transcript) > TRANSCRIPT_PREVIEW_CHARS else '',
+    )
+
+def entry_key(meeting, date_str, person_slug=None):
+    """
+    Idempotency key of a meeting's log entry: "granola:<doc ID>", plus
+    ":<person slug>" for interaction entries. Meetings without a doc ID
+    fall back to their file name.
+    """
+    key = f"granola:{meeting.get('doc_id') or meeting_rel_path(meeting, date_str).rsplit('/', 1)[-1][:-3]}"
+    return f"{key}:{person_slug}" if person_slug else key
+
+def key_line(key):
+    """The line an entry's key is written as."""
+    return f"<!-- key: {key} -->\n"
+
+ENTRY_KEY_RE = re.compile(r'^<!-- key: (\S+) -->$', re.MULTILINE)
+
+def person_folder(att, user_email, user_domain, org_name):
+    """
+    Where an attendee's profile lives, or None for the user and invalid emails.
+
+    Internal colleagues (@user_domain) work at org_name. Returns
+    {'type': 'internal'|'external', 'slug', 'name', 'email', 'company'}.
+    """
+    email = att.get('email', '') if isinstance(att, dict) else ''
+    # Skip empty or invalid emails, and the user running this
+    if '@' not in email or len(email) < 5 or email.lower() == user_email.lower():
+        return None
+
+    is_internal = f'@{user_domain}' in email.lower()
+    # The canonical person ID from the identity index (when there is one)
+    # keeps the same person in the same folder
+    name = att.get('name', '') or email.split('@')[0].replace('.', ' ').title()
+    domain = email.split('@')[1]
+    return {
+        'type': 'internal' if is_internal else 'external',
+        'slug': att.get('person_id') or slugify(name),
+        'name': name,
+        'email': email,
+        'company': org_name if is_internal else (domain.split('.')[0].title() if domain else 'Unknown'),
+    }
+
+def render_profile(person, date_str, last=None, count=1, origin=None):
+    """
+    A new profile, first seen at date_str's meeting. The seed
+    (memory_seed.py) passes the whole history: last meeting, meeting count
+    and where the profile came from (date_str is '' for contacts it found
+    no meeting with).
+    """
+    template = INTERNAL_PROFILE_TEMPLATE if person['type'] == 'internal' else EXTERNAL_PROFILE_TEMPLATE
+    return template.substitute(
+        person, first=date_str, last=date_str if last is None else last, count=count,
+        origin=origin or f"meeting attendance on {date_str}",
+    )
+
+def render_interaction_entry(meeting, date_str, person_slug):
+    return INTERACTION_ENTRY_TEMPLATE.substitute(
+        date=date_str,
+        title=meeting.get('title', 'Untitled Meeting'),
+        duration=meeting.get('duration_minutes', 0),
+        key=entry_key(meeting, date_str, person_slug),
+    )
+
+def link_lines(meeting):
+    """`projects:` / `teams:` frontmatter lists ('' for unlinked meetings, so they keep the old layout)."""
+    return ''.join(
+        f"\n{field}:" + ''.join(f"\n  - {slug}" for slug in meeting[field])
+        for field in ('projects', 'teams') if meeting.get(field)
+    )
+
+def render_activity_entry(meeting, date_str, meeting_path=None):
+    """A linked meeting's entry in a project or team's activity/YYYY-MM.md."""
+    return ACTIVITY_ENTRY_TEMPLATE.substitute(
+        date=date_str,
+        title=meeting.get('title', 'Untitled Meeting'),
+        duration=meeting.get('duration_minutes', 0),
+        meeting=meeting_path or meeting_rel_path(meeting, date_str),
+        key=entry_key(meeting, date_str),
+    )
+
+def render_log_entry(meeting, date_str):
+    return LOG_ENTRY_TEMPLATE.substitute(
+        date=date_str,
+        key=entry_key(meeting, date_str),
+        title=meeting.get('title', 'Untitled Meeting'),
+        duration=meeting.get('duration_minutes', 0),
+        attendee_count=len(meeting.get('attendees', [])),
+        split_note='- Note: Meeting was split and auto-merged' if meeting.get('was_split') else '',
+    )
@@ -0,0 +1,337 @@
+"""
+In-memory model of a Work Memory tree.
+
+Holds every markdown file's text, mtime and parsed frontmatter, plus the
+people/project/team entities, so search/list/view/recent/stats can be
+answered without walking the tree. refresh() re-stats the tree and reloads
+only files whose mtime or size changed. Of archived months (.archive/)
+only the member indexes are held, reloaded when they change; a month's
+texts are read from its zip when a search's --since/--until range
+includes it, and the last ARCHIVE_CACHE_MONTHS months read stay cached.
+
+Used by memory-server.py, which keeps one MemoryTree warm for the /mem-*
+commands.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+# memory_archive (zipfile) is imported by _refresh_archive(): mem-query.py
+# only needs server_socket_path() from here
+
+SKIP_DIRS = {'config', '.archive'}
+ARCHIVE_CACHE_MONTHS = 6
+ENTITY_DIRS = ('people', 'projects', 'teams')
+
+FRONTMATTER_RE = re.compile(r'^---\s*\n(.*?)\n---\s*(\n|$)', re.DOTALL)
+FIELD_RE = re.compile(r'^([A-Za-z_][\w-]*):[ \t]*(.*)$', re.MULTILINE)
+
+def parse_frontmatter(text):
+    """Top-level scalar fields of a markdown file's YAML frontmatter."""
+    match = FRONTMATTER_RE.match(text)
+    if not match:
+        return {}
+    fields = {}
+    for key, value in FIELD_RE.findall(match.group(1)):
+        fields[key] = value.strip().strip('"').strip("'")
+    return fields
+
+def parse_list(header, field):
+    """
+    A list field of a frontmatter block, inline (`field: [a, b]`) or as
+    indented "- item" lines; None if the field isn't there.
+    """
+    match = re.search(rf'^{re.escape(field)}:[ \t]*(.*)\n((?:[ \t]+-.*\n?)*)', header + '\n', re.MULTILINE)
+    if not match:
+        return None
+    inline = match.group(1).strip()
+    if inline:
+        items = inline.strip('[]').split(',')
+    else:
+        items = [line.strip()[1:] for line in match.group(2).splitlines()]
+    items = (item.strip().strip('"').strip("'") for item in items)
+    return [item for item in items if item]
+
+def entity_of(rel_path):
+    """
+    Return (entity_type, entity_dir) for a path inside people/projects/teams.
+
+    People live under people/<internal|external>/<slug>/ (auto-created
+    profiles) or people/<slug>/ (manual profiles); both are supported.
+    """
+    parts = rel_path.split('/')
+    if len(parts) < 3 or parts[0] not in ENTITY_DIRS:
+        return None, None
+    if parts[0] == 'people' and parts[1] in ('internal', 'external'):
+        if len(parts) < 4:
+            return None, None
+        return 'person', '/'.join(parts[:3])
+    kind = {'people': 'person', 'projects': 'project', 'teams': 'team'}[parts[0]]
+    return kind, '/'.join(parts[:2])
+
+def entity_label(rel_path):
+    """(emoji type, name) for a result path, as /mem-search shows it."""
+    parts = rel_path.split('/')
+    if parts[0] == 'people':
+        name = parts[2] if len(parts) > 3 and parts[1] in ('internal', 'external') else parts[1]
+        return "👤 Person", name
+    if parts[0] == 'projects':
+        return "📊 Project", parts[1]
+    if parts[0] == 'teams':
+        return "🏢 Team", parts[1]
+    if parts[0] == 'me':
+        return "👤 Me", "Your profile"
+    return "📄", os.path.dirname(rel_path)
+
+class MemoryTree:
+    """Warm, incrementally refreshed view of one memory root."""
+
+    def __init__(self, memory_root):
+        self.memory_root = memory_root
+        self.files = {}      # rel_path -> {'mtime', 'size', 'text', 'fields'}
+        self.archived = {}   # rel_path -> {'mtime', 'size', 'kind', 'month'} (no text)
+        self.archive_stamps = {}  # month -> index mtime
+        self.archive_texts = {}   # month -> {rel_path: text}, least recently searched first
+        self.loaded_at = 0.0
+
+    # -- loading ----------------------------------------------------------
+
+    def refresh(self):
+        """Bring the model up to date with disk. Returns number of files reloaded."""
+        seen = set()
+        reloaded = 0
+        root = self.memory_root
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            if dirpath == root:
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                if not name.endswith('.md'):
+                    continue
+                full = os.path.join(dirpath, name)
+                rel = os.path.relpath(full, root).replace(os.sep, '/')
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                seen.add(rel)
+                cached = self.files.get(rel)
+                if cached and cached['mtime'] == st.st_mtime and cached['size'] == st.st_size:
+                    continue
+                try:
+                    with open(full, 'r', errors='replace') as f:
+                        text = f.read()
+                except OSError:
+                    continue
+                self.files[rel] = {
+                    'mtime': st.st_mtime,
+                    'size': st.st_size,
+                    'text': text,
+                    'fields': parse_frontmatter(text),
+                }
+                reloaded += 1
+
+        for rel in set(self.files) - seen:
+            del self.files[rel]
+
+        reloaded += self._refresh_archive()
+        self.loaded_at = time.time()
+        return reloaded
+
+    def _refresh_archive(self):
+        """Reload the member indexes of archived months that changed. Returns members reloaded."""
+        import memory_archive
+        stamps = {}
+        for month in memory_archive.archived_months(self.memory_root):
+            _, index_path = memory_archive.archive_paths(self.memory_root, month)
+            try:
+                stamps[month] = os.stat(index_path).st_mtime
+            except OSError:
+                continue
+        changed = {m for m in set(stamps) | set(self.archive_stamps) if stamps.get(m) != self.archive_stamps.get(m)}
+        if not changed:
+            return 0
+
+        self.archived = {rel: info for rel, info in self.archived.items() if info['month'] not in changed}
+        reloaded = 0
+        for month in sorted(changed & set(stamps)):
+            self.archive_texts.pop(month, None)
+            for member in (memory_archive.load_month_index(self.memory_root, month) or {}).get('members', []):
+                self.archived[member['path']] = {
+                    'mtime': member.get('mtime', 0),
+                    'size': member.get('size', 0),
+                    'kind': member.get('kind', ''),
+                    'month': month,
+                }
+                reloaded += 1
+        for month in changed - set(stamps):
+            self.archive_texts.pop(month, None)
+        self.archive_stamps = stamps
+        return reloaded
+
+    def _archived_texts(self, month):
+        """{rel_path: text} of one archived month, read from its zip on first use."""
+        import memory_archive
+        texts = self.archive_texts.pop(month, None)
+        if texts is None:
+            texts = dict(memory_archive.iter_texts(self.memory_root, month, month))
+        self.archive_texts[month] = texts
+        while len(self.archive_texts) > ARCHIVE_CACHE_MONTHS:
+            del self.archive_texts[next(iter(self.archive_texts))]
+        return texts
+
+    # -- entities ---------------------------------------------------------
+
+    def entities(self, kind=None):
+        """Map entity_dir -> {'type', 'slug', 'fields', 'files'} for people/projects/teams."""
+        result = {}
+        for rel, info in self.files.items():
+            etype, edir = entity_of(rel)
+            if not etype or (kind and etype != kind):
+                continue
+            entity = result.setdefault(edir, {
+                'type': etype,
+                'slug': edir.rsplit('/', 1)[-1],
+                'dir': edir,
+                'fields': {},
+                'files': [],
+            })
+            entity['files'].append(rel[len(edir) + 1:])
+            if rel in (f"{edir}/profile.md", f"{edir}/overview.md"):
+                entity['fields'] = info['fields']
+        return result
+
+    # -- queries ----------------------------------------------------------
+
+    def search(self, query, ignore_case=True, regex=False, since=None, until=None):
+        """
+        Matching lines across live and archived files: list of {path, line, text}.
+
+        since/until (YYYY-MM) skip monthly files outside the range; archived
+        months are only read when they fall inside it.
+        """
+        import memory_archive
+        pattern = re.compile(query if regex else re.escape(query), re.IGNORECASE if ignore_case else 0)
+
+        def in_range(month):
+            return not month or ((not since or month >= since) and (not until or month <= until))
+
+        sources = [(False, {rel: info['text'] for rel, info in self.files.items()
+                            if in_range(memory_archive.month_of(rel))})]
+        months = sorted({info['month'] for info in self.archived.values() if in_range(info['month'])})
+        sources += [(True, self._archived_texts(month)) for month in months]
+
+        results = []
+        for archived, texts in sources:
+            for rel in sorted(texts):
+                text = texts[rel]
+                if not pattern.search(text):
+                    continue
+                for line_no, line in enumerate(text.splitlines(), 1):
+                    if pattern.search(line):
+                        results.append({
+                            'path': rel,
+                            'line': line_no,
+                            'text': line.strip(),
+                            'archived': archived,
+                        })
+        return results
+
+    def list(self, kind=None):
+        """Entities with their display fields, grouped by type."""
+        groups = {'person': [], 'project': [], 'team': []}
+        for entity in sorted(self.entities(kind).values(), key=lambda e: e['slug']):
+            fields = entity['fields']
+            groups[entity['type']].append({
+                'slug': entity['slug'],
+                'dir': entity['dir'],
+                'name': fields.get('name') or fields.get('project_name') or '',
+                'role': fields.get('role', ''),
+                'team': fields.get('team', ''),
+                'status': fields.get('status', ''),
+            })
+        topics = sum(1 for rel in self.files if rel.startswith('topics/') and rel.count('/') == 1)
+        return {'groups': groups, 'topics': topics}
+
+    def view(self, name):
+        """
+        Find an entity by slug: exact match first, then substring.
+        Returns {'matches': [...]} with the main file's text when unique.
+        """
+        normalized = name.lower().replace(' ', '-')
+        entities = self.entities()
+        exact = [e for e in entities.values() if e['slug'] == normalized]
+        matches = exact or [e for e in entities.values() if normalized in e['slug']]
+        matches.sort(key=lambda e: e['dir'])
+
+        if len(matches) != 1:
+            return {'matches': [{'slug': e['slug'], 'type': e['type'], 'dir': e['dir']} for e in matches]}
+
+        entity = matches[0]
+        main_file = 'profile.md' if entity['type'] == 'person' else 'overview.md'
+        main = self.files.get(f"{entity['dir']}/{main_file}")
+        top_level = sorted({f.split('/')[0] for f in entity['files']})
+        interactions = sum(1 for f in entity['files'] if f.startswith('interactions/'))
+        interactions += sum(1 for rel in self.archived if rel.startswith(entity['dir'] + '/interactions/'))
+        return {
+            'matches': [{'slug': entity['slug'], 'type': entity['type'], 'dir': entity['dir']}],
+            'main_file': main_file,
+            'text': main['text'] if main else None,
+            'files': top_level,
+            'interactions': interactions,
+        }
+
+    def recent(self, days):
+        """Files modified in the last N days, newest first: list of {path, mtime}."""
+        cutoff = time.time() - days * 86400
+        items = [
+            {'path': rel, 'mtime': info['mtime']}
+            for source in (self.files, self.archived)
+            for rel, info in source.items()
+            if info['mtime'] >= cutoff
+        ]
+        return sorted(items, key=lambda i: i['mtime'], reverse=True)
+
+    def stats(self):
+        """Entity counts, interaction log counts, size and most recent files."""
+        entities = self.entities()
+        counts = {'person': 0, 'project': 0, 'team': 0}
+        per_person = {}
+        for entity in entities.values():
+            counts[entity['type']] += 1
+            if entity['type'] == 'person':
+                per_person[entity['dir']] = sum(1 for f in entity['files'] if f.startswith('interactions/'))
+
+        for rel, info in self.archived.items():
+            if info['kind'] == 'interaction':
+                etype, edir = entity_of(rel)
+                if edir in per_person:
+                    per_person[edir] += 1
+
+        this_month = time.strftime('%Y-%m')
+        interaction_files = [rel for rel in list(self.files) + list(self.archived) if '/interactions/' in rel]
+        top = sorted(((n, d) for d, n in per_person.items() if n), reverse=True)[:5]
+
+        return {
+            'people': counts['person'],
+            'projects': counts['project'],
+            'teams': counts['team'],
+            'topics': sum(1 for rel in self.files if rel.startswith('topics/') and rel.count('/') == 1),
+            'interaction_files': len(interaction_files),
+            'this_month': sum(1 for rel in interaction_files if rel.endswith(f"/{this_month}.md")),
+            'bytes': sum(i['size'] for i in self.files.values()),
+            'archived_files': len(self.archived),
+            'recent': self.recent(36500)[:5],
+            'top_people': [
+                {'dir': d, 'name': entities[d]['fields'].get('name', ''), 'count': n}
+                for n, d in top
+            ],
+        }
+
+def server_socket_path(memory_root):
+    """Unix socket the query server for this memory root listens on."""
+    digest = hashlib.sha1(os.path.abspath(memory_root).encode('utf-8')).hexdigest()[:10]
+    return os.path.join(tempfile.gettempdir(), f"workmemory-{os.getuid()}-{digest}.sock")
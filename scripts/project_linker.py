@@ -0,0 +1,190 @@
+"""
+Project and team links for meetings at ingest.
+
+Meetings were never connected to projects/ or teams/: finding the
+meetings about a project meant grepping transcripts for its name.
+link_meetings() tags each meeting with the projects and teams it
+mentions, which log-meeting-to-memory.py writes into the meeting's
+`projects:` / `teams:` frontmatter and, as a keyed entry, into each
+linked folder's activity/YYYY-MM.md.
+
+What to look for comes from the folders themselves. Each
+projects/<slug>/overview.md or teams/<slug>/overview.md contributes its
+name (name, project_name or team_name), its slug as words, and the
+optional `aliases:` and `keywords:` frontmatter lists:
+
+    name: Atlas Migration
+    aliases: [atlas, db migration]
+    keywords:
+      - postgres cutover
+      - read replicas
+
+Every term is compiled into one Aho-Corasick automaton (a trie with
+failure links), so a meeting's title and merged transcript are each
+scanned once, in time linear in their length however many projects and
+terms there are. Text and terms are compared lower-cased with punctuation
+folded to spaces ("Q1-Launch" matches "q1 launch"), and a match must
+start and end on a word boundary.
+
+A name, slug or alias links on one mention anywhere; a keyword links on
+KEYWORD_HITS mentions in the transcript or one in the title.
+"""
+
+import os
+import re
+
+from memory_tree import parse_frontmatter, parse_list
+
+ENTITY_KINDS = (('projects', 'project'), ('teams', 'team'))
+OVERVIEW_FILE = 'overview.md'
+
+MIN_TERM_LENGTH = 3      # Shorter terms ("ai", "ux") match inside too much chatter
+KEYWORD_HITS = 2
+MAX_LINKS = 5            # Per kind, most-mentioned first
+
+ACTIVITY_DIR = 'activity'
+
+NON_WORD_RE = re.compile(r'[\W_]+')
+
+def normalize(text):
+    """Lower-cased, punctuation folded to single spaces, padded with one space each side."""
+    return ' ' + NON_WORD_RE.sub(' ', text.lower()).strip() + ' '
+
+class Automaton:
+    """Aho-Corasick automaton over a fixed set of (normalized) patterns."""
+
+    def __init__(self, patterns):
+        self.lengths = [len(p) for p in patterns]
+        goto, fail, out = [{}], [0], [[]]
+        for pid, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        # Breadth-first failure links; each state also reports its fail state's patterns
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self.goto, self.fail, self.out = goto, fail, out
+
+    def matches(self, text):
+        """(start, pattern id) of every occurrence in text, overlapping ones included."""
+        goto, fail, out, lengths = self.goto, self.fail, self.out, self.lengths
+        found = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.extend((i + 1 - lengths[pid], pid) for pid in out[state])
+        return found
+
+class Linker:
+    """Terms of every project and team, compiled into one automaton."""
+
+    def __init__(self, entities):
+        """entities: [(entity dir, [(term, strong)])]."""
+        self.dirs = []
+        owners = {}          # normalized term -> {entity index: strong}
+        for index, (edir, terms) in enumerate(entities):
+            self.dirs.append(edir)
+            for term, strong in terms:
+                key = normalize(term).strip()
+                if len(key) >= MIN_TERM_LENGTH:
+                    claims = owners.setdefault(key, {})
+                    claims[index] = claims.get(index, False) or strong
+        # Patterns carry their boundary spaces, so a hit is always a whole word run
+        self.terms = list(owners)
+        self.owners = [list(owners[term].items()) for term in self.terms]
+        self.automaton = Automaton([f" {term} " for term in self.terms])
+
+    def __bool__(self):
+        return bool(self.terms)
+
+    def _hits(self, text):
+        """{pattern id: occurrences} in text."""
+        hits = {}
+        for _, pid in self.automaton.matches(normalize(text)):
+            hits[pid] = hits.get(pid, 0) + 1
+        return hits
+
+    def link(self, title, transcript):
+        """{'projects': [slug], 'teams': [slug]} mentioned in a meeting."""
+        scores = {}
+        in_title = self._hits(title)
+        in_transcript = self._hits(transcript)
+        for pid in set(in_title) | set(in_transcript):
+            count = in_title.get(pid, 0) + in_transcript.get(pid, 0)
+            for index, strong in self.owners[pid]:
+                if strong or in_title.get(pid) or count >= KEYWORD_HITS:
+                    scores[index] = scores.get(index, 0) + count
+
+        links = {kind: [] for kind, _ in ENTITY_KINDS}
+        for index in sorted(scores, key=lambda i: (-scores[i], self.dirs[i])):
+            kind, slug = self.dirs[index].split('/', 1)
+            if len(links[kind]) < MAX_LINKS:
+                links[kind].append(slug)
+        return links
+
+def entity_terms(edir, text):
+    """[(term, strong)] for one project or team folder, from its overview's frontmatter."""
+    slug = edir.rsplit('/', 1)[-1]
+    fields = parse_frontmatter(text)
+    header = text.split('\n---', 2)[0] if text.startswith('---') else ''
+    terms = [(slug.replace('-', ' '), True)]
+    name = fields.get('name') or fields.get('project_name') or fields.get('team_name')
+    if name:
+        terms.append((name, True))
+    terms += [(alias, True) for alias in parse_list(header, 'aliases') or []]
+    terms += [(keyword, False) for keyword in parse_list(header, 'keywords') or []]
+    return terms
+
+def load_linker(memory_root):
+    """A Linker over every folder in projects/ and teams/."""
+    entities = []
+    for top, _ in ENTITY_KINDS:
+        base = os.path.join(memory_root, top)
+        try:
+            slugs = sorted(os.listdir(base))
+        except OSError:
+            continue
+        for slug in slugs:
+            if slug.startswith('.') or not os.path.isdir(os.path.join(base, slug)):
+                continue
+            try:
+                with open(os.path.join(base, slug, OVERVIEW_FILE), 'r') as f:
+                    text = f.read()
+            except OSError:
+                text = ''
+            entities.append((f"{top}/{slug}", entity_terms(f"{top}/{slug}", text)))
+    return Linker(entities)
+
+def link_meetings(meetings, memory_root, linker=None):
+    """Set each meeting's 'projects' and 'teams' (lists of slugs) from its title and transcript."""
+    linker = linker if linker is not None else load_linker(memory_root)
+    for meeting in meetings:
+        links = linker.link(meeting.get('title', ''), meeting.get('transcript_text', '')) if linker else {}
+        meeting['projects'] = links.get('projects', [])
+        meeting['teams'] = links.get('teams', [])
+
+def linked_dirs(meeting):
+    """Root-relative folders a meeting is linked to."""
+    return [f"{top}/{slug}" for top, _ in ENTITY_KINDS for slug in meeting.get(top) or []]
+
+def activity_path(edir, month):
+    return f"{edir}/{ACTIVITY_DIR}/{month}.md"
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Query the Work Memory catalog (people, meetings, interactions)
+
+Structured queries over MEMORY_ROOT/config/catalog.db, which is built on
+first use and kept current incrementally (only changed files are re-read).
+/mem-list and /mem-view use the list/view subcommands; people/meetings
+answer questions that used to mean reading every profile, and actions
+answers "open items involving X" or "what's overdue" from the action item
+index instead of grepping the tree.
+
+Usage:
+    python3 query-memory.py people [--type internal|external] [--company NAME] [--team NAME]
+                                   [--role TEXT] [--name TEXT]
+                                   [--met-within DAYS] [--not-met-within DAYS] [--met-since DATE]
+                                   [--sort name|company|last_met|first_met|meetings] [--desc]
+                                   [--limit N] [--offset N]
+    python3 query-memory.py meetings [--since DATE] [--until DATE] [--within DAYS]
+                                     [--with PERSON] [--title TEXT] [--topic TOPIC]
+                                     [--limit N] [--offset N]
+    python3 query-memory.py topics [--within DAYS] [--limit N]
+    python3 query-memory.py actions [--person NAME] [--overdue] [--due-by DATE | --due-within DAYS]
+                                    [--status open|done|all] [--since DATE] [--limit N] [--offset N]
+    python3 query-memory.py conversation [--by month|person] [--person NAME] [--since DATE] [--within DAYS]
+    python3 query-memory.py list [people|projects|teams|all]
+    python3 query-memory.py view <name>
+    python3 query-memory.py rebuild
+
+Examples:
+    # External contacts at Acme I haven't met in 60 days
+    python3 query-memory.py people --type external --company acme --not-met-within 60
+
+    # Everyone I met with this week
+    python3 query-memory.py people --met-within 7 --sort last_met --desc
+
+    # Meetings tagged "pricing page", and the most common topics this quarter
+    python3 query-memory.py meetings --topic "pricing page"
+    python3 query-memory.py topics --within 90
+
+    # Open items involving Sarah, and everything overdue
+    python3 query-memory.py actions --person sarah
+    python3 query-memory.py actions --overdue
+
+    # How much I talk, month by month, and in meetings with each person
+    python3 query-memory.py conversation
+    python3 query-memory.py conversation --by person --within 90
+
+Add --json to people/meetings/topics/actions/conversation for machine-readable output.
+"""
+
+import json
+import os
+import sys
+import time
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+from memory_catalog import open_catalog, main_file_for, days_ago, PEOPLE_SORTS
+from memory_config import get_memory_root
+
+RULE = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+def page_header(label, total, offset, count):
+    if total == count:
+        return f"{label} ({total})"
+    return f"{label} (showing {offset + 1}-{offset + count} of {total})" if count else f"{label} (0 of {total})"
+
+def cmd_people(catalog, args):
+    met_since = args.met_since or (days_ago(args.met_within) if args.met_within is not None else None)
+    not_met_since = days_ago(args.not_met_within) if args.not_met_within is not None else None
+    total, rows = catalog.people(
+        category=args.type, company=args.company, team=args.team, role=args.role, name=args.name,
+        met_since=met_since, not_met_since=not_met_since,
+        sort=args.sort, desc=args.desc, limit=args.limit, offset=args.offset,
+    )
+
+    if args.json:
+        print(json.dumps({'total': total, 'offset': args.offset, 'people': rows}, indent=2))
+        return
+
+    print(page_header("👥 People", total, args.offset, len(rows)))
+    print()
+    if not rows:
+        print("  No matching people")
+        print()
+        return
+    for row in rows:
+        name = row['name'] or row['slug']
+        details = [d for d in (row['role'], row['company'] or row['team']) if d]
+        line = f"  • {name}" + (f" - {', '.join(details)}" if details else "")
+        if row['category']:
+            line += f" ({row['category']})"
+        met = f"last met {row['last_met']}" if row['last_met'] else "never met"
+        print(f"{line} · {met} · {row['meetings']} meetings")
+    print()
+    if args.offset + len(rows) < total:
+        print(f"💡 Next page: --offset {args.offset + len(rows)}")
+
+def cmd_meetings(catalog, args):
+    since = args.since or (days_ago(args.within) if args.within is not None else None)
+    total, rows = catalog.meetings(
+        since=since, until=args.until, attendee=args.with_person, title=args.title, topic=args.topic,
+        desc=not args.asc, limit=args.limit, offset=args.offset,
+    )
+
+    if args.json:
+        print(json.dumps({'total': total, 'offset': args.offset, 'meetings': rows}, indent=2))
+        return
+
+    print(page_header("🗓️  Meetings", total, args.offset, len(rows)))
+    print()
+    if not rows:
+        print("  No matching meetings")
+        print()
+        return
+    for row in rows:
+        print(f"  • {row['date']} - {row['title'] or os.path.basename(row['path'])} "
+              f"({row['duration_minutes']} min, {row['attendee_count']} attendees)")
+    print()
+    if args.offset + len(rows) < total:
+        print(f"💡 Next page: --offset {args.offset + len(rows)}")
+
+def cmd_topics(catalog, args):
+    since = days_ago(args.within) if args.within is not None else None
+    total, rows = catalog.topics(since=since, limit=args.limit, offset=args.offset)
+
+    if args.json:
+        print(json.dumps({'total': total, 'offset': args.offset, 'topics': rows}, indent=2))
+        return
+
+    print(page_header("🏷️  Topics", total, args.offset, len(rows)))
+    print()
+    if not rows:
+        print("  No tagged meetings")
+        print()
+        return
+    for row in rows:
+        print(f"  • {row['topic']} - {row['meetings']} meetings, last {row['last_date']}")
+    print()
+    if args.offset + len(rows) < total:
+        print(f"💡 Next page: --offset {args.offset + len(rows)}")
+
+def resolve_person(catalog, name):
+    """The one person folder matching name; exits listing the candidates if there isn't one."""
+    matches = [m for m in catalog.find_entities(name) if m['type'] == 'person']
+    if len(matches) == 1:
+        return matches[0]
+    if not matches:
+        print(f"❌ No profile found for '{name}'")
+    else:
+        print(f"Found {len(matches)} matches for '{name}':")
+        print()
+        for match in matches:
+            print(f"  • {match['slug']}" + (f" ({match['name']})" if match['name'] else ""))
+        print()
+        print("Please be more specific.")
+    sys.exit(1)
+
+def cmd_actions(catalog, args):
+    person = resolve_person(catalog, args.person) if args.person else None
+    today = datetime.now().strftime('%Y-%m-%d')
+    due_by = args.due_by
+    if args.due_within is not None:
+        due_by = (datetime.now() + timedelta(days=args.due_within)).strftime('%Y-%m-%d')
+    total, rows = catalog.action_items(
+        person_dir=person['dir'] if person else None, status=None if args.status == 'all' else args.status,
+        overdue=args.overdue, due_by=due_by, since=args.since, today=today,
+        limit=args.limit, offset=args.offset,
+    )
+
+    if args.json:
+        print(json.dumps({'total': total, 'offset': args.offset, 'person': person['dir'] if person else None,
+                          'action_items': rows}, indent=2))
+        return
+
+    label = {'open': 'Open action items', 'done': 'Completed action items'}.get(args.status, 'Action items')
+    if args.overdue:
+        label = 'Overdue action items'
+    if person:
+        label += f" involving {person['name'] or person['slug']}"
+    print(page_header(f"✅ {label}", total, args.offset, len(rows)))
+    print()
+    if not rows:
+        print("  No matching action items")
+        print()
+        return
+    for row in rows:
+        box = '[x]' if row['status'] == 'done' else '[ ]'
+        due = ''
+        if row['due']:
+            due = f" ⚠️ overdue {row['due']}" if row['status'] == 'open' and row['due'] < today else f" · due {row['due']}"
+        print(f"  {box} {row['text']}{due}")
+        source = ' - '.join(part for part in (row['date'], row['context']) if part)
+        print(f"      {row['path']}:{row['line']}" + (f" ({source})" if source else ""))
+    print()
+    if args.offset + len(rows) < total:
+        print(f"💡 Next page: --offset {args.offset + len(rows)}")
+
+def duration_label(seconds):
+    seconds = int(round(seconds or 0))
+    return f"{seconds // 60}m{seconds % 60:02d}s" if seconds >= 60 else f"{seconds}s"
+
+def cmd_conversation(catalog, args):
+    person = resolve_person(catalog, args.person) if args.person else None
+    since = args.since or (days_ago(args.within) if args.within is not None else None)
+    total, rows = catalog.conversation(
+        by=args.by, since=since, until=args.until, person_dir=person['dir'] if person else None,
+        limit=args.limit, offset=args.offset,
+    )
+
+    if args.json:
+        print(json.dumps({'total': total, 'offset': args.offset, 'by': args.by, 'conversation': rows}, indent=2))
+        return
+
+    label = f"🎙️  Conversation by {args.by}"
+    if person:
+        label += f" (meetings with {person['name'] or person['slug']})"
+    print(page_header(label, total, args.offset, len(rows)))
+    print()
+    if not rows:
+        print("  No meetings with conversation analytics (run rebuild-memory.py to backfill them)")
+        print()
+        return
+    for row in rows:
+        name = row['month'] if args.by == 'month' else (row['name'] or row['dir'].rsplit('/', 1)[-1])
+        print(f"  • {name} - {row['meetings']} meetings · you talked {round(row['talk_share'] * 100)}% · "
+              f"longest monologue {duration_label(row['longest_monologue_seconds'])} "
+              f"(avg {duration_label(row['avg_longest_monologue_seconds'])}) · "
+              f"{row['silence_gaps']} silences/meeting · {row['segments_per_minute']} segments/min")
+    print()
+    if args.offset + len(rows) < total:
+        print(f"💡 Next page: --offset {args.offset + len(rows)}")
+
+def cmd_list(catalog, args):
+    """Same output as /mem-list."""
+    kinds = {'people': 'person', 'person': 'person', 'projects': 'project', 'project': 'project',
+             'teams': 'team', 'team': 'team'}
+    kind = kinds.get(args.kind)
+
+    print("📚 Work Memory Contents")
+    print(f"Location: {catalog.memory_root}")
+    print()
+
+    for key, title, emoji in (('person', 'People', '👥'), ('project', 'Projects', '📊'), ('team', 'Teams', '🏢')):
+        if kind and key != kind:
+            continue
+        items = catalog.entities(key)
+        if not items:
+            continue
+        print(f"{emoji} {title} ({len(items)})")
+        print()
+        for item in items:
+            name = item['name'] or item['slug']
+            if key == 'project' and item['status']:
+                print(f"  • {name} [{item['status']}]")
+            elif item['role'] and item['team']:
+                print(f"  • {name} - {item['role']}, {item['team']}")
+            elif item['role']:
+                print(f"  • {name} - {item['role']}")
+            else:
+                print(f"  • {name}")
+        print()
+
+    if not kind:
+        topics = catalog.count_files('topics/')
+        if topics:
+            print(f"📖 Topics ({topics})")
+            print()
+
+    print("💡 Tip: Use /mem-view <name> to see full details")
+
+def cmd_view(catalog, args):
+    """Same output as /mem-view, plus meeting history for people."""
+    name = ' '.join(args.name)
+    matches = catalog.find_entities(name)
+    if not matches:
+        print(f"❌ No profile found for '{name}'")
+        print()
+        print("💡 Try: /mem-list to see all available profiles")
+        sys.exit(1)
+    if len(matches) > 1:
+        print(f"Found {len(matches)} matches:")
+        print()
+        for match in matches:
+            label = f" ({match['name']})" if match['name'] and match['name'].lower() != match['slug'].replace('-', ' ') else ""
+            print(f"  • {match['slug']}{label}")
+        print()
+        print("Please be more specific.")
+        sys.exit(1)
+
+    entity = matches[0]
+    location = os.path.join(catalog.memory_root, entity['dir'])
+    main_file = main_file_for(entity['type'])
+    main_path = os.path.join(location, main_file)
+
+    print(RULE)
+    print()
+    if os.path.exists(main_path):
+        with open(main_path, 'r', errors='replace') as f:
+            print(f.read().rstrip('\n'))
+    else:
+        print(f"❌ {main_file.split('.')[0].title()} not found at: {main_path}")
+    print()
+    print(RULE)
+    print()
+    print("📂 Available files:")
+    if os.path.isdir(location):
+        for f in sorted(os.listdir(location)):
+            print(f"  • {f}")
+
+    if entity['type'] == 'person':
+        interactions = catalog.count_files(f"{entity['dir']}/interactions/")
+        if interactions:
+            print()
+            print(f"💬 Interactions: {interactions} logged")
+        first_met, last_met, meetings = catalog.activity(entity['dir'])
+        if last_met:
+            print(f"🤝 First met {first_met}, last met {last_met} ({meetings} meetings)")
+        recent = catalog.meetings_with(entity['dir'])
+        if recent:
+            print()
+            print("🗓️  Recent meetings:")
+            for row in recent:
+                print(f"  • {row['date']} - {row['title']}")
+
+    print()
+    print(f"📍 Location: {location}")
+    print()
+
+def cmd_rebuild(catalog, args):
+    started = time.time()
+    indexed, _ = catalog.rebuild()
+    counts = {
+        table: catalog.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        for table in ('entities', 'meetings', 'attendees', 'interactions', 'meeting_topics', 'action_items')
+    }
+    print(f"Catalogued {indexed} files in {time.time() - started:.1f}s: "
+          f"{counts['entities']} entities, {counts['meetings']} meetings, "
+          f"{counts['attendees']} attendee links, {counts['interactions']} interactions, "
+          f"{counts['meeting_topics']} topic tags, {counts['action_items']} action items")
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the Work Memory catalog')
+    parser.add_argument('--memory-root', default=None, help='Path to WorkMemory (default: from config)')
+    parser.add_argument('--no-refresh', action='store_true',
+                        help="Don't check the tree for changes before querying")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('people', help='Find people')
+    p.add_argument('--type', choices=['internal', 'external'])
+    p.add_argument('--company')
+    p.add_argument('--team')
+    p.add_argument('--role', help='Role contains TEXT')
+    p.add_argument('--name', help='Name, slug or email contains TEXT')
+    p.add_argument('--met-within', type=int, metavar='DAYS', help='Met in the last N days')
+    p.add_argument('--not-met-within', type=int, metavar='DAYS', help='Not met in the last N days')
+    p.add_argument('--met-since', metavar='DATE', help='Last met on or after YYYY-MM-DD')
+    p.add_argument('--sort', choices=sorted(PEOPLE_SORTS), default='name')
+    p.add_argument('--desc', action='store_true', help='Sort descending')
+    p.add_argument('--limit', type=int, default=50)
+    p.add_argument('--offset', type=int, default=0)
+    p.add_argument('--json', action='store_true')
+    p.set_defaults(func=cmd_people)
+
+    p = sub.add_parser('meetings', help='Find meetings (newest first)')
+    p.add_argument('--since', metavar='DATE')
+    p.add_argument('--until', metavar='DATE')
+    p.add_argument('--within', type=int, metavar='DAYS', help='In the last N days')
+    p.add_argument('--with', dest='with_person', metavar='PERSON', help='Attendee email, name or slug')
+    p.add_argument('--title', help='Title contains TEXT')
+    p.add_argument('--topic', help='Tagged with TOPIC')
+    p.add_argument('--asc', action='store_true', help='Oldest first')
+    p.add_argument('--limit', type=int, default=50)
+    p.add_argument('--offset', type=int, default=0)
+    p.add_argument('--json', action='store_true')
+    p.set_defaults(func=cmd_meetings)
+
+    p = sub.add_parser('topics', help='Meeting topics, most used first')
+    p.add_argument('--within', type=int, metavar='DAYS', help='Only meetings in the last N days')
+    p.add_argument('--limit', type=int, default=50)
+    p.add_argument('--offset', type=int, default=0)
+    p.add_argument('--json', action='store_true')
+    p.set_defaults(func=cmd_topics)
+
+    p = sub.add_parser('actions', help='Action items from meetings, interaction logs and action-items.md')
+    p.add_argument('--person', metavar='NAME', help='Assigned to NAME, or from their meetings and logs')
+    p.add_argument('--status', choices=['open', 'done', 'all'], default='open')
+    p.add_argument('--overdue', action='store_true', help='Open items past their due date')
+    p.add_argument('--due-by', metavar='DATE', help='Due on or before YYYY-MM-DD')
+    p.add_argument('--due-within', type=int, metavar='DAYS', help='Due in the next N days (or overdue)')
+    p.add_argument('--since', metavar='DATE', help='From meetings/entries on or after YYYY-MM-DD')
+    p.add_argument('--limit', type=int, default=50)
+    p.add_argument('--offset', type=int, default=0)
+    p.add_argument('--json', action='store_true')
+    p.set_defaults(func=cmd_actions)
+
+    p = sub.add_parser('conversation', help='Talk share, monologues, silences and pace per month or person')
+    p.add_argument('--by', choices=['month', 'person'], default='month')
+    p.add_argument('--person', metavar='NAME', help='Only meetings NAME attended')
+    p.add_argument('--since', metavar='DATE')
+    p.add_argument('--until', metavar='DATE')
+    p.add_argument('--within', type=int, metavar='DAYS', help='Only meetings in the last N days')
+    p.add_argument('--limit', type=int, default=50)
+    p.add_argument('--offset', type=int, default=0)
+    p.add_argument('--json', action='store_true')
+    p.set_defaults(func=cmd_conversation)
+
+    p = sub.add_parser('list', help='/mem-list output')
+    p.add_argument('kind', nargs='?', default='all')
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser('view', help='/mem-view output')
+    p.add_argument('name', nargs='+')
+    p.set_defaults(func=cmd_view)
+
+    p = sub.add_parser('rebuild', help='Recreate the catalog from disk')
+    p.set_defaults(func=cmd_rebuild)
+
+    args = parser.parse_args()
+    memory_root = args.memory_root or get_memory_root()
+    catalog = open_catalog(memory_root, refresh=not args.no_refresh and args.command != 'rebuild')
+    try:
+        args.func(catalog, args)
+    finally:
+        catalog.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Regenerate meeting files, interaction logs and activity logs from Granola
+
+Re-renders every file log-meeting-to-memory.py derived from the Granola
+cache with the current templates (memory_templates.py), on a process pool,
+into a hard-linked staging tree that then replaces MEMORY_ROOT in one
+rename. Summaries, key points, action items, outcomes, topics and any
+entries written by hand are kept (see memory_rebuild.py).
+
+If anything writes to the memory tree while it runs (a meeting logged,
+a profile edited), the swap is skipped and the result left in
+MEMORY_ROOT.rebuild-staging; run it again, or pass --force.
+
+Usage:
+    python3 rebuild-memory.py                        # Regenerate everything and swap it in
+    python3 rebuild-memory.py --since 2026-01 --workers 8
+    python3 rebuild-memory.py --no-swap              # Leave the result in MEMORY_ROOT.rebuild-staging
+    python3 rebuild-memory.py --workers 1 --json     # Phase timings, for benchmarking
+"""
+
+import json
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(__file__))
+from memory_config import get_memory_root, get_org_name, get_user_domain, get_user_email
+from memory_rebuild import rebuild, staging_paths
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate derived memory files from the Granola cache')
+    parser.add_argument('--memory-root', default=None, help='Override memory root from config')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Render processes (default: CPU count)')
+    parser.add_argument('--since', help='Only regenerate months from YYYY-MM on')
+    parser.add_argument('--until', help='Only regenerate months up to YYYY-MM')
+    parser.add_argument('--no-swap', action='store_true', help='Build the staging tree but leave MEMORY_ROOT alone')
+    parser.add_argument('--keep-previous', action='store_true',
+                        help='Keep the replaced tree as MEMORY_ROOT.rebuild-previous')
+    parser.add_argument('--force', action='store_true', help='Swap even if the live tree changed during the rebuild')
+    parser.add_argument('--json', action='store_true', help='Print the result (stats, timings) as JSON')
+    args = parser.parse_args()
+
+    memory_root = args.memory_root or get_memory_root()
+    if not os.path.isdir(memory_root):
+        print(f"ERROR: Memory root not found: {memory_root}", file=sys.stderr)
+        sys.exit(1)
+
+    log = (lambda message: print(message, file=sys.stderr)) if args.json else print
+    result = rebuild(
+        memory_root, get_user_email(), get_user_domain(), get_org_name(),
+        workers=max(1, args.workers), since=args.since, until=args.until,
+        swap=not args.no_swap, keep_previous=args.keep_previous, force=args.force, log=log,
+    )
+
+    if args.json:
+        print(json.dumps(dict(result, written=len(result['written'])), indent=2))
+    else:
+        stats = result['stats']
+        print(f"Regenerated {stats.get('meetings', 0)} meeting(s) across {len(result['months'])} month(s)")
+        print(f"  {stats.get('meetings_written', 0)} meeting file(s) changed, "
+              f"{stats.get('sections_kept', 0)} edited section(s) kept")
+        print(f"  {stats.get('interaction_files', 0)} interaction log(s), {stats.get('log_files', 0)} activity log(s), "
+              f"{stats.get('activity_files', 0)} project/team activity log(s), "
+              f"{stats.get('profiles_created', 0)} new profile(s)")
+        print("  " + ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in result['timings'].items()))
+
+    staging = staging_paths(memory_root)[0]
+    if result['conflicts']:
+        print(f"Not swapped: {len(result['conflicts'])} file(s) changed in {memory_root} during the rebuild:",
+              file=sys.stderr)
+        for rel in result['conflicts'][:10]:
+            print(f"  {rel}", file=sys.stderr)
+        print(f"The rebuilt tree is in {staging}; run again, or use --force", file=sys.stderr)
+        sys.exit(1)
+    if not result['swapped']:
+        print(f"Rebuilt tree left in {staging}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Find related meetings and people in Work Memory
+
+Scores every meeting file and interaction log against a topic (or against
+an existing meeting) with TF-IDF cosine similarity, using the index under
+MEMORY_ROOT/config/index/related/. log-meeting-to-memory.py extends the
+index as meetings are logged; `build` recreates it from disk.
+
+Usage:
+    python3 related-memory.py topic <text...>             # Meetings and people
+    python3 related-memory.py meetings <text...> [--limit N]
+    python3 related-memory.py meetings --like meetings/2026-01/2026-01-29-pricing.md
+    python3 related-memory.py people <text...> [--limit N]
+    python3 related-memory.py build
+
+Optional:
+    pip install numpy    # Vectorized scoring (recommended above ~1000 meetings)
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(__file__))
+from related_index import RelatedIndex, rebuild_index, NUMPY_AVAILABLE, META_FILE
+from memory_catalog import open_catalog
+from memory_config import get_memory_root
+
+def load_index(memory_root):
+    """Load the index, building it on first use."""
+    index = RelatedIndex(memory_root).load()
+    if not index.docs and not os.path.exists(os.path.join(index.dir, META_FILE)):
+        print("Building related-meetings index (first run)...", file=sys.stderr)
+        index = rebuild_index(memory_root)
+    return index
+
+def make_query(index, args):
+    """(query vector, label, path to exclude) from the text or --like argument."""
+    if args.like:
+        full = os.path.abspath(args.like) if os.path.exists(args.like) else os.path.join(index.memory_root, args.like)
+        rel = os.path.relpath(full, index.memory_root).replace(os.sep, '/')
+        if rel not in index.positions:
+            print(f"ERROR: {args.like} is not in the index (try: related-memory.py build)", file=sys.stderr)
+            sys.exit(1)
+        doc = index.docs[index.positions[rel]]
+        return index.document_vector(rel), doc['title'] or rel, rel
+    text = ' '.join(args.text)
+    if not text:
+        print("ERROR: give a topic or --like <meeting file>", file=sys.stderr)
+        sys.exit(1)
+    return index.query_vector(text), text, None
+
+def resolve_people(memory_root, ranked, limit):
+    """Merge person keys (attendee emails, profile folders) into named people."""
+    catalog = open_catalog(memory_root, refresh=False)
+    try:
+        merged = {}
+        for key, score, documents in ranked:
+            if key.startswith('dir:'):
+                row = catalog.conn.execute('SELECT * FROM entities WHERE dir = ?', (key[4:],)).fetchone()
+            else:
+                row = catalog.conn.execute(
+                    "SELECT * FROM entities WHERE type = 'person' AND email = ?", (key,)
+                ).fetchone()
+            ident = row['dir'] if row else key
+            label = (row['name'] or row['slug']) if row else key
+            entry = merged.setdefault(ident, {'label': label, 'score': 0.0, 'documents': 0})
+            entry['score'] += score
+            entry['documents'] += documents
+    finally:
+        catalog.close()
+    return sorted(merged.values(), key=lambda e: e['score'], reverse=True)[:limit]
+
+def show_meetings(index, query, label, exclude, limit, sims):
+    results = index.related_meetings(query, limit=limit, exclude=exclude, sims=sims)
+    print(f"🔗 Meetings related to \"{label}\"")
+    print()
+    if not results:
+        print("  No related meetings found")
+        print()
+        return
+    for doc, score in results:
+        print(f"  • {doc['date']} - {doc['title'] or os.path.basename(doc['path'])} ({score:.2f})")
+        print(f"    {doc['path']}")
+    print()
+
+def show_people(index, query, label, exclude, limit, sims):
+    ranked = index.related_people(query, limit=limit * 3, exclude=exclude, sims=sims)
+    people = resolve_people(index.memory_root, ranked, limit)
+    print(f"👥 People most associated with \"{label}\"")
+    print()
+    if not people:
+        print("  No related people found")
+        print()
+        return
+    for person in people:
+        print(f"  • {person['label']} - {person['documents']} related meetings/notes (score {person['score']:.2f})")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description='Find related meetings and people')
+    parser.add_argument('--memory-root', default=None, help='Path to WorkMemory (default: from config)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('topic', 'Related meetings and people'),
+                            ('meetings', 'Most similar past meetings'),
+                            ('people', 'People most associated with a topic')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('text', nargs='*')
+        p.add_argument('--like', metavar='PATH', help='Use an existing meeting file as the query')
+        p.add_argument('--limit', type=int, default=10)
+
+    sub.add_parser('build', help='Rebuild the index from disk')
+
+    args = parser.parse_args()
+    memory_root = args.memory_root or get_memory_root()
+
+    if args.command == 'build':
+        started = time.time()
+        index = rebuild_index(memory_root)
+        print(f"Indexed {len(index.docs)} documents ({len(index.terms)} terms) "
+              f"in {time.time() - started:.1f}s")
+        return
+
+    index = load_index(memory_root)
+    started = time.time()
+    query, label, exclude = make_query(index, args)
+    sims = index.similarities(query)
+    if args.command in ('topic', 'meetings'):
+        show_meetings(index, query, label, exclude, args.limit, sims)
+    if args.command in ('topic', 'people'):
+        show_people(index, query, label, exclude, args.limit, sims)
+    print(f"({len(index.docs)} documents scored in {(time.time() - started) * 1000:.0f} ms"
+          f"{'' if NUMPY_AVAILABLE else ', install numpy for faster scoring'})")
+
+if __name__ == '__main__':
+    main()
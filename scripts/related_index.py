@@ -0,0 +1,407 @@
+"""
+TF-IDF index over meeting files and interaction logs.
+
+Meetings and people were only connected by explicit attendee lists, so
+finding earlier meetings on the same subject meant grepping. This index
+keeps a sparse term-count row per document and answers "meetings similar
+to this text/meeting" and "people most associated with this topic" with
+cosine similarity - fully local, no external models.
+
+Layout under MEMORY_ROOT/config/index/related/:
+
+- meta.json   vocabulary, document frequencies and one entry per document
+              (path, kind, title, date, people, offset/length of its row)
+- terms.bin   array('I') term IDs of every row, appended in document order
+- counts.bin  array('f') raw term counts, parallel to terms.bin
+
+Rows are append-only: adding a document appends its row and rewrites
+meta.json, re-indexing a path points it at a new row (the old one is
+dropped on the next rebuild). Raw counts are stored rather than weights,
+so IDF is always computed from the current document frequencies.
+
+With NumPy the whole corpus is scored at once (bincount over the flattened
+rows); without it the same scoring runs document by document.
+"""
+
+import fcntl
+import json
+import math
+import os
+import re
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+
+from importlib.util import find_spec
+
+# Loaded by similarities() on first use, not at import
+NUMPY_AVAILABLE = find_spec('numpy') is not None
+np = None
+
+def _numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+import memory_archive
+from memory_tree import FRONTMATTER_RE, parse_frontmatter, entity_of, SKIP_DIRS
+from memory_catalog import ATTENDEE_RE
+from memory_templates import ENTRY_KEY_RE
+
+INDEX_DIR = os.path.join('config', 'index', 'related')
+META_FILE = 'meta.json'
+TERMS_FILE = 'terms.bin'
+COUNTS_FILE = 'counts.bin'
+LOCK_FILE = 'lock'
+INDEX_VERSION = 1
+
+TOKEN_RE = re.compile(r"[a-z][a-z0-9']+")
+
+# English function words, conversational filler from transcripts, and the
+# words of the meeting/interaction templates (headings and boilerplate)
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before
+being below between both but by can can't cannot could couldn't did didn't do does doesn't doing
+don't down during each few for from further had hadn't has hasn't have haven't having he he'd he'll
+he's her here here's hers herself him himself his how how's i i'd i'll i'm i've if in into is isn't
+it it's its itself let's me more most mustn't my myself no nor not of off on once only or other
+ought our ours ourselves out over own same shan't she she'd she'll she's should shouldn't so some
+such than that that's the their theirs them themselves then there there's these they they'd
+they'll they're they've this those through to too under until up very was wasn't we we'd we'll
+we're we've were weren't what what's when when's where where's which while who who's whom why
+why's with won't would wouldn't you you'd you'll you're you've your yours yourself yourselves
+yeah yes okay ok um uh uhm hmm mm like just really actually basically kind sort gonna wanna
+gotta thing things stuff know think mean right well maybe pretty lot lots get got go going
+see say said saying want will one two also make sure good great cool thanks thank
+meeting meetings summary key points action items item notes note transcript preview review
+update auto captured granola needs duration minutes minute segments split merged truncated
+interactions interaction type details log logged
+""".split())
+
+MIN_TOKEN_LENGTH = 3
+
+def tokenize(text):
+    """Lowercase word tokens minus stopwords and very short words."""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        token = token.strip("'")
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+def describe_document(rel_path, text):
+    """
+    (kind, title, date, people, body) for a meeting file or interaction log,
+    or None for anything else.
+
+    Meeting people are attendee emails from the frontmatter; an interaction
+    log belongs to its profile folder ("dir:people/<type>/<slug>").
+    """
+    fields = parse_frontmatter(text)
+    match = FRONTMATTER_RE.match(text)
+    header = match.group(1) if match else ''
+    body = text[match.end():] if match else text
+
+    if rel_path.startswith('meetings/'):
+        title = fields.get('title', '')
+        date = fields.get('date') or os.path.basename(rel_path)[:10]
+        people = sorted({email.lower() for email, _ in ATTENDEE_RE.findall(header)})
+        return 'meeting', title, date, people, f"{title}\n{body}"
+
+    etype, edir = entity_of(rel_path)
+    if etype == 'person' and '/interactions/' in rel_path:
+        month = os.path.splitext(os.path.basename(rel_path))[0]
+        # Entry keys (doc IDs) aren't words of the conversation
+        return 'interaction', f"{edir.rsplit('/', 1)[-1]} {month}", month, [f"dir:{edir}"], ENTRY_KEY_RE.sub('', body)
+    return None
+
+def index_dir(memory_root):
+    return os.path.join(memory_root, INDEX_DIR)
+
+@contextmanager
+def index_lock(memory_root):
+    """Exclusive lock for writers (log-meeting workers can run in parallel)."""
+    path = index_dir(memory_root)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, LOCK_FILE), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+class RelatedIndex:
+    """Sparse term-count rows plus document frequencies for one memory root."""
+
+    def __init__(self, memory_root):
+        self.memory_root = memory_root
+        self.dir = index_dir(memory_root)
+        self.terms = []          # term ID -> term
+        self.term_ids = {}       # term -> term ID
+        self.df = array('I')     # term ID -> number of live documents containing it
+        self.docs = []           # live documents, in row order
+        self.positions = {}      # path -> index into self.docs
+        self.row_terms = array('I')
+        self.row_counts = array('f')
+        self.pending = []        # (doc, term_ids, counts) not yet written
+
+    # -- persistence ------------------------------------------------------
+
+    def load(self):
+        meta_path = os.path.join(self.dir, META_FILE)
+        if not os.path.exists(meta_path):
+            return self
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        if meta.get('version') != INDEX_VERSION:
+            return self
+        self.terms = meta['terms']
+        self.term_ids = {term: i for i, term in enumerate(self.terms)}
+        self.df = array('I', meta['df'])
+        self.docs = meta['docs']
+        self.positions = {doc['path']: i for i, doc in enumerate(self.docs)}
+        # Rows past the last one meta.json references are never read
+        self.row_terms = self._read_array('I', TERMS_FILE)
+        self.row_counts = self._read_array('f', COUNTS_FILE)
+        return self
+
+    def _read_array(self, typecode, name):
+        values = array(typecode)
+        path = os.path.join(self.dir, name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                values.frombytes(f.read())
+        return values
+
+    def save(self):
+        """Append pending rows and atomically replace meta.json."""
+        os.makedirs(self.dir, exist_ok=True)
+        if self.pending:
+            # Drop any unreferenced tail (a writer that died before replacing
+            # meta.json) so both files stay aligned
+            offset = max((doc['offset'] + doc['length'] for doc in self.docs if 'offset' in doc), default=0)
+            for name, itemsize in ((TERMS_FILE, self.row_terms.itemsize), (COUNTS_FILE, self.row_counts.itemsize)):
+                path = os.path.join(self.dir, name)
+                with open(path, 'ab') as f:
+                    f.truncate(offset * itemsize)
+            new_terms, new_counts = array('I'), array('f')
+            for doc, term_ids, counts in self.pending:
+                doc['offset'] = offset + len(new_terms)
+                doc['length'] = len(term_ids)
+                new_terms.extend(term_ids)
+                new_counts.extend(counts)
+            with open(os.path.join(self.dir, TERMS_FILE), 'ab') as f:
+                new_terms.tofile(f)
+            with open(os.path.join(self.dir, COUNTS_FILE), 'ab') as f:
+                new_counts.tofile(f)
+            self.row_terms = self._read_array('I', TERMS_FILE)
+            self.row_counts = self._read_array('f', COUNTS_FILE)
+            self.pending = []
+
+        meta = {
+            'version': INDEX_VERSION,
+            'terms': self.terms,
+            'df': self.df.tolist(),
+            'docs': self.docs,
+        }
+        path = os.path.join(self.dir, META_FILE)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, path)
+
+    # -- building ---------------------------------------------------------
+
+    def _row(self, doc):
+        """(term_ids, counts) of a saved or pending document."""
+        if 'offset' in doc:
+            start, end = doc['offset'], doc['offset'] + doc['length']
+            return self.row_terms[start:end], self.row_counts[start:end]
+        for pending_doc, term_ids, counts in self.pending:
+            if pending_doc is doc:
+                return term_ids, counts
+        return array('I'), array('f')
+
+    def add(self, rel_path, text):
+        """Index (or re-index) one file. Returns False if it isn't a meeting or interaction log."""
+        described = describe_document(rel_path, text)
+        if described is None:
+            return False
+        kind, title, date, people, body = described
+
+        if rel_path in self.positions:
+            old = self.docs[self.positions[rel_path]]
+            for term_id in self._row(old)[0]:
+                self.df[term_id] -= 1
+            self.pending = [p for p in self.pending if p[0] is not old]
+
+        counts = Counter(tokenize(body))
+        term_ids, values = array('I'), array('f')
+        for term, count in counts.items():
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                term_id = len(self.terms)
+                self.terms.append(term)
+                self.term_ids[term] = term_id
+                self.df.append(0)
+            self.df[term_id] += 1
+            term_ids.append(term_id)
+            values.append(count)
+
+        doc = {'path': rel_path, 'kind': kind, 'title': title, 'date': date, 'people': people}
+        if rel_path in self.positions:
+            self.docs[self.positions[rel_path]] = doc
+        else:
+            self.positions[rel_path] = len(self.docs)
+            self.docs.append(doc)
+        self.pending.append((doc, term_ids, values))
+        return True
+
+    def remove(self, rel_path):
+        if rel_path not in self.positions:
+            return
+        old = self.docs[self.positions[rel_path]]
+        for term_id in self._row(old)[0]:
+            self.df[term_id] -= 1
+        self.pending = [p for p in self.pending if p[0] is not old]
+        del self.docs[self.positions[rel_path]]
+        self.positions = {doc['path']: i for i, doc in enumerate(self.docs)}
+
+    # -- scoring ----------------------------------------------------------
+
+    def idf(self, term_id):
+        return math.log((1 + len(self.docs)) / (1 + self.df[term_id])) + 1.0
+
+    def query_vector(self, text):
+        """Sparse TF-IDF weights {term_id: weight} for free text (unknown terms dropped)."""
+        counts = Counter(t for t in tokenize(text) if t in self.term_ids)
+        return {self.term_ids[t]: (1 + math.log(c)) * self.idf(self.term_ids[t]) for t, c in counts.items()}
+
+    def document_vector(self, rel_path):
+        doc = self.docs[self.positions[rel_path]]
+        term_ids, counts = self._row(doc)
+        return {t: (1 + math.log(c)) * self.idf(t) for t, c in zip(term_ids, counts)}
+
+    def similarities(self, query):
+        """Cosine similarity of every document (in self.docs order) to a sparse query vector."""
+        if not query or not self.docs:
+            return [0.0] * len(self.docs)
+        qnorm = math.sqrt(sum(w * w for w in query.values()))
+
+        if NUMPY_AVAILABLE:
+            np = _numpy()
+            ids, counts, rows = self._flat_rows()
+            idf = np.log((1 + len(self.docs)) / (1 + np.frombuffer(self.df, dtype=np.uint32))) + 1.0
+            weights = (1 + np.log(counts)) * idf[ids]
+            q = np.zeros(len(self.terms))
+            q[list(query)] = list(query.values())
+            n = len(self.docs)
+            norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))
+            dots = np.bincount(rows, weights=weights * q[ids], minlength=n)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sims = np.where(norms > 0, dots / (norms * qnorm), 0.0)
+            return sims
+
+        sims = []
+        for doc in self.docs:
+            term_ids, counts = self._row(doc)
+            dot = norm = 0.0
+            for t, c in zip(term_ids, counts):
+                w = (1 + math.log(c)) * self.idf(t)
+                norm += w * w
+                dot += w * query.get(t, 0.0)
+            sims.append(dot / (math.sqrt(norm) * qnorm) if norm else 0.0)
+        return sims
+
+    def _flat_rows(self):
+        """Concatenated (term_ids, counts, row_number) arrays of the live documents."""
+        np = _numpy()
+        all_terms = np.frombuffer(self.row_terms, dtype=np.uint32)
+        all_counts = np.frombuffer(self.row_counts, dtype=np.float32)
+        pieces_t, pieces_c, lengths = [], [], []
+        for doc in self.docs:
+            term_ids, counts = self._row(doc)
+            if 'offset' in doc:
+                start = doc['offset']
+                pieces_t.append(all_terms[start:start + doc['length']])
+                pieces_c.append(all_counts[start:start + doc['length']])
+            else:
+                pieces_t.append(np.frombuffer(term_ids, dtype=np.uint32))
+                pieces_c.append(np.frombuffer(counts, dtype=np.float32))
+            lengths.append(len(term_ids))
+        if not pieces_t:
+            return np.zeros(0, np.uint32), np.zeros(0, np.float32), np.zeros(0, np.int64)
+        rows = np.repeat(np.arange(len(self.docs)), lengths)
+        return np.concatenate(pieces_t), np.concatenate(pieces_c).astype(np.float64), rows
+
+    def related_meetings(self, query, limit=10, exclude=None, sims=None):
+        """Top meetings by similarity: list of (doc, score)."""
+        sims = self.similarities(query) if sims is None else sims
+        ranked = sorted(
+            ((score, i) for i, score in enumerate(sims)
+             if score > 0 and self.docs[i]['kind'] == 'meeting' and self.docs[i]['path'] != exclude),
+            reverse=True,
+        )
+        return [(self.docs[i], float(score)) for score, i in ranked[:limit]]
+
+    def related_people(self, query, limit=10, exclude=None, sims=None):
+        """
+        People ranked by the summed similarity of the meetings they attended
+        and their own interaction notes: list of (person_key, score, documents).
+        """
+        sims = self.similarities(query) if sims is None else sims
+        scores, documents = Counter(), Counter()
+        for i, score in enumerate(sims):
+            if score <= 0 or self.docs[i]['path'] == exclude:
+                continue
+            for person in self.docs[i]['people']:
+                scores[person] += float(score)
+                documents[person] += 1
+        return [(person, score, documents[person]) for person, score in scores.most_common(limit)]
+
+def iter_documents(memory_root):
+    """(rel_path, text) of every meeting file and interaction log, live or archived."""
+    for rel, text in memory_archive.iter_texts(memory_root):
+        if rel.startswith('meetings/') or '/interactions/' in rel:
+            yield rel, text
+    for dirpath, dirnames, filenames in os.walk(memory_root):
+        if dirpath == memory_root:
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in sorted(filenames):
+            if not name.endswith('.md'):
+                continue
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, memory_root).replace(os.sep, '/')
+            if not (rel.startswith('meetings/') or '/interactions/' in rel):
+                continue
+            with open(full, 'r', errors='replace') as f:
+                yield rel, f.read()
+
+def rebuild_index(memory_root):
+    """Re-index every meeting and interaction log from disk. Returns the new index."""
+    with index_lock(memory_root):
+        for name in (META_FILE, TERMS_FILE, COUNTS_FILE):
+            path = os.path.join(index_dir(memory_root), name)
+            if os.path.exists(path):
+                os.remove(path)
+        index = RelatedIndex(memory_root)
+        for rel, text in iter_documents(memory_root):
+            index.add(rel, text)
+        index.save()
+    return index
+
+def update_index(memory_root, paths):
+    """Add or re-index specific files (absolute or root-relative) in place."""
+    with index_lock(memory_root):
+        index = RelatedIndex(memory_root).load()
+        for path in paths:
+            full = path if os.path.isabs(path) else os.path.join(memory_root, path)
+            rel = os.path.relpath(full, memory_root).replace(os.sep, '/')
+            if os.path.exists(full):
+                with open(full, 'r', errors='replace') as f:
+                    index.add(rel, f.read())
+            else:
+                index.remove(rel)
+        index.save()
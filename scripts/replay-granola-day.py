@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Replay a day of Granola activity against the sync daemons and measure
+end-to-end sync latency
+
+The SLO that matters is "meeting ended -> meeting file and profiles
+written". This harness rewrites a private cache-v3.json on an accelerated
+clock as the day unfolds: documents appear when meetings start, transcript
+segments arrive as they are spoken, split meetings grow an untitled
+continuation document, and calendar events end. The real watch-granola.py
+and/or smart-meeting-sync.py run unmodified against it, with HOME pointed
+at a temporary directory (so both the cache and MEMORY_ROOT are throwaway)
+and their clocks accelerated by sim_clock.py.
+
+When the day (plus a drain period) is over it reports, per daemon:
+- sync lag percentiles (last transcript segment -> sync job finished)
+- meetings missed (no meeting file), duplicated (more than one file) or
+  synced before they ended (the rest of the transcript is lost)
+- meeting files whose catalog row (config/catalog.db) lost their duration
+- CPU time the daemon process itself used, i.e. polling and scheduling
+  overhead (the per-meeting syncs run in child processes and are excluded)
+
+Usage:
+    python3 replay-granola-day.py                           # Synthetic day, both daemons
+    python3 replay-granola-day.py --daemon watch --meetings 12 --seed 7
+    python3 replay-granola-day.py --cache cache-v3.json --date 2026-01-29   # Recorded day
+    python3 replay-granola-day.py --speed 120 --json
+
+Exit status is 1 if any daemon missed, duplicated or prematurely synced a
+meeting, catalogued one with the wrong duration, or its p90 lag exceeded
+--slo-minutes.
+
+Note: the syncs themselves take real time, which the speed factor stretches
+(at --speed 60 one real second of sync work is a simulated minute). Lag
+figures are therefore upper bounds; lower --speed for tighter numbers.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+from granola_meetings import detect_split_meetings
+from granola_segments import parse_epoch, format_epoch, build_segment_tables
+from sim_clock import Clock
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DAEMONS = {
+    'watch': ['watch-granola.py'],
+    'smart': ['smart-meeting-sync.py', '--daemon'],
+}
+CACHE_SUBPATH = os.path.join('Library', 'Application Support', 'Granola', 'cache-v3.json')
+CONFIG_SUBPATH = os.path.join('.claude', 'skills', 'memory-management', 'memory-management.local.md')
+
+USER_EMAIL = 'tony.kipkemboi@guild.com'
+USER_DOMAIN = 'guild.com'
+
+# -- scenarios ---------------------------------------------------------------
+#
+# A scenario is a list of documents, each {'doc': <static Granola fields>,
+# 'appears_at': sim epoch, 'segments': [(start, end, source, text), ...]},
+# plus the day's calendar events. Times are simulated epoch seconds.
+
+TOPICS = {
+    'Pricing review': ['pricing', 'annual billing', 'discount', 'enterprise tier', 'churn'],
+    'Hiring sync': ['hiring plan', 'data engineers', 'interview loop', 'offer', 'headcount'],
+    'Roadmap planning': ['roadmap', 'migration', 'milestones', 'dependencies', 'launch date'],
+    'Customer onboarding': ['onboarding flow', 'activation', 'drop-off', 'tutorial', 'support tickets'],
+    'Infra weekly': ['database', 'latency', 'incident', 'on-call', 'capacity'],
+    'Partnership call': ['integration', 'contract', 'pilot', 'renewal', 'procurement'],
+}
+SENTENCES = [
+    "I think we should look at the {a} before we commit to the {b}.",
+    "The {a} numbers from last week changed how I see the {b}.",
+    "Can we get an owner for the {a}? The {b} depends on it.",
+    "Let's revisit the {a} next time and settle the {b} today.",
+    "My concern with the {a} is mostly about the {b}.",
+]
+COMPANIES = ['acme.io', 'globex.com', 'initech.com']
+
+def synthetic_day(day, meetings, seed, split_rate=0.2, adhoc_rate=0.15):
+    """A workday of back-to-back and spaced meetings, some split, some off-calendar."""
+    rng = random.Random(seed)
+    internal = [(f"Teammate {i}", f"teammate{i}@{USER_DOMAIN}") for i in range(12)]
+    external = [(f"Contact {i}", f"contact{i}@{rng.choice(COMPANIES)}") for i in range(20)]
+
+    documents, events, titles = [], [], set()
+    cursor = day.replace(hour=9, minute=0, second=0, microsecond=0).timestamp()
+    for n in range(meetings):
+        topic = rng.choice(list(TOPICS))
+        title = topic
+        while title in titles:
+            title = f"{topic} {rng.randint(2, 99)}"
+        titles.add(title)
+
+        scheduled = rng.choice([30, 30, 45, 60]) * 60
+        slot = cursor
+        start = slot + rng.uniform(0, 180)                       # People join late
+        end = slot + scheduled + rng.uniform(-600, 300)          # ...and end early or overrun
+        cursor += scheduled + rng.choice([0, 0, 5, 15, 30, 60]) * 60
+
+        people = rng.sample(internal, rng.randint(1, 3))
+        if rng.random() < 0.6:
+            people += rng.sample(external, rng.randint(1, 2))
+        attendees = [{'email': email, 'displayName': name} for name, email in people]
+        attendees.append({'email': USER_EMAIL, 'self': True})
+
+        doc_id = f"sim-{n:03d}"
+        doc = {
+            'id': doc_id,
+            'title': title,
+            'created_at': format_epoch(start),
+            'updated_at': format_epoch(end),
+            'notes_plain': ', '.join(rng.sample(TOPICS[topic], 3)),
+            'overview': '',
+            'people': {'attendees': []},
+        }
+        adhoc = rng.random() < adhoc_rate
+        if not adhoc:
+            event = {
+                'id': f"event-{n:03d}",
+                'summary': title,
+                'start': {'dateTime': datetime.fromtimestamp(slot).astimezone().isoformat()},
+                'end': {'dateTime': datetime.fromtimestamp(slot + scheduled).astimezone().isoformat()},
+                'attendees': attendees,
+            }
+            doc['google_calendar_event'] = event
+            events.append(event)
+        else:
+            doc['people']['attendees'] = [{'email': a['email']} for a in attendees if not a.get('self')]
+
+        segments = spoken_segments(rng, TOPICS[topic], start, end)
+        if rng.random() < split_rate and len(segments) > 20:
+            # Granola starts a new untitled document mid-meeting; the two
+            # overlap by a segment or two
+            cut = rng.randint(len(segments) // 3, 2 * len(segments) // 3)
+            overlap = rng.randint(0, 2)
+            documents.append({'doc': doc, 'appears_at': start, 'segments': segments[:cut]})
+            documents.append({
+                'doc': {'id': f"{doc_id}-cont", 'title': '', 'created_at': format_epoch(segments[cut][0])},
+                'appears_at': segments[cut - overlap][0],
+                'segments': segments[cut - overlap:],
+            })
+        else:
+            documents.append({'doc': doc, 'appears_at': start, 'segments': segments})
+    return documents, events
+
+def spoken_segments(rng, words, start, end):
+    segments = []
+    t = start
+    while t < end:
+        length = rng.uniform(3, 9)
+        a, b = rng.sample(words, 2)
+        source = 'microphone' if rng.random() < 0.4 else 'system'
+        segments.append((t, min(t + length, end), source, rng.choice(SENTENCES).format(a=a, b=b)))
+        t += length + rng.uniform(0.2, 2)
+    return segments
+
+def shift_iso(value, delta):
+    """Shift an ISO timestamp string by delta seconds, keeping its style."""
+    if not isinstance(value, str) or not value:
+        return value
+    if value.endswith('Z'):
+        epoch = parse_epoch(value)
+        return value if math.isnan(epoch) else format_epoch(epoch + delta)
+    try:
+        return (datetime.fromisoformat(value) + timedelta(seconds=delta)).isoformat()
+    except ValueError:
+        return value
+
+def shift_event(event, delta):
+    event = dict(event)
+    for key in ('start', 'end'):
+        if isinstance(event.get(key), dict):
+            event[key] = {k: shift_iso(v, delta) for k, v in event[key].items()}
+    return event
+
+def recorded_day(cache_path, date, day):
+    """The documents and calendar events of one recorded day, moved onto `day`."""
+    with open(cache_path, 'r') as f:
+        state = json.loads(json.load(f).get('cache', '')).get('state', {})
+    recorded = datetime.strptime(date, '%Y-%m-%d')
+    delta = day.replace(hour=0, minute=0, second=0, microsecond=0).timestamp() - recorded.timestamp()
+
+    documents = []
+    for doc_id, segments in (state.get('transcripts') or {}).items():
+        doc = (state.get('documents') or {}).get(doc_id)
+        if not isinstance(doc, dict) or not isinstance(segments, list) or not segments:
+            continue
+        spoken = []
+        for seg in segments:
+            s, e = parse_epoch(seg.get('start_timestamp')), parse_epoch(seg.get('end_timestamp'))
+            if math.isnan(s) or math.isnan(e):
+                continue
+            spoken.append((s + delta, e + delta, seg.get('source', 'unknown'), seg.get('text', '')))
+        if not spoken or datetime.fromtimestamp(spoken[0][0] - delta).strftime('%Y-%m-%d') != date:
+            continue
+        doc = dict(doc)
+        for key in ('created_at', 'updated_at'):
+            doc[key] = shift_iso(doc.get(key), delta)
+        if isinstance(doc.get('google_calendar_event'), dict):
+            doc['google_calendar_event'] = shift_event(doc['google_calendar_event'], delta)
+        documents.append({'doc': doc, 'appears_at': spoken[0][0], 'segments': sorted(spoken)})
+
+    events = [
+        shift_event(event, delta) for event in state.get('events') or []
+        if isinstance(event, dict)
+        and date in ((event.get('start') or {}).get('dateTime', '') or (event.get('start') or {}).get('date', ''))
+    ]
+    return documents, events
+
+def snapshot(documents, events, now):
+    """The Granola state as it would look at sim time `now`."""
+    docs, transcripts = {}, {}
+    for item in documents:
+        if item['appears_at'] > now:
+            continue
+        doc_id = item['doc']['id']
+        docs[doc_id] = item['doc']
+        spoken = [
+            {
+                'id': f"{doc_id}-{i}",
+                'document_id': doc_id,
+                'start_timestamp': format_epoch(s),
+                'end_timestamp': format_epoch(e),
+                'source': source,
+                'text': text,
+                'is_final': True,
+            }
+            for i, (s, e, source, text) in enumerate(item['segments']) if e <= now
+        ]
+        if spoken:
+            transcripts[doc_id] = spoken
+    return {'documents': docs, 'transcripts': transcripts, 'events': events, 'people': [], 'meetingsMetadata': {}}
+
+def write_cache(path, state):
+    # Written in place so file watchers see a modification, but in a single
+    # write() to keep the window for torn reads short
+    payload = json.dumps({'cache': json.dumps({'state': state})})
+    with open(path, 'w') as f:
+        f.write(payload)
+
+def expected_meetings(documents, events):
+    """
+    Ground truth from the final state: {main doc ID: {'title', 'ids', 'ended'}},
+    grouping continuations the way process-granola-meetings.py does.
+    """
+    state = snapshot(documents, events, float('inf'))
+    tables = build_segment_tables(state['transcripts'])
+    splits = detect_split_meetings(state['documents'], tables)
+    continuations = {c for conts in splits.values() for c in conts}
+    expected = {}
+    for doc_id, table in tables.items():
+        if doc_id in continuations or not table:
+            continue
+        ids = [doc_id] + splits.get(doc_id, [])
+        expected[doc_id] = {
+            'title': state['documents'][doc_id].get('title') or '[Untitled]',
+            'ids': ids,
+            'ended': max(tables[i].last_end for i in ids if tables.get(i)),
+        }
+    return expected
+
+# -- running a daemon -----------------------------------------------------------
+
+def prepare_home(workdir):
+    home = os.path.join(workdir, 'home')
+    memory_root = os.path.join(workdir, 'WorkMemory')
+    for sub in ('meetings', 'people/internal', 'people/external', 'logs', 'config'):
+        os.makedirs(os.path.join(memory_root, sub), exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.join(home, CACHE_SUBPATH)), exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.join(home, CONFIG_SUBPATH)), exist_ok=True)
+    with open(os.path.join(home, CONFIG_SUBPATH), 'w') as f:
+        f.write(f"---\nmemory_root: {memory_root}\nretention_days: 365\n---\n")
+    return home, memory_root
+
+def replay(name, documents, events, clock, end, args, workdir):
+    """Run one daemon over the whole day. Returns its result dict."""
+    home, memory_root = prepare_home(workdir)
+    cache_path = os.path.join(home, CACHE_SUBPATH)
+    stats_path = os.path.join(workdir, 'cpu.json')
+    log_path = os.path.join(workdir, f'{name}.log')
+
+    write_cache(cache_path, snapshot(documents, events, clock.now()))
+    env = dict(os.environ, HOME=home, SIM_CLOCK_STATS=stats_path, PYTHONUNBUFFERED='1', **clock.env())
+    command = [sys.executable, os.path.join(SCRIPTS_DIR, 'sim_clock.py')] + \
+        [os.path.join(SCRIPTS_DIR, DAEMONS[name][0])] + DAEMONS[name][1:]
+
+    started = time.time()
+    with open(log_path, 'w') as log:
+        daemon = subprocess.Popen(command, env=env, stdout=log, stderr=subprocess.STDOUT)
+        writes, last = 0, None
+        try:
+            while clock.now() < end and daemon.poll() is None:
+                state = snapshot(documents, events, clock.now())
+                fingerprint = (len(state['documents']), sum(len(t) for t in state['transcripts'].values()))
+                if fingerprint != last:
+                    write_cache(cache_path, state)
+                    writes, last = writes + 1, fingerprint
+                clock.sleep(args.write_interval)
+        finally:
+            if daemon.poll() is None:
+                daemon.send_signal(signal.SIGINT)
+                try:
+                    daemon.wait(timeout=15)
+                except subprocess.TimeoutExpired:
+                    daemon.kill()
+                    daemon.wait()
+
+    cpu = None
+    if os.path.exists(stats_path):
+        with open(stats_path, 'r') as f:
+            usage = json.load(f)
+        cpu = usage['user'] + usage['system']
+    return {
+        'memory_root': memory_root,
+        'log': log_path,
+        'cache_writes': writes,
+        'real_seconds': time.time() - started,
+        'cpu_seconds': cpu,
+        'exit_code': daemon.returncode,
+    }
+
+# -- analysis ---------------------------------------------------------------------
+
+def synced_files(memory_root):
+    """{granola doc ID: [(path, mtime)]} for every meeting file written."""
+    found = {}
+    for dirpath, _, filenames in os.walk(os.path.join(memory_root, 'meetings')):
+        for name in filenames:
+            if not name.endswith('.md'):
+                continue
+            path = os.path.join(dirpath, name)
+            with open(path, 'r', errors='replace') as f:
+                match = re.search(r'^granola_doc_id:\s*(\S+)', f.read(4096), re.MULTILINE)
+            if match:
+                found.setdefault(match.group(1), []).append((path, os.path.getmtime(path)))
+    return found
+
+def finished_jobs(memory_root):
+    """{doc ID: (status, updated_at)} from the daemon's sync queue (sim time)."""
+    path = os.path.join(memory_root, 'config', 'sync-queue.db')
+    if not os.path.exists(path):
+        return {}
+    conn = sqlite3.connect(path)
+    try:
+        return {doc_id: (status, updated) for doc_id, status, updated
+                in conn.execute('SELECT doc_id, status, updated_at FROM jobs')}
+    finally:
+        conn.close()
+
+def catalog_mismatches(memory_root, files):
+    """Meeting files whose catalog row is missing or disagrees with their duration_minutes."""
+    path = os.path.join(memory_root, 'config', 'catalog.db')
+    if not os.path.exists(path):
+        return []
+    conn = sqlite3.connect(path)
+    try:
+        catalogued = dict(conn.execute('SELECT path, duration_minutes FROM meetings'))
+    finally:
+        conn.close()
+    mismatches = []
+    for written in files.values():
+        for full_path, _ in written:
+            rel = os.path.relpath(full_path, memory_root).replace(os.sep, '/')
+            with open(full_path, 'r', errors='replace') as f:
+                match = re.search(r'^duration_minutes:\s*(\S+)', f.read(4096), re.MULTILINE)
+            expected = float(match.group(1)) if match else 0.0
+            if rel not in catalogued:
+                mismatches.append(f"{rel} (not catalogued)")
+            elif abs(catalogued[rel] - expected) > 0.05:
+                mismatches.append(f"{rel} ({catalogued[rel]} min catalogued, {expected} in file)")
+    return sorted(mismatches)
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def analyse(expected, result, clock, sim_hours, slo_seconds):
+    files = synced_files(result['memory_root'])
+    jobs = finished_jobs(result['memory_root'])
+    owner = {doc_id: main for main, info in expected.items() for doc_id in info['ids']}
+
+    lags, missed, duplicated, partial, failed = {}, [], [], [], []
+    for main, info in expected.items():
+        written = [entry for doc_id in info['ids'] for entry in files.get(doc_id, [])]
+        if not written:
+            missed.append(info['title'])
+        elif len(written) > 1:
+            duplicated.append(f"{info['title']} ({len(written)} files)")
+        if any(jobs.get(doc_id, ('',))[0] == 'failed' for doc_id in info['ids']):
+            failed.append(info['title'])
+        if written:
+            done = [jobs[d][1] for d in info['ids'] if jobs.get(d, ('',))[0] == 'done']
+            finished = min(done) if done else clock.to_sim(min(mtime for _, mtime in written))
+            if finished < info['ended']:
+                # Written while the meeting was still going: the rest of the
+                # transcript never made it into Work Memory
+                partial.append(f"{info['title']} ({minutes(info['ended'] - finished)} early)")
+            else:
+                lags[main] = finished - info['ended']
+    strays = sorted(doc_id for doc_id in files if doc_id not in owner)
+
+    values = list(lags.values())
+    summary = {
+        'expected': len(expected),
+        'synced': len(values) + len(partial),
+        'missed': missed,
+        'duplicated': duplicated,
+        'partial': partial,
+        'failed_jobs': failed,
+        'unexpected_files': strays,
+        'catalog_mismatches': catalog_mismatches(result['memory_root'], files),
+        'lag_seconds': {
+            'p50': percentile(values, 50), 'p90': percentile(values, 90),
+            'p99': percentile(values, 99), 'max': max(values),
+        } if values else None,
+        'within_slo': sum(1 for v in values if v <= slo_seconds),
+        'cpu_seconds': result['cpu_seconds'],
+        'cpu_seconds_per_hour': result['cpu_seconds'] / sim_hours if result['cpu_seconds'] is not None else None,
+        'cache_writes': result['cache_writes'],
+        'real_seconds': result['real_seconds'],
+        'log': result['log'],
+    }
+    summary['ok'] = (not missed and not duplicated and not partial and bool(values)
+                     and not summary['catalog_mismatches']
+                     and summary['lag_seconds']['p90'] <= slo_seconds)
+    return summary
+
+def minutes(seconds):
+    return f"{seconds / 60:.1f} min"
+
+def print_report(name, summary, slo_seconds):
+    print(f"━━ {name} ━━")
+    print(f"  Meetings synced: {summary['synced']}/{summary['expected']}"
+          f" ({summary['within_slo']} within {minutes(slo_seconds)} SLO)")
+    lag = summary['lag_seconds']
+    if lag:
+        print(f"  Sync lag: p50 {minutes(lag['p50'])}, p90 {minutes(lag['p90'])}, "
+              f"p99 {minutes(lag['p99'])}, max {minutes(lag['max'])}")
+    for label, key in (('Missed', 'missed'), ('Duplicated', 'duplicated'),
+                       ('Synced before the meeting ended', 'partial'),
+                       ('Failed jobs', 'failed_jobs'), ('Files for unknown docs', 'unexpected_files'),
+                       ('Catalog rows with the wrong duration', 'catalog_mismatches')):
+        if summary[key]:
+            print(f"  {label} ({len(summary[key])}): {', '.join(summary[key])}")
+    if summary['cpu_seconds'] is not None:
+        print(f"  Daemon CPU (polling/scheduling, syncs excluded): {summary['cpu_seconds']:.2f}s "
+              f"({summary['cpu_seconds_per_hour']:.3f}s per simulated hour)")
+    else:
+        print("  Daemon CPU: unavailable (daemon did not exit cleanly)")
+    print(f"  {summary['cache_writes']} cache writes, {summary['real_seconds']:.0f}s real time, log: {summary['log']}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a Granola day against the sync daemons')
+    parser.add_argument('--daemon', choices=['watch', 'smart', 'both'], default='both')
+    parser.add_argument('--cache', help='Recorded cache-v3.json to replay (default: synthetic day)')
+    parser.add_argument('--date', help='Day to take from --cache (YYYY-MM-DD)')
+    parser.add_argument('--meetings', type=int, default=8, help='Meetings in the synthetic day')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--speed', type=float, default=60, help='Simulated seconds per real second')
+    parser.add_argument('--write-interval', type=float, default=30,
+                        help='Simulated seconds between cache writes while segments arrive')
+    parser.add_argument('--drain-minutes', type=float, default=20,
+                        help='Keep the daemon running this long after the last meeting ends')
+    parser.add_argument('--slo-minutes', type=float, default=10)
+    parser.add_argument('--keep', action='store_true', help='Keep the temporary homes and logs')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    day = datetime.now()
+    if args.cache:
+        if not args.date:
+            parser.error('--cache needs --date')
+        documents, events = recorded_day(args.cache, args.date, day)
+    else:
+        documents, events = synthetic_day(day, args.meetings, args.seed)
+    if not documents:
+        print("ERROR: nothing to replay", file=sys.stderr)
+        sys.exit(1)
+
+    expected = expected_meetings(documents, events)
+    first = min(item['appears_at'] for item in documents) - 300
+    last = max(info['ended'] for info in expected.values())
+    end = last + args.drain_minutes * 60
+    sim_hours = (end - first) / 3600
+    slo_seconds = args.slo_minutes * 60
+
+    if not args.json:
+        print(f"Replaying {len(expected)} meetings ({len(documents)} Granola documents), "
+              f"{datetime.fromtimestamp(first).strftime('%H:%M')}-{datetime.fromtimestamp(end).strftime('%H:%M')} "
+              f"at {args.speed:g}x (~{(end - first) / args.speed / 60:.0f} min per daemon)")
+        print()
+
+    names = ['watch', 'smart'] if args.daemon == 'both' else [args.daemon]
+    workdir = tempfile.mkdtemp(prefix='granola-replay-')
+    report = {}
+    try:
+        for name in names:
+            clock = Clock(start=first, epoch=time.time(), speed=args.speed)
+            result = replay(name, documents, events, clock, end, args, os.path.join(workdir, name))
+            report[name] = analyse(expected, result, clock, sim_hours, slo_seconds)
+            if not args.json:
+                print_report(name, report[name], slo_seconds)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    elif args.keep:
+        print(f"Replay files kept in {workdir}")
+    sys.exit(0 if all(summary['ok'] for summary in report.values()) else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Regex search across Work Memory on every core
+
+For searches a token index can't answer: regular expressions,
+case-sensitive text, code snippets. Files are memory-mapped and scanned on
+a process pool (see memory_scan.py), config/ and .archive/ are never
+walked, and monthly files outside --since/--until are skipped. Matches
+stream out grouped by person, project, team or folder. /mem-search uses
+this when the query server isn't running.
+
+Usage:
+    python3 search-memory.py 'renewal|pricing'                   # Regex, case-insensitive
+    python3 search-memory.py --case-sensitive 'TODO\\(\\w+\\)'
+    python3 search-memory.py --fixed 'def main():'               # Literal text
+    python3 search-memory.py 'migration' --since 2025-10 --until 2026-01
+    python3 search-memory.py 'pricing' --json                    # One JSON object per entity
+"""
+
+import json
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(__file__))
+from memory_config import get_memory_root
+from memory_scan import compile_pattern, scan
+from memory_tree import entity_label
+
+RULE = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+def print_group(group):
+    etype, name = entity_label(group['files'][0]['path'])
+    print(RULE)
+    print(f"{etype}: {name}")
+    for item in group['files']:
+        rel = item['path']
+        shown = rel[len(group['entity']) + 1:] if rel.startswith(group['entity'] + '/') else rel
+        suffix = " (archived)" if item['archived'] else ""
+        print(f"📄 File: {shown}{suffix} (line {item['matches'][0][0]})")
+        print()
+        for line_no, line in item['matches']:
+            print(f"  {line_no}: {line.strip()}")
+        print()
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel regex search across Work Memory')
+    parser.add_argument('pattern', help='Regular expression (or literal text with --fixed)')
+    parser.add_argument('--memory-root', default=None, help='Path to WorkMemory (default: from config)')
+    parser.add_argument('--fixed', '-F', action='store_true', help='Match the pattern as literal text')
+    parser.add_argument('--case-sensitive', '-s', action='store_true', help='Match case exactly')
+    parser.add_argument('--since', metavar='YYYY-MM', help='Skip monthly files before this month')
+    parser.add_argument('--until', metavar='YYYY-MM', help='Skip monthly files after this month')
+    parser.add_argument('--no-archive', action='store_true', help="Don't search archived months")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Scan processes (default: CPU count)')
+    parser.add_argument('--json', action='store_true', help='One JSON object per entity, as results arrive')
+    args = parser.parse_args()
+
+    memory_root = args.memory_root or get_memory_root()
+    if not os.path.isdir(memory_root):
+        print(f"❌ Memory location not found: {memory_root}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        regex, _ = compile_pattern(args.pattern, ignore_case=not args.case_sensitive, fixed=args.fixed)
+    except re.error as e:
+        print(f"❌ Invalid pattern: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if not args.json:
+        print(f"🔍 Searching for: \"{args.pattern}\"")
+        print(f"Location: {memory_root}")
+        print()
+
+    started = time.time()
+    matches = files = 0
+    try:
+        for group in scan(memory_root, regex, since=args.since, until=args.until,
+                          workers=max(1, args.workers), archived=not args.no_archive):
+            files += len(group['files'])
+            matches += sum(len(item['matches']) for item in group['files'])
+            if args.json:
+                print(json.dumps(group), flush=True)
+            else:
+                print_group(group)
+                sys.stdout.flush()
+    except BrokenPipeError:
+        # Output piped into head, etc.
+        sys.stderr.close()
+        return
+
+    if args.json:
+        return
+    if not matches:
+        print(f"❌ No results found for \"{args.pattern}\"")
+        print()
+        print("💡 Try:")
+        print("  • Different search terms")
+        print("  • /mem-list to see what's available")
+        return
+    print(RULE)
+    print()
+    print(f"Found {matches} matches in {files} files ({time.time() - started:.2f}s)")
+    print("💡 Use /mem-view <name> to see full context")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Seed people profiles and interaction histories from the Granola cache
+
+Makes one pass over every Granola document, the calendar (state.events) and
+state.people, resolves each contact once through the identity index, and
+creates every internal/external profile and monthly interaction log in one
+batched write (see memory_seed.py). init-memory.sh runs it when a Granola
+cache exists; running it again only adds what is missing.
+
+Usage:
+    python3 seed-memory.py                       # Seed the configured memory root
+    python3 seed-memory.py --dry-run             # Count what would be written
+    python3 seed-memory.py --memory-root <root> --json   # Stats and phase timings
+"""
+
+import json
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(__file__))
+from memory_config import get_memory_root, get_org_name, get_user_domain, get_user_email
+from memory_seed import seed
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed profiles and interaction logs from Granola history')
+    parser.add_argument('--memory-root', default=None, help='Override memory root from config')
+    parser.add_argument('--user-email', help='Memory owner (default: user_email from config)')
+    parser.add_argument('--user-domain', help='Internal email domain (default: user_domain from config)')
+    parser.add_argument('--org-name', help='Company of internal colleagues (default: org_name from config)')
+    parser.add_argument('--dry-run', action='store_true', help='Resolve and render, but write nothing')
+    parser.add_argument('--json', action='store_true', help='Print the result (stats, timings) as JSON')
+    parser.add_argument('--quiet', '-q', action='store_true', help='One KEY=value line per stat (for init-memory.sh)')
+    args = parser.parse_args()
+
+    memory_root = args.memory_root or get_memory_root()
+    if not os.path.isdir(memory_root):
+        print(f"ERROR: Memory root not found: {memory_root}", file=sys.stderr)
+        sys.exit(1)
+
+    quiet = args.json or args.quiet
+    log = (lambda message: print(message, file=sys.stderr)) if quiet else print
+    result = seed(memory_root, args.user_email or get_user_email(), args.user_domain or get_user_domain(),
+                  args.org_name or get_org_name(), dry_run=args.dry_run, log=log)
+    stats, timings = result['stats'], result['timings']
+    elapsed = sum(timings.values())
+
+    if args.json:
+        throughput = {
+            'meetings_per_second': round(stats['meetings'] / elapsed, 1) if elapsed else None,
+            'contacts_per_second': round(stats['contacts'] / elapsed, 1) if elapsed else None,
+        }
+        print(json.dumps(dict(result, written=len(result['written']), throughput=throughput), indent=2))
+    elif args.quiet:
+        print(f"SEEDED_PROFILES={stats['profiles_created']}")
+        print(f"SEEDED_INTERACTION_LOGS={stats['interaction_files']}")
+        print(f"SEEDED_MEETINGS={stats['meetings']}")
+    else:
+        verb = 'Would seed' if args.dry_run else 'Seeded'
+        print(f"{verb} {stats['profiles_created']} profile(s) "
+              f"({stats['internal']} internal / {stats['external']} external contacts in Granola)")
+        print(f"  {stats['interaction_files']} interaction log(s), {stats['entries']} entries "
+              f"from {stats['meetings']} meeting(s)")
+        print("  " + ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in timings.items()))
+        if not args.dry_run and stats['meetings']:
+            print("💡 Meeting notes for past meetings: python3 rebuild-memory.py")
+
+if __name__ == '__main__':
+    main()
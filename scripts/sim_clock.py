@@ -0,0 +1,108 @@
+"""
+Accelerated clock for replaying a day of Granola activity.
+
+replay-granola-day.py runs the sync daemons unmodified, so their own
+timing (SETTLE_SECONDS, poll intervals, calendar sync delays) has to run on
+the same compressed timeline as the replayed cache. install() rebinds
+time.time, time.sleep and datetime.datetime.now so that simulated time
+starts at `start` (epoch seconds) when the real clock reads `epoch` and
+runs `speed` times faster.
+
+Run as a launcher, it installs the clock described by the SIM_CLOCK_*
+environment variables and then runs a script as __main__:
+
+    SIM_CLOCK_START=... SIM_CLOCK_EPOCH=... SIM_CLOCK_SPEED=60 \\
+        python3 sim_clock.py watch-granola.py
+
+If SIM_CLOCK_STATS names a file, the process's own CPU time (user +
+system, excluding child processes such as the per-meeting syncs) is
+written there as JSON when the script exits.
+"""
+
+import atexit
+import datetime as _datetime
+import json
+import os
+import resource
+import runpy
+import sys
+import time
+
+_real_time = time.time
+_real_sleep = time.sleep
+
+class Clock:
+    """Maps real time to simulated time and back."""
+
+    def __init__(self, start, epoch, speed):
+        self.start = start
+        self.epoch = epoch
+        self.speed = speed
+
+    def now(self):
+        return self.to_sim(_real_time())
+
+    def to_sim(self, real):
+        return self.start + (real - self.epoch) * self.speed
+
+    def to_real(self, sim):
+        return self.epoch + (sim - self.start) / self.speed
+
+    def sleep(self, seconds):
+        _real_sleep(max(seconds, 0) / self.speed)
+
+    def env(self):
+        """Environment variables that reproduce this clock in a launched process."""
+        return {
+            'SIM_CLOCK_START': repr(self.start),
+            'SIM_CLOCK_EPOCH': repr(self.epoch),
+            'SIM_CLOCK_SPEED': repr(self.speed),
+        }
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        return cls(float(environ['SIM_CLOCK_START']), float(environ['SIM_CLOCK_EPOCH']),
+                   float(environ['SIM_CLOCK_SPEED']))
+
+def install(clock):
+    """Make time.time/time.sleep/datetime.now follow clock (call before importing the script)."""
+    time.time = clock.now
+    time.sleep = clock.sleep
+
+    class SimDatetime(_datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromtimestamp(clock.now(), tz)
+
+        @classmethod
+        def today(cls):
+            return cls.fromtimestamp(clock.now())
+
+        @classmethod
+        def utcnow(cls):
+            return cls.fromtimestamp(clock.now(), _datetime.timezone.utc).replace(tzinfo=None)
+
+    _datetime.datetime = SimDatetime
+
+def write_cpu_stats(path):
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    with open(path, 'w') as f:
+        json.dump({'user': usage.ru_utime, 'system': usage.ru_stime, 'pid': os.getpid()}, f)
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 sim_clock.py <script.py> [args...]", file=sys.stderr)
+        sys.exit(2)
+    install(Clock.from_env())
+    stats = os.environ.get('SIM_CLOCK_STATS')
+    if stats:
+        atexit.register(write_cpu_stats, stats)
+    script = os.path.abspath(sys.argv[1])
+    sys.argv = [script] + sys.argv[2:]
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
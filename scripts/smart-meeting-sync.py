@@ -8,6 +8,10 @@ Instead of polling every 5 minutes, this script:
 3. Checks if Granola has a transcript for that meeting
 4. Processes and logs the meeting to Work Memory
 
+Sync jobs go through the durable queue shared with watch-granola.py
+(sync_queue.py), so restarts resume where they left off and failed syncs are
+retried with backoff.
+
 Deduplication:
 - Checks if person profile already exists before creating
 - Updates last_interaction date if profile exists
@@ -22,60 +26,38 @@ Usage:
 
     # Process meetings that ended in the last N minutes
     python3 smart-meeting-sync.py --recent 10
+
+In daemon mode, metrics (cache parse time, calendar triggers, syncs, sync
+lag, errors; see daemon_metrics.py) are written every minute to
+MEMORY_ROOT/config/metrics/smart-meeting-sync.prom, with structured events
+in MEMORY_ROOT/logs/smart-meeting-sync.jsonl.
 """
 
-import json
 import os
 import sys
 import re
 import time
-from datetime import datetime, timedelta
-from pathlib import Path
+from datetime import datetime, timedelta, timezone
 import argparse
 
 # Add scripts directory to path
 sys.path.insert(0, os.path.dirname(__file__))
-
-GRANOLA_CACHE = os.path.expanduser(
-    "~/Library/Application Support/Granola/cache-v3.json"
-)
-
-def get_memory_root():
-    config_file = os.path.expanduser("~/.claude/skills/memory-management/memory-management.local.md")
-    if os.path.exists(config_file):
-        with open(config_file, 'r') as f:
-            content = f.read()
-            match = re.search(r'memory_root:\s*(.+)', content)
-            if match:
-                return match.group(1).strip()
-    return os.path.expanduser("~/Documents/WorkMemory")
+from granola_segments import ended_after
+from sync_queue import SyncQueue, run_pending
+from daemon_metrics import EventLog, Metrics, metrics_path, write_textfile
+import granola_meetings
+from granola_meetings import parse_timestamp
+from memory_archive import archived_meeting
+from memory_config import get_memory_budget_mb, get_memory_root, slugify
 
 MEMORY_ROOT = get_memory_root()
-USER_EMAIL = 'tony.kipkemboi@guild.com'
-USER_DOMAIN = 'guild.com'
+MEMORY_BUDGET_MB = get_memory_budget_mb()
 SYNC_DELAY_MINUTES = 3  # Wait this long after meeting end before syncing
+DAEMON = 'smart-meeting-sync'
 
 def load_granola_data():
-    """Load Granola's cache."""
-    if not os.path.exists(GRANOLA_CACHE):
-        return None
-
-    with open(GRANOLA_CACHE, 'r') as f:
-        data = json.load(f)
-
-    cache = data.get('cache', '')
-    inner = json.loads(cache)
-    return inner.get('state', {})
-
-def parse_timestamp(ts):
-    """Parse ISO timestamp."""
-    if not ts:
-        return None
-    try:
-        ts = ts.replace('Z', '+00:00')
-        return datetime.fromisoformat(ts)
-    except:
-        return None
+    """Granola's cache (None until there is one), loaded lean under a memory budget (memory_budget_mb)."""
+    return granola_meetings.load_granola_data(lean=MEMORY_BUDGET_MB is not None, required=False)
 
 def get_calendar_events_today(state):
     """Get today's calendar events from Granola's cached data."""
@@ -112,36 +94,31 @@ def get_meetings_needing_sync(state, minutes_since_end=10):
     documents = state.get('documents', {})
     transcripts = state.get('transcripts', {})
 
-    cutoff = datetime.now(datetime.now().astimezone().tzinfo) - timedelta(minutes=minutes_since_end)
+    cutoff = time.time() - minutes_since_end * 60
     meetings_to_sync = []
 
-    for doc_id, doc in documents.items():
-        if not isinstance(doc, dict):
-            continue
-
-        trans = transcripts.get(doc_id, [])
-        if not trans:
-            continue
-
-        # Get transcript end time
-        last_ts = trans[-1].get('end_timestamp', '')
-        end_time = parse_timestamp(last_ts)
+    # Transcript end times (epoch seconds) for every document with a transcript
+    end_times = {
+        doc_id: transcripts[doc_id].last_end
+        for doc_id, doc in documents.items()
+        if isinstance(doc, dict) and transcripts.get(doc_id)
+    }
 
-        if not end_time:
-            continue
-
-        # Check if meeting ended recently
-        if end_time.replace(tzinfo=None) < cutoff.replace(tzinfo=None):
-            continue
+    # Only meetings that ended recently
+    for doc_id in ended_after(end_times, cutoff):
+        doc = documents[doc_id]
+        trans = transcripts[doc_id]
+        end_time = datetime.fromtimestamp(end_times[doc_id], timezone.utc)
 
         title = doc.get('title', '') or '[Untitled]'
 
         # Check if already synced (meeting file exists)
         date_str = end_time.strftime('%Y-%m-%d')
         slug = slugify(title)
-        meeting_file = os.path.join(MEMORY_ROOT, 'meetings', date_str[:7], f"{date_str}-{slug}.md")
+        rel_path = f"meetings/{date_str[:7]}/{date_str}-{slug}.md"
+        meeting_file = os.path.join(MEMORY_ROOT, *rel_path.split('/'))
 
-        if os.path.exists(meeting_file):
+        if os.path.exists(meeting_file) or archived_meeting(MEMORY_ROOT, rel_path, doc_id):
             continue  # Already synced
 
         meetings_to_sync.append({
@@ -153,14 +130,6 @@ def get_meetings_needing_sync(state, minutes_since_end=10):
 
     return meetings_to_sync
 
-def slugify(text):
-    """Convert text to filename-safe slug."""
-    text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[\s_]+', '-', text)
-    text = re.sub(r'-+', '-', text)
-    return text.strip('-')[:50]
-
 def find_existing_profile(email, memory_root):
     """
     Check if a profile already exists for this email.
@@ -192,12 +161,13 @@ def update_existing_profile(profile_path, date_str):
     with open(profile_path, 'r') as f:
         content = f.read()
 
-    # Update last_interaction
+    # Update last_interaction (seeded contacts never met may have none yet)
     content = re.sub(
-        r'last_interaction: \d{4}-\d{2}-\d{2}',
+        r'^last_interaction:[ \t]*(?:\d{4}-\d{2}-\d{2})?[ \t]*$',
         f'last_interaction: {date_str}',
-        content
+        content, flags=re.MULTILINE
     )
+    content = re.sub(r'^first_interaction:[ \t]*$', f'first_interaction: {date_str}', content, flags=re.MULTILINE)
 
     # Increment interaction_count
     match = re.search(r'interaction_count: (\d+)', content)
@@ -227,7 +197,33 @@ def get_scheduled_sync_times(state):
 
     return sorted(sync_times, key=lambda x: x[0])
 
-def daemon_mode():
+def queue_matching_meetings(queue, state, event):
+    """
+    Queue Granola transcripts that belong to a calendar event.
+    Returns the number of matching transcripts (queued now or earlier).
+    """
+    matched = 0
+    meetings = get_meetings_needing_sync(state, minutes_since_end=30)
+
+    for mtg in meetings:
+        if event['title'].lower() in mtg['title'].lower() or mtg['title'].lower() in event['title'].lower():
+            print(f"  Found transcript with {mtg['segments']} segments")
+            queue.enqueue(mtg['doc_id'], mtg['title'], transcript_end=mtg['end_time'].timestamp())
+            matched += 1
+
+    return matched
+
+def write_metrics(metrics, events, queue):
+    """Refresh the metrics textfile and flush the event log."""
+    try:
+        for status, count in queue.counts().items():
+            metrics.set('queue_jobs', count, status=status)
+        write_textfile(metrics_path(MEMORY_ROOT, DAEMON), metrics)
+        events.flush()
+    except OSError as e:
+        print(f"Could not write metrics: {e}")
+
+def daemon_mode(workers=4):
     """
     Run as a daemon that watches calendar and syncs after meetings.
     """
@@ -236,11 +232,24 @@ def daemon_mode():
     print(f"Memory root: {MEMORY_ROOT}")
     print("-" * 50)
 
-    synced_meetings = set()  # Track what we've already synced
+    queue = SyncQueue(MEMORY_ROOT)
+    recovered = queue.recover()
+    if recovered:
+        print(f"Re-queued {recovered} sync(s) interrupted by the last shutdown")
+
+    handled_events = set()  # Events already matched this run (jobs themselves persist)
+    metrics = Metrics()
+    metrics.set('started_timestamp_seconds', round(time.time(), 3))
+    events = EventLog(MEMORY_ROOT, DAEMON)
 
     while True:
         try:
+            started = time.monotonic()
             state = load_granola_data()
+            seconds = time.monotonic() - started
+            metrics.inc('cache_reads_total')
+            metrics.observe('cache_parse_seconds', seconds)
+            events.event('cache_read', seconds=round(seconds, 4), found=state is not None)
             if not state:
                 time.sleep(60)
                 continue
@@ -252,8 +261,8 @@ def daemon_mode():
             for sync_time, event in sync_times:
                 event_id = event['id']
 
-                # Skip if already synced
-                if event_id in synced_meetings:
+                # Skip if already handled
+                if event_id in handled_events:
                     continue
 
                 # Check if it's time to sync
@@ -262,18 +271,21 @@ def daemon_mode():
                     print(f"  Checking for transcript...")
 
                     # Look for this meeting in Granola
-                    meetings = get_meetings_needing_sync(state, minutes_since_end=30)
-
-                    for mtg in meetings:
-                        if event['title'].lower() in mtg['title'].lower() or mtg['title'].lower() in event['title'].lower():
-                            print(f"  Found transcript with {mtg['segments']} segments")
-                            # Trigger sync (import and run the main sync script)
-                            os.system(f'python3 ~/.claude/skills/memory-management/scripts/log-meeting-to-memory.py --recent 35')
-                            synced_meetings.add(event_id)
-                            break
+                    matched = queue_matching_meetings(queue, state, event)
+                    metrics.inc('calendar_triggers_total', result='matched' if matched else 'waiting')
+                    if matched:
+                        metrics.inc('transcripts_queued_total', matched)
+                        handled_events.add(event_id)
                     else:
                         print(f"  No transcript found yet, will retry...")
 
+            # The snapshot is re-read every tick; don't hold it while idle
+            state = None
+
+            # Run due jobs (new ones, plus retries from earlier failures)
+            run_pending(queue, workers=workers, metrics=metrics, events=events)
+            write_metrics(metrics, events, queue)
+
             # Sleep for 1 minute before checking again
             time.sleep(60)
 
@@ -282,7 +294,10 @@ def daemon_mode():
             break
         except Exception as e:
             print(f"Error: {e}")
+            metrics.inc('errors_total', type=type(e).__name__)
+            events.event('error', type=type(e).__name__, message=str(e))
             time.sleep(60)
+    write_metrics(metrics, events, queue)
 
 def list_today():
     """List today's scheduled meetings and their sync times."""
@@ -313,11 +328,12 @@ def main():
     parser.add_argument('--daemon', action='store_true', help='Run as daemon watching calendar')
     parser.add_argument('--list-today', action='store_true', help='List today\'s meetings and sync times')
     parser.add_argument('--recent', type=int, help='Sync meetings ended in last N minutes')
+    parser.add_argument('--workers', type=int, default=4, help='Meetings to sync in parallel')
 
     args = parser.parse_args()
 
     if args.daemon:
-        daemon_mode()
+        daemon_mode(args.workers)
     elif args.list_today:
         list_today()
     elif args.recent:
@@ -328,7 +344,11 @@ def main():
             print(f"  - {mtg['title']} ({mtg['segments']} segments)")
 
         if meetings:
-            os.system(f'python3 ~/.claude/skills/memory-management/scripts/log-meeting-to-memory.py --recent {args.recent + 5}')
+            queue = SyncQueue(MEMORY_ROOT)
+            for mtg in meetings:
+                # Asked for explicitly: re-run syncs that finished or gave up
+                queue.enqueue(mtg['doc_id'], mtg['title'], requeue=True)
+            run_pending(queue, workers=args.workers)
     else:
         parser.print_help()
 
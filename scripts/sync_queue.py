@@ -0,0 +1,306 @@
+"""
+Durable sync queue shared by the Granola daemons.
+
+Both watch-granola.py and smart-meeting-sync.py used to remember what they
+had synced in memory, so a restart either re-scanned everything or missed
+meetings that finished while they were down, and a failed sync was only
+logged. Jobs now live in a small SQLite database (one row per Granola doc
+ID) under MEMORY_ROOT/config/:
+
+    pending  - waiting to run (not before next_attempt_at)
+    running  - claimed by a daemon (owner_pid) until lease_until
+    done     - synced (or already present in Work Memory)
+    failed   - gave up after MAX_ATTEMPTS
+    skipped  - existed before the queue was first created (never synced)
+
+Failures are retried with exponential backoff. run_pending() hands claimed
+jobs to a thread pool, each running one log-meeting-to-memory.py
+subprocess, so a burst of meetings is synced concurrently. The subprocess
+gets the meeting record on stdin when the daemon has already assembled it
+(the watcher's fanout), or a --doc-id to load from the cache otherwise.
+
+Both daemons share the database, so a claimed job records its owner's PID
+and a lease covering the longest its sync can take (JOB_TIMEOUT_SECONDS per
+job ahead of it in the worker pool). Only jobs whose owner has exited or
+whose lease ran out are returned to pending (recover()); the other daemon's
+live jobs are left running.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+QUEUE_FILE = os.path.join('config', 'sync-queue.db')
+LOG_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'log-meeting-to-memory.py')
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 3600
+SETTLE_SECONDS = 120    # Wait this long after the last segment before syncing
+JOB_TIMEOUT_SECONDS = 300
+LEASE_GRACE_SECONDS = 60
+DEFAULT_WORKERS = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    doc_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_error TEXT NOT NULL DEFAULT '',
+    transcript_end REAL NOT NULL DEFAULT 0,
+    owner_pid INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, next_attempt_at);
+"""
+
+def _alive(pid):
+    """Whether a process with this PID exists."""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def backoff_seconds(attempts):
+    """Delay before retry number `attempts` (1-based): 1m, 2m, 4m ... capped at 1h."""
+    return min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+
+class SyncQueue:
+    """SQLite-backed job table keyed by Granola doc ID."""
+
+    def __init__(self, memory_root):
+        self.path = os.path.join(memory_root, QUEUE_FILE)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_empty(self):
+        return self.conn.execute('SELECT 1 FROM jobs LIMIT 1').fetchone() is None
+
+    def statuses(self):
+        """Map of every doc ID the queue has seen to its status."""
+        return dict(self.conn.execute('SELECT doc_id, status FROM jobs'))
+
+    def status(self, doc_id):
+        row = self.conn.execute('SELECT status FROM jobs WHERE doc_id = ?', (doc_id,)).fetchone()
+        return row[0] if row else None
+
+    def seed(self, doc_ids, status='skipped'):
+        """Record doc IDs without queueing them (first run baseline)."""
+        now = time.time()
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO jobs (doc_id, status, enqueued_at, updated_at) VALUES (?, ?, ?, ?)',
+            [(doc_id, status, now, now) for doc_id in doc_ids],
+        )
+
+    def enqueue(self, doc_id, title='', not_before=0.0, transcript_end=0.0, requeue=False):
+        """
+        Queue a doc for syncing. Returns True if it was newly queued.
+
+        A doc that is still pending has its start time pushed back to
+        not_before (its transcript is still growing); finished, failed and
+        running jobs are left alone, unless requeue (a sync the user asked
+        for) puts a done, failed or skipped job back to pending with fresh
+        attempts. transcript_end (epoch seconds, 0 if unknown) is what sync
+        lag is measured from.
+        """
+        now = time.time()
+        cur = self.conn.execute(
+            'INSERT OR IGNORE INTO jobs '
+            '(doc_id, title, status, next_attempt_at, enqueued_at, updated_at, transcript_end) '
+            "VALUES (?, ?, 'pending', ?, ?, ?, ?)",
+            (doc_id, title, not_before, now, now, transcript_end),
+        )
+        if cur.rowcount:
+            return True
+        if requeue:
+            cur = self.conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, last_error = '', next_attempt_at = ?, "
+                "transcript_end = MAX(transcript_end, ?), updated_at = ? "
+                "WHERE doc_id = ? AND status IN ('done', 'failed', 'skipped')",
+                (not_before, transcript_end, now, doc_id),
+            )
+            if cur.rowcount:
+                return True
+        self.conn.execute(
+            "UPDATE jobs SET next_attempt_at = MAX(next_attempt_at, ?), transcript_end = MAX(transcript_end, ?), "
+            "updated_at = ? WHERE doc_id = ? AND status = 'pending' AND attempts = 0",
+            (not_before, transcript_end, now, doc_id),
+        )
+        return False
+
+    def recover(self):
+        """
+        Return jobs left 'running' by a crashed or killed daemon to the queue:
+        those whose owner is no longer running (or is this process, which
+        hasn't claimed anything yet when a daemon starts) or whose lease
+        ran out. Jobs a live daemon is running are left alone.
+        """
+        now = time.time()
+        owners = [row[0] for row in self.conn.execute("SELECT DISTINCT owner_pid FROM jobs WHERE status = 'running'")]
+        stale = [pid for pid in owners if pid == os.getpid() or not _alive(pid)]
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'pending', owner_pid = 0, updated_at = ? "
+            f"WHERE status = 'running' AND (lease_until < ? OR owner_pid IN ({','.join('?' * len(stale))}))",
+            (now, now, *stale),
+        )
+        return cur.rowcount
+
+    def claim(self, limit, workers=1):
+        """
+        Atomically mark up to `limit` due jobs as running and return them.
+
+        Each job is leased to this process for as long as it can take on
+        `workers` workers: JOB_TIMEOUT_SECONDS for every round of jobs
+        ahead of it and its own.
+        """
+        now = time.time()
+        workers = max(1, workers)
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = self.conn.execute(
+                "SELECT doc_id, title, attempts, transcript_end FROM jobs "
+                "WHERE status = 'pending' AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, owner_pid = ?, lease_until = ?, "
+                "updated_at = ? WHERE doc_id = ?",
+                [(os.getpid(), now + JOB_TIMEOUT_SECONDS * (i // workers + 1) + LEASE_GRACE_SECONDS, now, row[0])
+                 for i, row in enumerate(rows)],
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return [{'doc_id': r[0], 'title': r[1], 'attempts': r[2] + 1, 'transcript_end': r[3]} for r in rows]
+
+    def complete(self, doc_id):
+        self.conn.execute(
+            "UPDATE jobs SET status = 'done', last_error = '', updated_at = ? WHERE doc_id = ?",
+            (time.time(), doc_id),
+        )
+
+    def fail(self, doc_id, error):
+        """Schedule a retry with backoff, or give up after MAX_ATTEMPTS."""
+        now = time.time()
+        row = self.conn.execute('SELECT attempts FROM jobs WHERE doc_id = ?', (doc_id,)).fetchone()
+        attempts = row[0] if row else MAX_ATTEMPTS
+        if attempts >= MAX_ATTEMPTS:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', last_error = ?, updated_at = ? WHERE doc_id = ?",
+                (error[-2000:], now, doc_id),
+            )
+            return False
+        self.conn.execute(
+            "UPDATE jobs SET status = 'pending', next_attempt_at = ?, last_error = ?, updated_at = ? "
+            "WHERE doc_id = ?",
+            (now + backoff_seconds(attempts), error[-2000:], now, doc_id),
+        )
+        return True
+
+    def counts(self):
+        """Number of jobs per status."""
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+
+def sync_document(doc_id, log_args=(), meeting=None):
+    """
+    Run the logger for one document (log_args pick the root/identity). Returns (ok, error_text).
+
+    meeting is the document's meeting record when the caller already
+    assembled it (see granola_meetings.build_meeting); it is handed to the
+    logger on stdin, so the logger doesn't parse the Granola cache again.
+    """
+    if meeting is None:
+        command, stdin = ['--doc-id', doc_id], None
+    else:
+        command, stdin = ['--meeting-json', '-'], json.dumps(meeting)
+    try:
+        result = subprocess.run(
+            [sys.executable, LOG_SCRIPT, *command, *log_args],
+            input=stdin, capture_output=True, text=True, timeout=JOB_TIMEOUT_SECONDS,
+        )
+    except subprocess.TimeoutExpired:
+        return False, f"timed out after {JOB_TIMEOUT_SECONDS}s"
+    if result.returncode != 0:
+        return False, (result.stderr or result.stdout).strip() or f"exit code {result.returncode}"
+    return True, ''
+
+def _timed_sync(job, log_args, meeting_for=None):
+    started = time.monotonic()
+    meeting = meeting_for(job['doc_id']) if meeting_for is not None else None
+    ok, error = sync_document(job['doc_id'], log_args, meeting)
+    return job, ok, error, time.monotonic() - started, time.time()
+
+def run_pending(queue, workers=DEFAULT_WORKERS, log=print, log_args=(), metrics=None, events=None,
+                meeting_for=None):
+    """
+    Claim every due job and sync them on a pool of `workers` threads.
+
+    Queue updates happen on the calling thread as each job finishes;
+    workers only run the subprocess. meeting_for(doc_id), if given, returns the job's
+    already-assembled meeting record (or None to let the logger load it
+    itself). With a daemon_metrics Metrics / EventLog, every attempt
+    is recorded (result, run time, lag from transcript end, error type).
+    Returns (synced, failed) counts.
+    """
+    jobs = queue.claim(limit=1000, workers=workers)
+    if not jobs:
+        return 0, 0
+
+    log(f"Syncing {len(jobs)} meeting(s) with {min(workers, len(jobs))} worker(s)...")
+    synced = failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as pool:
+        futures = [pool.submit(_timed_sync, job, log_args, meeting_for) for job in jobs]
+        for future in as_completed(futures):
+            job, ok, error, duration, finished = future.result()
+            label = job['title'] or job['doc_id']
+            lag = finished - job['transcript_end'] if job['transcript_end'] else None
+            if ok:
+                queue.complete(job['doc_id'])
+                synced += 1
+                result = 'synced'
+                log(f"  Synced: {label}")
+            else:
+                failed += 1
+                if queue.fail(job['doc_id'], error):
+                    result = 'retry'
+                    log(f"  Sync failed for {label} (attempt {job['attempts']}), will retry: {error.splitlines()[-1] if error else ''}")
+                else:
+                    result = 'failed'
+                    log(f"  Giving up on {label} after {job['attempts']} attempts: {error.splitlines()[-1] if error else ''}")
+            if metrics is not None or events is not None:
+                _record_sync(metrics, events, job, result, duration, lag, error)
+    return synced, failed
+
+def _record_sync(metrics, events, job, result, duration, lag, error):
+    from daemon_metrics import error_type
+    kind = error_type(error) if error else None
+    if metrics is not None:
+        metrics.inc('sync_jobs_total', result=result)
+        metrics.observe('sync_duration_seconds', duration)
+        if result == 'synced' and lag is not None:
+            metrics.observe('sync_lag_seconds', lag)
+        if kind:
+            metrics.inc('errors_total', type=kind)
+    if events is not None:
+        events.event('sync', doc_id=job['doc_id'], title=job['title'], result=result, attempt=job['attempts'],
+                     duration=round(duration, 3), lag=round(lag, 1) if lag is not None else None, error_type=kind)
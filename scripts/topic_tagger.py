@@ -0,0 +1,141 @@
+"""
+Keyphrase topics for meetings at ingest.
+
+create_meeting_file() used to write `topics: []`, so finding meetings about
+a subject meant grepping every file. tag_meetings() picks up to MAX_TOPICS
+keyphrases per meeting from its merged transcript plus Granola's
+notes_plain/overview, and the catalog turns the resulting frontmatter into
+a topic -> meetings posting list.
+
+Candidates are single content words and two-word phrases (adjacent words
+with no stopword between them), scored by TF-IDF against the corpus-wide
+document frequencies that related_index.py already maintains
+incrementally. Notes count double: they are short and deliberate, while
+transcripts are long and chatty.
+
+A whole batch is scored at once. With NumPy this is one count matrix
+(meetings x candidate phrases) multiplied by an IDF vector; without it the
+same arithmetic runs phrase by phrase.
+"""
+
+import math
+import re
+from collections import Counter
+
+from importlib.util import find_spec
+
+# Imported by score_batch() when a batch is actually scored
+NUMPY_AVAILABLE = find_spec('numpy') is not None
+np = None
+
+def _numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+from related_index import RelatedIndex, TOKEN_RE, STOPWORDS, MIN_TOKEN_LENGTH
+
+MAX_TOPICS = 5
+MIN_COUNT = 2            # A phrase must occur at least this often (notes weighted)
+NOTES_WEIGHT = 2
+PHRASE_BOOST = 1.5       # Two-word phrases are more specific than single words
+
+# Speaker labels the merged transcript prefixes each line with (granola_meetings)
+SPEAKER_RE = re.compile(r'^\[(?:YOU|CALL)\]:[ \t]*', re.MULTILINE)
+
+def phrase_counts(text, weight=1):
+    """Counter of candidate unigrams and bigrams in text."""
+    counts = Counter()
+    previous = None
+    for token in TOKEN_RE.findall(text.lower()):
+        token = token.strip("'")
+        if len(token) < MIN_TOKEN_LENGTH or token in STOPWORDS or token.isdigit():
+            previous = None
+            continue
+        counts[token] += weight
+        if previous:
+            counts[f"{previous} {token}"] += weight
+        previous = token
+    return counts
+
+def meeting_phrase_counts(meeting):
+    """Weighted phrase counts from a meeting's transcript (without speaker labels), notes and overview."""
+    metadata = meeting.get('metadata') or {}
+    counts = phrase_counts(SPEAKER_RE.sub('', meeting.get('transcript_text', '')))
+    for field in ('notes_plain', 'overview'):
+        if isinstance(metadata.get(field), str):
+            counts.update(phrase_counts(metadata[field], NOTES_WEIGHT))
+    return counts
+
+class DocumentFrequencies:
+    """IDF lookups over the related-meetings index's document frequencies."""
+
+    def __init__(self, memory_root):
+        index = RelatedIndex(memory_root).load()
+        self.total = len(index.docs)
+        self.df = {term: index.df[i] for i, term in enumerate(index.terms)}
+
+    def idf(self, phrase):
+        # A phrase is as rare as its rarer word
+        df = min(self.df.get(word, 0) for word in phrase.split())
+        return math.log((1 + self.total) / (1 + df)) + 1.0
+
+def pick_topics(scored, limit=MAX_TOPICS):
+    """Best phrases, skipping words already covered by a chosen phrase (and vice versa)."""
+    chosen = []
+    covered = set()
+    for phrase, _ in scored:
+        words = set(phrase.split())
+        if words & covered:
+            continue
+        chosen.append(phrase)
+        covered |= words
+        if len(chosen) == limit:
+            break
+    return chosen
+
+def score_batch(batch_counts, frequencies):
+    """Per meeting, [(phrase, score)] best first (ties alphabetical)."""
+    vocabulary = sorted({phrase for counts in batch_counts for phrase, n in counts.items() if n >= MIN_COUNT})
+    if not vocabulary:
+        return [[] for _ in batch_counts]
+    boost = [PHRASE_BOOST if ' ' in phrase else 1.0 for phrase in vocabulary]
+    idf = [frequencies.idf(phrase) * b for phrase, b in zip(vocabulary, boost)]
+
+    if NUMPY_AVAILABLE:
+        np = _numpy()
+        column = {phrase: j for j, phrase in enumerate(vocabulary)}
+        matrix = np.zeros((len(batch_counts), len(vocabulary)))
+        for i, counts in enumerate(batch_counts):
+            for phrase, n in counts.items():
+                j = column.get(phrase)
+                if j is not None and n >= MIN_COUNT:
+                    matrix[i, j] = n
+        with np.errstate(divide='ignore'):
+            scores = np.where(matrix > 0, (1 + np.log(matrix)) * np.asarray(idf), 0.0)
+        ranked = []
+        for row in scores:
+            top = np.argsort(-row, kind='stable')[:MAX_TOPICS * 4]
+            ranked.append([(vocabulary[j], float(row[j])) for j in top if row[j] > 0])
+        return ranked
+
+    idf_by_phrase = dict(zip(vocabulary, idf))
+    ranked = []
+    for counts in batch_counts:
+        scored = [
+            (phrase, (1 + math.log(n)) * idf_by_phrase[phrase])
+            for phrase, n in counts.items() if n >= MIN_COUNT
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        ranked.append(scored[:MAX_TOPICS * 4])
+    return ranked
+
+def tag_meetings(meetings, memory_root):
+    """Set meeting['topics'] on every meeting in the batch that has text."""
+    frequencies = DocumentFrequencies(memory_root)
+    batch_counts = [meeting_phrase_counts(meeting) for meeting in meetings]
+    for meeting, scored in zip(meetings, score_batch(batch_counts, frequencies)):
+        meeting['topics'] = pick_topics(scored)
+    return meetings
@@ -8,12 +8,37 @@ When the cache is updated (indicating new transcript data), it:
 2. Checks if any new transcripts appeared
 3. Processes new meetings automatically
 
+New transcripts go into the durable sync queue (see sync_queue.py), so a
+restart picks up exactly where it left off, failed syncs are retried with
+backoff, and several meetings are synced in parallel.
+
 This is more efficient than:
 - Polling every 5 minutes (misses meetings, wastes resources)
 - Calendar-based timing (doesn't know when transcripts actually arrive)
 
+The first cache change of each day also rebuilds that day's morning
+briefing digest (briefing.py), picking up overnight calendar changes.
+
+Each root gets the watcher's metrics (cache parse time, change
+notifications received vs coalesced, syncs, sync lag, errors; see
+daemon_metrics.py) in config/metrics/watch-granola.prom, refreshed every
+DUE_CHECK_SECONDS, and a structured event log in
+logs/watch-granola.jsonl next to the text log.
+
+One watcher can serve several memory roots (shared machines, team
+pilots): pass each root's skill config with --config. The cache is parsed
+once per change, and only the transcripts that are new or still growing
+are handed to each root's pipeline, a thread with its own sync queue that
+logs meetings with that root's user_email/user_domain/org_name. Roots sync
+concurrently. Each due meeting is assembled once per snapshot, shared by
+every root (attendees are resolved against each root's identity index),
+and handed to the logger as a record, so a sync doesn't parse the cache
+again.
+
 Usage:
     python3 watch-granola.py
+    python3 watch-granola.py --config ~alice/.claude/skills/memory-management/memory-management.local.md \\
+                             --config ~bob/.claude/skills/memory-management/memory-management.local.md
 
 Requirements:
     pip install watchdog
@@ -22,71 +47,101 @@ Requirements:
 import os
 import sys
 import time
-import json
 import re
-from datetime import datetime, timedelta
-from pathlib import Path
+import threading
+import argparse
+from datetime import datetime
+from queue import Queue, Empty
 
 try:
     from watchdog.observers import Observer
     from watchdog.events import FileSystemEventHandler
     WATCHDOG_AVAILABLE = True
 except ImportError:
+    FileSystemEventHandler = object
     WATCHDOG_AVAILABLE = False
 
-GRANOLA_CACHE = os.path.expanduser(
-    "~/Library/Application Support/Granola/cache-v3.json"
-)
-
-def get_memory_root():
-    config_file = os.path.expanduser("~/.claude/skills/memory-management/memory-management.local.md")
-    if os.path.exists(config_file):
-        with open(config_file, 'r') as f:
-            content = f.read()
-            match = re.search(r'memory_root:\s*(.+)', content)
-            if match:
-                return match.group(1).strip()
-    return os.path.expanduser("~/Documents/WorkMemory")
-
-MEMORY_ROOT = get_memory_root()
-LOG_FILE = os.path.join(MEMORY_ROOT, 'logs', 'granola-watcher.log')
-
-def log(message):
-    """Log message with timestamp."""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    log_line = f"[{timestamp}] {message}"
-    print(log_line)
-
-    # Also write to log file
-    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-    with open(LOG_FILE, 'a') as f:
-        f.write(log_line + '\n')
-
-def get_transcript_doc_ids():
-    """Get set of document IDs that have transcripts."""
+sys.path.insert(0, os.path.dirname(__file__))
+import granola_meetings
+from daemon_metrics import EventLog, Metrics, metrics_path, open_log, write_textfile
+from identity_index import build_identity_index, snapshot_key
+from memory_archive import archived_doc_ids
+from sync_queue import SETTLE_SECONDS, SyncQueue, run_pending, DEFAULT_WORKERS
+from memory_config import GRANOLA_CACHE, root_settings
+
+DUE_CHECK_SECONDS = 30   # How often each root runs its due syncs (and writes its metrics)
+DAEMON = 'watch-granola'
+
+def make_logger(memory_root, prefix=''):
+    """Logger that prints and appends to the root's logs/granola-watcher.log (kept open, rotated by size)."""
+    # Line-buffered, so `tail -f` still sees every line as it is logged
+    log_file = open_log(os.path.join(memory_root, 'logs', 'granola-watcher.log'), buffering=1)
+
+    def log(message):
+        """Log message with timestamp."""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        log_line = f"[{timestamp}] {message}"
+        print(f"{prefix}{log_line}")
+        log_file.write(log_line + '\n')
+    return log
+
+class CacheSnapshot:
+    """
+    One parse of the Granola cache, shared by every root's pipeline.
+
+    end_times maps the doc IDs that have transcripts to (title, end of the
+    last segment in epoch seconds). Meetings are assembled on demand, once
+    per snapshot, without identities (each root resolves the attendees).
+    """
+
+    def __init__(self, data=None, key=None):
+        self.data = data or {'documents': {}, 'transcripts': {}, 'people': [], 'events': [], 'meetings_metadata': {}}
+        self.key = key
+        documents, transcripts = self.data['documents'], self.data['transcripts']
+        self.splits = granola_meetings.detect_split_meetings(documents, transcripts)
+        self.main_ids = {c: doc_id for doc_id, conts in self.splits.items() for c in conts}
+        self.end_times = {}
+        for doc_id, table in transcripts.items():
+            if not table:
+                continue
+            doc = documents.get(doc_id)
+            title = (doc.get('title', '') if isinstance(doc, dict) else '') or ''
+            end = table.last_end
+            self.end_times[doc_id] = (title, 0.0 if end != end else end)
+        self.meetings = {}
+        self.lock = threading.Lock()
+
+    def meeting(self, doc_id):
+        """The meeting record for a doc ID (a continuation gives its main meeting), or None if unknown."""
+        doc_id = self.main_ids.get(doc_id, doc_id)
+        with self.lock:
+            if doc_id not in self.meetings:
+                doc = self.data['documents'].get(doc_id)
+                self.meetings[doc_id] = granola_meetings.build_meeting(
+                    doc_id, doc, self.data['transcripts'], self.splits,
+                ) if isinstance(doc, dict) else None
+            return self.meetings[doc_id]
+
+def load_snapshot():
+    """
+    Parse the cache once (lean, see granola_meetings.load_granola_data).
+
+    Returns a CacheSnapshot (empty if there is no cache yet), or None if the
+    cache couldn't be read (e.g. mid-write).
+    """
     if not os.path.exists(GRANOLA_CACHE):
-        return set()
+        return CacheSnapshot()
 
     try:
-        with open(GRANOLA_CACHE, 'r') as f:
-            data = json.load(f)
-
-        cache = data.get('cache', '')
-        inner = json.loads(cache)
-        state = inner.get('state', {})
-        transcripts = state.get('transcripts', {})
+        key = snapshot_key(GRANOLA_CACHE)
+        return CacheSnapshot(granola_meetings.load_granola_data(lean=True), key)
+    except (OSError, ValueError, AttributeError):
+        return None
 
-        return set(transcripts.keys())
-    except:
-        return set()
-
-def get_synced_meeting_ids():
+def get_synced_meeting_ids(memory_root):
     """Get set of Granola doc IDs that have already been synced."""
     synced = set()
-    meetings_dir = os.path.join(MEMORY_ROOT, 'meetings')
-
-    if not os.path.exists(meetings_dir):
-        return synced
+    meetings_dir = os.path.join(memory_root, 'meetings')
 
     # Search all meeting files for granola_doc_id
     for root, dirs, files in os.walk(meetings_dir):
@@ -102,76 +157,270 @@ def get_synced_meeting_ids():
                 except:
                     pass
 
+    # Months compacted into .archive/
+    synced.update(archived_doc_ids(memory_root))
     return synced
 
+class SyncScheduler:
+    """Feeds new transcripts from the cache into one root's durable sync queue."""
+
+    def __init__(self, settings, snapshot, log, metrics=None, events=None):
+        self.memory_root = settings['memory_root']
+        self.log = log
+        self.metrics = metrics
+        self.events = events
+        self.log_args = [
+            '--memory-root', settings['memory_root'],
+            '--user-email', settings['user_email'],
+            '--user-domain', settings['user_domain'],
+            '--org-name', settings['org_name'],
+        ]
+        # The latest cache snapshot, and this root's identity index for it
+        self.snapshot = snapshot
+        self.identities = None
+        self.identities_lock = threading.Lock()
+        current = snapshot.end_times
+        self.briefing_day = None
+        self.queue = SyncQueue(self.memory_root)
+        recovered = self.queue.recover()
+        if recovered:
+            log(f"Re-queued {recovered} sync(s) interrupted by the last shutdown")
+
+        if self.queue.is_empty():
+            # First run: what's already in Granola is history, not new meetings
+            self.queue.seed(current)
+            log(f"Initialized with {len(current)} known transcripts")
+        else:
+            # Catch up on anything that arrived while we weren't running
+            self.check_for_new_transcripts(current)
+
+    def check_for_new_transcripts(self, changed):
+        """
+        Queue transcripts the queue hasn't seen; push back ones still growing.
+
+        changed maps doc IDs to (title, end) for transcripts that are new or
+        changed since the last snapshot (or every transcript, at startup).
+        """
+        statuses = self.queue.statuses()
+
+        new = [doc_id for doc_id in changed if doc_id not in statuses]
+        growing = [doc_id for doc_id in changed if statuses.get(doc_id) == 'pending']
+
+        if new:
+            self.log(f"Found {len(new)} new transcript(s)!")
+            # Already written to Work Memory (e.g. by a manual run)
+            synced = get_synced_meeting_ids(self.memory_root)
+            self.queue.seed([d for d in new if d in synced], status='done')
+            new = [d for d in new if d not in synced]
+
+        for doc_id in new + growing:
+            title, end = changed[doc_id]
+            # Wait for the transcript to settle before syncing
+            self.queue.enqueue(doc_id, title, not_before=end + SETTLE_SECONDS, transcript_end=end)
+
+        if new:
+            self.log(f"Queued {len(new)} new meeting(s) for sync")
+            if self.metrics is not None:
+                self.metrics.inc('transcripts_queued_total', len(new))
+        return len(new)
+
+    def meeting_for(self, doc_id):
+        """
+        The snapshot's meeting for a due job, with attendees resolved for this
+        root, or None (not in the snapshot) to let the logger read the cache.
+        Called from the sync workers.
+        """
+        snapshot = self.snapshot
+        meeting = snapshot.meeting(doc_id)
+        if meeting is None or not meeting.get('attendees'):
+            return meeting
+        with self.identities_lock:
+            if self.identities is None or self.identities[0] != snapshot.key:
+                self.identities = (snapshot.key, build_identity_index(snapshot.data, self.memory_root,
+                                                                      snapshot=snapshot.key))
+            identities = self.identities[1]
+        return dict(meeting, attendees=granola_meetings.resolve_attendees(meeting['attendees'], identities))
+
+    def build_briefing(self):
+        """Rebuild today's briefing digest on the first cache change of the day."""
+        today = datetime.now().strftime('%Y-%m-%d')
+        if self.briefing_day == today:
+            return
+        self.briefing_day = today
+        import sqlite3
+        from briefing import build_briefing
+        try:
+            state = build_briefing(self.memory_root, today)
+            self.log(f"Built morning briefing for {today} ({len(state['events'])} meeting(s))")
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.log(f"Could not build morning briefing: {e}")
+
+    def sync_due(self, workers=DEFAULT_WORKERS):
+        """Run every queued sync whose time has come."""
+        synced, failed = run_pending(self.queue, workers=workers, log=self.log, log_args=self.log_args,
+                                     metrics=self.metrics, events=self.events, meeting_for=self.meeting_for)
+        if synced or failed:
+            self.log(f"Sync round finished: {synced} synced, {failed} failed")
+
+class RootPipeline(threading.Thread):
+    """
+    One memory root's write pipeline.
+
+    The scheduler (and its SQLite queue) is created on this thread and only
+    used here; the watcher thread just puts (snapshot, delta) pairs in the
+    inbox.
+    """
+
+    STOP = object()
+
+    def __init__(self, settings, snapshot, workers, shared_metrics, prefix=''):
+        super().__init__(name=f"root:{settings['memory_root']}", daemon=True)
+        self.settings = settings
+        self.snapshot = snapshot
+        self.workers = workers
+        self.log = make_logger(settings['memory_root'], prefix)
+        self.inbox = Queue()
+        # The fanout's cache metrics, plus this root's own
+        self.shared_metrics = shared_metrics
+        self.metrics = Metrics()
+        self.events = EventLog(settings['memory_root'], DAEMON)
+
+    def write_metrics(self, queue):
+        try:
+            for status, count in queue.counts().items():
+                self.metrics.set('queue_jobs', count, status=status)
+            write_textfile(metrics_path(self.settings['memory_root'], DAEMON), self.shared_metrics, self.metrics)
+            self.events.flush()
+        except OSError as e:
+            self.log(f"Could not write metrics: {e}")
+
+    def run(self):
+        scheduler = SyncScheduler(self.settings, self.snapshot, self.log, self.metrics, self.events)
+        self.snapshot = None
+        last_due_check = 0.0
+        while True:
+            try:
+                message = self.inbox.get(timeout=1)
+            except Empty:
+                message = None
+            if message is self.STOP:
+                break
+            try:
+                if message is not None:
+                    scheduler.snapshot, delta = message
+                    scheduler.check_for_new_transcripts(delta)
+                    scheduler.build_briefing()
+
+                # Queued syncs become due on their own schedule (settling, retries)
+                now = time.time()
+                if now - last_due_check >= DUE_CHECK_SECONDS:
+                    last_due_check = now
+                    scheduler.sync_due(self.workers)
+                    self.write_metrics(scheduler.queue)
+            except Exception as e:
+                self.log(f"Error: {e}")
+                self.metrics.inc('errors_total', type=type(e).__name__)
+                self.events.event('error', type=type(e).__name__, message=str(e))
+        self.write_metrics(scheduler.queue)
+        scheduler.queue.close()
+
+class CacheFanout:
+    """Parses each cache snapshot once and hands every root the snapshot and the transcripts that changed."""
+
+    def __init__(self, roots, workers):
+        self.metrics = Metrics()
+        self.metrics.set('started_timestamp_seconds', round(time.time(), 3))
+        self.pipelines = []
+        self.snapshot = self.read_cache()
+        while self.snapshot is None:
+            # Don't take a half-written cache as the baseline
+            time.sleep(2)
+            self.snapshot = self.read_cache()
+        prefix = len(roots) > 1
+        self.pipelines = [
+            RootPipeline(settings, self.snapshot, workers, self.metrics,
+                         prefix=f"[{os.path.basename(settings['memory_root'].rstrip(os.sep))}] " if prefix else '')
+            for settings in roots
+        ]
+        for pipeline in self.pipelines:
+            pipeline.start()
+
+    def read_cache(self, notifications=0):
+        """load_snapshot(), timed and counted. notifications: change events this read answers."""
+        started = time.monotonic()
+        snapshot = load_snapshot()
+        seconds = time.monotonic() - started
+        current = None if snapshot is None else snapshot.end_times
+        self.metrics.inc('cache_reads_total')
+        self.metrics.observe('cache_parse_seconds', seconds)
+        if notifications > 1:
+            self.metrics.inc('cache_events_coalesced_total', notifications - 1)
+        if current is None:
+            self.metrics.inc('cache_torn_reads_total')
+        for pipeline in self.pipelines:
+            pipeline.events.event('cache_read', seconds=round(seconds, 4), notifications=notifications,
+                                  transcripts=None if current is None else len(current), torn=current is None)
+        return snapshot
+
+    def cache_changed(self, notifications=0):
+        """Re-read the cache and send each pipeline the new snapshot and delta. Returns the delta (None if unreadable)."""
+        snapshot = self.read_cache(notifications)
+        if snapshot is None:
+            # Torn read while Granola is writing: the next change retries
+            return None
+        previous = self.snapshot.end_times
+        delta = {doc_id: entry for doc_id, entry in snapshot.end_times.items() if previous.get(doc_id) != entry}
+        self.snapshot = snapshot
+        for pipeline in self.pipelines:
+            pipeline.inbox.put((snapshot, delta))
+        return delta
+
+    def stop(self, timeout=10):
+        for pipeline in self.pipelines:
+            pipeline.inbox.put(RootPipeline.STOP)
+        for pipeline in self.pipelines:
+            pipeline.join(timeout)
+
 class GranolaCacheHandler(FileSystemEventHandler):
-    """Handler for Granola cache file changes."""
+    """
+    Handler for Granola cache file changes.
 
-    def __init__(self):
-        self.last_sync = datetime.min
-        self.known_transcripts = get_transcript_doc_ids()
-        self.cooldown_seconds = 10  # Don't sync more often than this
-        log(f"Initialized with {len(self.known_transcripts)} known transcripts")
+    Watchdog calls this from its own thread, so it only records that the
+    cache changed; the main loop does the work.
+    """
+
+    def __init__(self, metrics):
+        self.changed = False
+        self.last_change = 0.0
+        self.metrics = metrics
+        self.notifications = 0  # Since the last read
 
     def on_modified(self, event):
         if not event.src_path.endswith('cache-v3.json'):
             return
+        self.metrics.inc('cache_events_total')
+        self.notifications += 1
+        self.changed = True
+        self.last_change = time.time()
 
-        # Cooldown to avoid rapid re-triggers
-        now = datetime.now()
-        if (now - self.last_sync).total_seconds() < self.cooldown_seconds:
-            return
-
-        log("Granola cache updated, checking for new transcripts...")
-
-        # Wait a moment for Granola to finish writing
-        time.sleep(2)
-
-        # Check for new transcripts
-        current_transcripts = get_transcript_doc_ids()
-        new_transcripts = current_transcripts - self.known_transcripts
-
-        if new_transcripts:
-            log(f"Found {len(new_transcripts)} new transcript(s)!")
-
-            # Get already synced
-            synced = get_synced_meeting_ids()
-            to_sync = new_transcripts - synced
-
-            if to_sync:
-                log(f"Syncing {len(to_sync)} new meeting(s)...")
-                # Run the sync script
-                result = os.system(
-                    f'python3 ~/.claude/skills/memory-management/scripts/log-meeting-to-memory.py --recent 10'
-                )
-                if result == 0:
-                    log("Sync completed successfully")
-                else:
-                    log(f"Sync failed with code {result}")
-            else:
-                log("All new transcripts already synced")
-
-            self.known_transcripts = current_transcripts
-        else:
-            log("No new transcripts detected")
-
-        self.last_sync = now
-
-def run_watcher():
+def run_watcher(roots, workers):
     """Run the file watcher."""
     if not WATCHDOG_AVAILABLE:
         print("ERROR: watchdog package not installed")
         print("Install with: pip install watchdog")
         print("")
         print("Falling back to polling mode...")
-        run_polling_fallback()
+        run_polling_fallback(roots, workers)
         return
 
+    log = make_logger(roots[0]['memory_root'])
     log("Starting Granola file watcher...")
     log(f"Watching: {GRANOLA_CACHE}")
-    log(f"Memory root: {MEMORY_ROOT}")
+    for settings in roots:
+        log(f"Memory root: {settings['memory_root']} ({settings['user_email']})")
 
-    event_handler = GranolaCacheHandler()
+    fanout = CacheFanout(roots, workers)
+    event_handler = GranolaCacheHandler(fanout.metrics)
     observer = Observer()
 
     # Watch the directory containing the cache file
@@ -181,43 +430,73 @@ def run_watcher():
 
     log("Watcher started. Press Ctrl+C to stop.")
 
-    try:
-        while True:
+    cooldown_seconds = 10  # Don't re-read the cache more often than this
+    settle_seconds = 2     # Give Granola a moment to finish writing
+    last_check = 0.0
+
+    while True:
+        try:
             time.sleep(1)
-    except KeyboardInterrupt:
-        log("Stopping watcher...")
-        observer.stop()
+            now = time.time()
+
+            if (event_handler.changed
+                    and now - event_handler.last_change >= settle_seconds
+                    and now - last_check >= cooldown_seconds):
+                event_handler.changed = False
+                notifications, event_handler.notifications = event_handler.notifications, 0
+                last_check = now
+                log("Granola cache updated, checking for new transcripts...")
+                if not fanout.cache_changed(notifications):
+                    log("No new or growing transcripts detected")
+        except KeyboardInterrupt:
+            log("Stopping watcher...")
+            observer.stop()
+            break
+        except Exception as e:
+            # One bad snapshot mustn't stop the watcher for every root
+            log(f"Error: {e}")
+            fanout.metrics.inc('errors_total', type=type(e).__name__)
 
     observer.join()
+    fanout.stop()
     log("Watcher stopped.")
 
-def run_polling_fallback():
+def run_polling_fallback(roots, workers):
     """Fallback polling mode if watchdog not available."""
+    log = make_logger(roots[0]['memory_root'])
     log("Running in polling fallback mode (checking every 2 minutes)")
-    log(f"Memory root: {MEMORY_ROOT}")
+    for settings in roots:
+        log(f"Memory root: {settings['memory_root']} ({settings['user_email']})")
 
-    known_transcripts = get_transcript_doc_ids()
-    log(f"Starting with {len(known_transcripts)} known transcripts")
+    fanout = CacheFanout(roots, workers)
 
     while True:
         try:
             time.sleep(120)  # Check every 2 minutes
-
-            current = get_transcript_doc_ids()
-            new = current - known_transcripts
-
-            if new:
-                log(f"Found {len(new)} new transcript(s), syncing...")
-                os.system(
-                    f'python3 ~/.claude/skills/memory-management/scripts/log-meeting-to-memory.py --recent 10'
-                )
-                known_transcripts = current
+            fanout.cache_changed()
 
         except KeyboardInterrupt:
             log("Stopping...")
             break
         except Exception as e:
             log(f"Error: {e}")
+            fanout.metrics.inc('errors_total', type=type(e).__name__)
+    fanout.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch the Granola cache and sync new meetings to Work Memory')
+    parser.add_argument('--config', action='append', default=[],
+                        help='Skill config of a memory root to serve (repeat for several; default: your own)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Meetings to sync in parallel per root')
+    args = parser.parse_args()
+
+    roots = [root_settings(os.path.expanduser(path)) for path in args.config] if args.config else [root_settings()]
+    seen = set()
+    for settings in roots:
+        if settings['memory_root'] in seen:
+            parser.error(f"memory root {settings['memory_root']} is configured twice")
+        seen.add(settings['memory_root'])
+    run_watcher(roots, args.workers)
 
 if __name__ == '__main__':
-    run_watcher()
+    main()